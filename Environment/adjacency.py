@@ -0,0 +1,149 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# Ordem dos movimentos igual à de Environment.get_neighbors
+MOVES = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+# Quantidade máxima de grafos mantidos em cache (LRU)
+GRAPH_CACHE_SIZE = 8
+
+_graph_cache = OrderedDict()
+
+
+class NeighborGraph:
+    """
+    Adjacência em formato CSR de uma configuração de voo.
+    Os vizinhos da célula i (índice y * cols + x) são indices[indptr[i]:indptr[i + 1]],
+    com os custos de movimento correspondentes em costs.
+    """
+
+    def __init__(self, rows, cols, indptr, indices, costs, cell_costs):
+        self.rows = rows
+        self.cols = cols
+        self.indptr = indptr
+        self.indices = indices
+        self.costs = costs
+        self.cell_costs = cell_costs
+        self._views = None
+        self._reverse = None
+
+    @classmethod
+    def build(cls, compiled, passable, move_cost, wind_costs, wind_field):
+        """
+        Monta o CSR de forma vetorizada a partir das máscaras compiladas.
+        Entrar numa célula custa move_cost + vento da célula * wind_costs[direção do movimento];
+        cell_costs guarda o custo sem direção (acréscimo igual a move_cost por unidade de vento).
+        """
+        rows, cols = compiled.rows, compiled.cols
+        wind = wind_field.astype(np.float64)
+        cell_costs = move_cost + wind * move_cost
+
+        ys, xs = np.indices((rows, cols))
+        neighbor_index = []
+        neighbor_valid = []
+        for dx, dy in MOVES:
+            nx, ny = xs + dx, ys + dy
+            inside = (nx >= 0) & (nx < cols) & (ny >= 0) & (ny < rows)
+            nx_clipped = np.clip(nx, 0, cols - 1)
+            ny_clipped = np.clip(ny, 0, rows - 1)
+            neighbor_valid.append(inside & passable[ny_clipped, nx_clipped])
+            neighbor_index.append(ny_clipped * cols + nx_clipped)
+
+        # Matrizes (células, 4): a máscara em ordem de linha preserva a ordem dos movimentos
+        valid = np.stack(neighbor_valid, axis=-1).reshape(-1, len(MOVES))
+        targets = np.stack(neighbor_index, axis=-1).reshape(-1, len(MOVES))
+
+        indptr = np.zeros(rows * cols + 1, dtype=np.int64)
+        np.cumsum(valid.sum(axis=1), out=indptr[1:])
+        indices = targets[valid].astype(np.int64)
+        directions = np.nonzero(valid)[1]
+        costs = move_cost + wind.ravel()[indices] * np.asarray(wind_costs, dtype=np.float64)[directions]
+
+        return cls(rows, cols, indptr, indices, costs, cell_costs)
+
+    def copy(self):
+        """Cópia com custos próprios; a estrutura (indptr/indices) não muda e é compartilhada"""
+        return NeighborGraph(self.rows, self.cols, self.indptr, self.indices,
+                             self.costs.copy(), self.cell_costs.copy())
+
+    def set_cell_costs(self, cells, cost, move_costs=None):
+        """
+        Muda o custo de entrada das células (índices achatados) no próprio grafo:
+        só as arestas que chegam a elas são tocadas, nos dois sentidos.
+        move_costs dá o custo por direção do movimento (ordem de MOVES); sem ele vale cost.
+        """
+        cols = self.cols
+        move_costs = move_costs or (cost,) * len(MOVES)
+        self.cell_costs.flat[cells] = cost
+        for cell in cells:
+            y, x = divmod(cell, cols)
+            for move, (dx, dy) in enumerate(MOVES):
+                # A origem fica do lado oposto ao movimento
+                nx, ny = x - dx, y - dy
+                if not (0 <= nx < cols and 0 <= ny < self.rows):
+                    continue
+                source = ny * cols + nx
+                for edge in range(self.indptr[source], self.indptr[source + 1]):
+                    if self.indices[edge] == cell:
+                        self.costs[edge] = move_costs[move]
+            if self._reverse is not None:
+                # No grafo transposto as arestas que saem da célula são as que chegavam a ela
+                reverse = self._reverse
+                for edge in range(reverse.indptr[cell], reverse.indptr[cell + 1]):
+                    sy, sx = divmod(int(reverse.indices[edge]), cols)
+                    reverse.costs[edge] = move_costs[MOVES.index(((x > sx) - (x < sx), (y > sy) - (y < sy)))]
+
+    def views(self):
+        """memoryviews dos arrays para leitura escalar rápida no laço das buscas"""
+        if self._views is None:
+            self._views = (memoryview(self.indptr), memoryview(self.indices), memoryview(self.costs))
+        return self._views
+
+    def reverse(self):
+        """Grafo transposto (mesmas arestas invertidas, mesmo custo), montado uma única vez"""
+        if self._reverse is None:
+            cells = self.rows * self.cols
+            sources = np.repeat(np.arange(cells, dtype=np.int64), np.diff(self.indptr))
+            order = np.argsort(self.indices, kind="stable")
+            indptr = np.zeros_like(self.indptr)
+            np.cumsum(np.bincount(self.indices, minlength=cells), out=indptr[1:])
+            self._reverse = NeighborGraph(self.rows, self.cols, indptr, sources[order],
+                                          self.costs[order], self.cell_costs)
+            self._reverse._reverse = self
+        return self._reverse
+
+    def __getstate__(self):
+        # memoryviews não são serializáveis; são recriados sob demanda
+        state = self.__dict__.copy()
+        state["_views"] = None
+        return state
+
+    def nbytes(self):
+        return self.indptr.nbytes + self.indices.nbytes + self.costs.nbytes
+
+
+def graph_cache_key(compiled, flight_height, power_mode, cost_signature=None):
+    """Mapa + configuração de voo, e as regras de custo quando não são as padrão"""
+    key = (compiled.digest(), flight_height, power_mode)
+    return key if cost_signature is None else key + (cost_signature,)
+
+
+def get_neighbor_graph(compiled, flight_height, power_mode, passable, move_cost, wind_costs, wind_field,
+                       cost_signature=None):
+    """Devolve o grafo da configuração, construindo-o apenas na primeira vez"""
+    key = graph_cache_key(compiled, flight_height, power_mode, cost_signature)
+    graph = _graph_cache.get(key)
+    if graph is not None:
+        _graph_cache.move_to_end(key)
+        return key, graph
+
+    graph = NeighborGraph.build(compiled, passable, move_cost, wind_costs, wind_field)
+    _graph_cache[key] = graph
+    while len(_graph_cache) > GRAPH_CACHE_SIZE:
+        _graph_cache.popitem(last=False)
+    return key, graph
+
+
+def clear_graph_cache():
+    _graph_cache.clear()
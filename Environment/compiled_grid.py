@@ -0,0 +1,135 @@
+import hashlib
+
+import numpy as np
+
+# Códigos fixos do vocabulário de células; valores desconhecidos recebem
+# códigos novos a partir de FIRST_DYNAMIC_CODE
+CELL_CODES = {
+    "0": 0,
+    "P": 1,
+    "": 2,
+    "X": 3,
+    "x": 4,
+    "A": 5,
+    "W": 6,
+    "B": 7,
+    "S": 8,
+    "1": 9,
+    "2": 10,
+    "3": 11,
+    "4": 12,
+}
+FIRST_DYNAMIC_CODE = 13
+
+BLOCKED_CODES = (CELL_CODES["X"], CELL_CODES["x"])
+AREA_A_CODES = (CELL_CODES["A"],)
+WIND_CODES = (CELL_CODES["W"],)
+CHARGING_CODES = (CELL_CODES["B"],)
+DELIVERY_CODES = tuple(CELL_CODES[c] for c in ["1", "2", "3", "4"])
+# Células livres onde o clima pode criar áreas de vento
+FREE_CODES = tuple(CELL_CODES[c] for c in ["0", "", "P"])
+
+
+class CompiledGrid:
+    """
+    Representação compacta do mapa: uma matriz uint8 de códigos de célula
+    mais máscaras booleanas pré-calculadas (bloqueio, áreas A, vento,
+    carregamento e entrega)
+    """
+
+    def __init__(self, codes, vocabulary):
+        self.codes = codes
+        self.vocabulary = vocabulary
+        self.rows, self.cols = codes.shape
+
+        self.blocked = np.isin(codes, BLOCKED_CODES)
+        self.area_a = np.isin(codes, AREA_A_CODES)
+        self.wind = np.isin(codes, WIND_CODES)
+        self.charging = np.isin(codes, CHARGING_CODES)
+        self.delivery = np.isin(codes, DELIVERY_CODES)
+        self._digest = None
+
+    @classmethod
+    def from_grid(cls, grid):
+        """Compila uma grade lista-de-listas de strings"""
+        vocabulary = list(CELL_CODES.keys())
+        lookup = dict(CELL_CODES)
+        rows, cols = len(grid), len(grid[0])
+        codes = np.empty((rows, cols), dtype=np.uint8)
+
+        for y, row in enumerate(grid):
+            for x, cell in enumerate(row):
+                cell = str(cell)
+                code = lookup.get(cell)
+                if code is None:
+                    code = len(vocabulary)
+                    if code > 255:
+                        raise ValueError(f"Vocabulário de células excede 256 valores: {cell!r}")
+                    lookup[cell] = code
+                    vocabulary.append(cell)
+                codes[y, x] = code
+
+        return cls(codes, vocabulary)
+
+    def with_cells(self, flat_indices, cell):
+        """Cópia do mapa com as células (índices achatados) trocadas por cell"""
+        codes = self.codes.copy()
+        codes.flat[flat_indices] = CELL_CODES[cell]
+        return CompiledGrid(codes, list(self.vocabulary))
+
+    def copy(self):
+        """Cópia independente (os códigos podem vir de um mapeamento somente leitura)"""
+        return CompiledGrid(np.array(self.codes), list(self.vocabulary))
+
+    def set_cells(self, flat_indices, cell):
+        """
+        Troca células no próprio mapa, mantendo as máscaras em dia.
+        Altera o objeto: use numa cópia, pois o mapa pode ser compartilhado entre ambientes.
+        """
+        code = CELL_CODES[cell]
+        self.codes.flat[flat_indices] = code
+        for mask, codes in ((self.blocked, BLOCKED_CODES), (self.area_a, AREA_A_CODES),
+                            (self.wind, WIND_CODES), (self.charging, CHARGING_CODES),
+                            (self.delivery, DELIVERY_CODES)):
+            mask.flat[flat_indices] = code in codes
+        self._digest = None
+
+    def passable_mask(self, flight_height, power_mode):
+        """Células transitáveis para a configuração de voo"""
+        passable = ~self.blocked
+        if flight_height == "low" or power_mode == "battery_saver":
+            passable &= ~self.area_a
+        return passable
+
+    def positions(self, mask):
+        """Lista de posições (x, y) onde a máscara é verdadeira, em ordem de linha"""
+        ys, xs = np.nonzero(mask)
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def find(self, cell):
+        """Posições (x, y) das células do tipo dado, em ordem de linha"""
+        if cell not in self.vocabulary:
+            return []
+        return self.positions(self.codes == self.vocabulary.index(cell))
+
+    def cell_type(self, x, y):
+        return self.vocabulary[self.codes[y, x]]
+
+    def digest(self):
+        """Impressão digital do mapa (códigos de célula + dimensões)"""
+        if self._digest is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(np.asarray(self.codes.shape, dtype=np.int64).tobytes())
+            digest.update(np.ascontiguousarray(self.codes).tobytes())
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    def to_lists(self):
+        """Reconstrói a grade lista-de-listas de strings"""
+        vocabulary = self.vocabulary
+        return [[vocabulary[code] for code in row] for row in self.codes.tolist()]
+
+    def nbytes(self):
+        """Memória ocupada pelos arrays (bytes)"""
+        return sum(arr.nbytes for arr in (self.codes, self.blocked, self.area_a,
+                                          self.wind, self.charging, self.delivery))
@@ -0,0 +1,294 @@
+import heapq
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from config import settings
+
+_table_cache = OrderedDict()
+_lazy_cache = OrderedDict()
+
+
+class DistanceTable:
+    """
+    Árvore de caminhos mínimos enraizada numa célula.
+    reverse=True: dist[i] é o custo mínimo de i até a raiz e link[i] o próximo passo rumo à raiz.
+    reverse=False: dist[i] é o custo mínimo da raiz até i e link[i] o passo anterior a i.
+    """
+
+    def __init__(self, root, cols, dist, link, reverse=True):
+        self.root = root
+        self.cols = cols
+        self.dist = dist
+        self.link = link
+        self.reverse = reverse
+        self._dist_view = None
+
+    def cost(self, position):
+        if self._dist_view is None:
+            self._dist_view = memoryview(self.dist)
+        x, y = position
+        return self._dist_view[y * self.cols + x]
+
+    def is_reachable(self, position):
+        return self.cost(position) != float("inf")
+
+    def path(self, position):
+        """
+        Caminho entre a posição e a raiz, na ordem de percurso da árvore:
+        posição → raiz na árvore reversa, raiz → posição na árvore direta
+        """
+        if not self.is_reachable(position):
+            return None
+
+        cols = self.cols
+        x, y = position
+        index = y * cols + x
+        root_index = self.root[1] * cols + self.root[0]
+        path = [position]
+        while index != root_index:
+            index = int(self.link[index])
+            ny, nx = divmod(index, cols)
+            path.append((nx, ny))
+
+        if not self.reverse:
+            path.reverse()
+        return path
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_dist_view"] = None
+        return state
+
+
+def shortest_path_tree(graph, root, reverse=True):
+    """Dijkstra sobre a adjacência CSR (sobre o grafo transposto quando reverse=True)"""
+    search_graph = graph.reverse() if reverse else graph
+    indptr, indices, costs = search_graph.views()
+    cols = graph.cols
+    cells = graph.rows * cols
+
+    root_index = root[1] * cols + root[0]
+    dist = [float("inf")] * cells
+    link = [-1] * cells
+    dist[root_index] = 0.0
+    heap = [(0.0, root_index)]
+
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for edge in range(indptr[u], indptr[u + 1]):
+            v = indices[edge]
+            nd = d + costs[edge]
+            if nd < dist[v]:
+                dist[v] = nd
+                link[v] = u
+                heapq.heappush(heap, (nd, v))
+
+    return DistanceTable(tuple(root), cols, np.array(dist, dtype=np.float64),
+                         np.array(link, dtype=np.int64), reverse)
+
+
+class LazyDistanceTable(DistanceTable):
+    """
+    Árvore de caminhos mínimos montada sob demanda: o Dijkstra para assim que a célula
+    pedida em expand_to é assentada e retoma dali no pedido seguinte. Custos e caminhos
+    só valem para células já assentadas; settled acumula os nós assentados até agora.
+    """
+
+    def __init__(self, graph, root, reverse=True):
+        search_graph = graph.reverse() if reverse else graph
+        cells = graph.rows * graph.cols
+        root_index = root[1] * graph.cols + root[0]
+        dist = [float("inf")] * cells
+        link = [-1] * cells
+        dist[root_index] = 0.0
+        super().__init__(tuple(root), graph.cols, dist, link, reverse)
+        self.settled = 0
+        self._graph = search_graph
+        self._heap = [(0.0, root_index)]
+        self._done = bytearray(cells)
+
+    def cost(self, position):
+        x, y = position
+        return self.dist[y * self.cols + x]
+
+    def expand_to(self, position=None):
+        """
+        Assenta nós até a posição (sem posição, ou se ela é inalcançável, até esgotar o grafo);
+        retorna quantos foram assentados agora
+        """
+        target = -1 if position is None else position[1] * self.cols + position[0]
+        done = self._done
+        if target >= 0 and done[target]:
+            return 0
+
+        indptr, indices, costs = self._graph.views()
+        dist, link, heap = self.dist, self.link, self._heap
+        settled = 0
+        while heap:
+            d, u = heapq.heappop(heap)
+            if done[u]:
+                continue
+            done[u] = 1
+            settled += 1
+            for edge in range(indptr[u], indptr[u + 1]):
+                v = indices[edge]
+                nd = d + costs[edge]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    link[v] = u
+                    heapq.heappush(heap, (nd, v))
+            if u == target:
+                break
+
+        self.settled += settled
+        return settled
+
+    def full_table(self):
+        """Termina o Dijkstra e devolve a árvore completa como DistanceTable"""
+        self.expand_to()
+        return DistanceTable(self.root, self.cols, np.array(self.dist, dtype=np.float64),
+                             np.array(self.link, dtype=np.int64), self.reverse)
+
+
+def sweep_costs(graph, sources, targets):
+    """
+    Custos mínimos de cada origem a cada alvo (matriz len(sources) x len(targets), inf sem rota),
+    sem montar árvores nem gravar nada em cache. Todas as origens avançam juntas em varreduras
+    vetorizadas da grade (leste, oeste, sul, norte) repetidas até nenhuma distância mudar:
+    cada varredura relaxa de uma vez os trechos retos numa direção, então bastam poucas rodadas
+    (uma por mudança de direção dos caminhos). O resultado é o mesmo do Dijkstra.
+    Com graph.reverse() dá o custo de cada alvo até cada origem.
+    """
+    rows, cols = graph.rows, graph.cols
+    cells = rows * cols
+    indptr, indices, costs = graph.indptr, graph.indices, graph.costs
+
+    # Custo de entrar em cada célula por direção do movimento (inf onde não há aresta)
+    heads = np.repeat(np.arange(cells), np.diff(indptr))
+    tail_y, tail_x = np.divmod(heads, cols)
+    head_y, head_x = np.divmod(indices, cols)
+    entry = np.full((4, cells), np.inf)
+    for plane, mask in enumerate((head_x > tail_x, head_x < tail_x, head_y > tail_y, head_y < tail_y)):
+        entry[plane, indices[mask]] = costs[mask]
+    east, west, south, north = (plane.reshape(rows, cols, 1) for plane in entry)
+
+    target_y = np.array([y for _, y in targets], dtype=np.int64)
+    target_x = np.array([x for x, _ in targets], dtype=np.int64)
+    result = np.empty((len(sources), len(targets)))
+    batch = max(1, settings.SWEEP_MAX_CELLS // cells)
+    for first in range(0, len(sources), batch):
+        chunk = sources[first:first + batch]
+        # dist[y, x, k]: custo da origem k até (x, y); as origens ficam contíguas
+        dist = np.full((rows, cols, len(chunk)), np.inf)
+        for k, (x, y) in enumerate(chunk):
+            dist[y, x, k] = 0.0
+        while True:
+            previous = dist.copy()
+            for x in range(1, cols):
+                np.minimum(dist[:, x], dist[:, x - 1] + east[:, x], out=dist[:, x])
+            for x in range(cols - 2, -1, -1):
+                np.minimum(dist[:, x], dist[:, x + 1] + west[:, x], out=dist[:, x])
+            for y in range(1, rows):
+                np.minimum(dist[y], dist[y - 1] + south[y], out=dist[y])
+            for y in range(rows - 2, -1, -1):
+                np.minimum(dist[y], dist[y + 1] + north[y], out=dist[y])
+            if np.array_equal(dist, previous):
+                break
+        result[first:first + len(chunk)] = dist[target_y, target_x].T
+    return result
+
+
+def _cache_path(graph_key, root, reverse):
+    digest, flight_height, power_mode = graph_key[:3]
+    # Regras de custo não padrão (direção do vento, temperatura, campo de vento) entram no nome
+    rules = "".join(f"-{signature}" for signature in graph_key[3:])
+    direction = "to" if reverse else "from"
+    name = f"{digest}-{flight_height}-{power_mode}{rules}-{direction}-{root[0]}_{root[1]}.npz"
+    return os.path.join(settings.HEURISTIC_CACHE_DIR, name)
+
+
+def _load_table(graph_key, root, cols, reverse):
+    path = _cache_path(graph_key, root, reverse)
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as data:
+            return DistanceTable(tuple(root), cols, data["dist"], data["link"], reverse)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ Tabela de heurística ignorada ({path}): {e}")
+        return None
+
+
+def _save_table(graph_key, table):
+    path = _cache_path(graph_key, table.root, table.reverse)
+    try:
+        os.makedirs(settings.HEURISTIC_CACHE_DIR, exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, dist=table.dist, link=table.link)
+        os.replace(tmp_path, path)
+        _prune_disk_cache()
+    except OSError as e:
+        print(f"⚠️ Não foi possível gravar tabela de heurística: {e}")
+
+
+def _prune_disk_cache():
+    """Remove os arquivos mais antigos além de HEURISTIC_CACHE_MAX_FILES"""
+    directory = settings.HEURISTIC_CACHE_DIR
+    files = [os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".npz")]
+    if len(files) <= settings.HEURISTIC_CACHE_MAX_FILES:
+        return
+    files.sort(key=os.path.getmtime)
+    for path in files[:len(files) - settings.HEURISTIC_CACHE_MAX_FILES]:
+        os.remove(path)
+
+
+def get_distance_table(graph_key, graph, root, reverse=True):
+    """
+    Tabela de distâncias da raiz para o grafo da configuração.
+    Procura em memória, depois em disco, e só então executa o Dijkstra
+    (terminando a árvore sob demanda da mesma raiz, se houver uma).
+    """
+    key = (graph_key, tuple(root), reverse)
+    table = _table_cache.get(key)
+    if table is not None:
+        _table_cache.move_to_end(key)
+        return table
+
+    persist = settings.HEURISTIC_CACHE_PERSIST
+    table = _load_table(graph_key, root, graph.cols, reverse) if persist else None
+    if table is None:
+        lazy = _lazy_cache.get(key)
+        table = lazy.full_table() if lazy is not None else shortest_path_tree(graph, root, reverse)
+        if persist:
+            _save_table(graph_key, table)
+
+    _table_cache[key] = table
+    while len(_table_cache) > settings.HEURISTIC_MEMORY_CACHE_SIZE:
+        _table_cache.popitem(last=False)
+    return table
+
+
+def get_lazy_distance_table(graph_key, graph, root, reverse=True):
+    """
+    Árvore sob demanda da raiz (LazyDistanceTable), mantida só em memória: cada consulta
+    retoma o Dijkstra de onde a anterior parou
+    """
+    key = (graph_key, tuple(root), reverse)
+    table = _lazy_cache.get(key)
+    if table is not None:
+        _lazy_cache.move_to_end(key)
+        return table
+
+    table = _lazy_cache[key] = LazyDistanceTable(graph, root, reverse)
+    while len(_lazy_cache) > settings.HEURISTIC_MEMORY_CACHE_SIZE:
+        _lazy_cache.popitem(last=False)
+    return table
+
+
+def clear_table_cache():
+    _table_cache.clear()
+    _lazy_cache.clear()
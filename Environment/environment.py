@@ -1,18 +1,48 @@
-import random
+import logging
 from typing import List, Tuple, Dict
 
+logger = logging.getLogger(__name__)
+
 class Environment:
-    def __init__(self, grid, start, goal, flight_height="low", power_mode="normal", weather_conditions=None):
+    def __init__(self, grid, start, goal, flight_height="low", power_mode="normal", weather_conditions=None,
+                 compiled=False):
         self.grid = grid
-        self.rows = len(grid)
-        self.cols = len(grid[0])
+        # Um CompiledGrid (p.ex. do gerador de mapas) dispensa a grade de strings
+        # e implica o modo compilado; um TiledMap (.tmap) é lido bloco a bloco, sem cópias
+        prebuilt = getattr(grid, "codes", None) is not None
+        tiled = getattr(grid, "tile_size", None) is not None
+        if prebuilt or tiled:
+            self.rows, self.cols = grid.rows, grid.cols
+        else:
+            self.rows = len(grid)
+            self.cols = len(grid[0])
         self.flight_height = flight_height
         self.power_mode = power_mode
-        self.original_grid = [row.copy() for row in grid]
+        self.original_grid = None if prebuilt or tiled else [row.copy() for row in grid]
         
         # Condições climáticas
         self.weather_conditions = weather_conditions or {}
-        self.grid_with_weather = self.apply_weather_conditions()
+        self.forecast = None
+        # Custo de entrar numa célula calma e acréscimo por unidade de vento em cada direção
+        self._move_cost, self._wind_costs = self._weather_move_costs()
+        self.wind_field = None
+        
+        # Modo compilado: códigos uint8 + máscaras NumPy em vez de strings
+        self.compiled = None
+        self.tiled = None
+        if tiled:
+            self.grid_with_weather = None
+            self.tiled = self.apply_weather_tiled(grid)
+            self._update_cost_signature()
+        elif prebuilt:
+            self.grid_with_weather = None
+            self.compile_grid(self.apply_weather_compiled(grid))
+        else:
+            self.grid_with_weather = self.apply_weather_conditions()
+            if compiled:
+                self.compile_grid()
+            else:
+                self._set_wind_field(self._wind_mask_lists())
         
         # Pontos importantes
         self.charging_stations = self.find_charging_stations()
@@ -25,47 +55,257 @@ class Environment:
         
         self.home_base = tuple(start)  # Base inicial
         
-        self.agent_dict = {
-            "agent0": {
-                "start": tuple(start),
-                "goal": tuple(goal),
-                "home_base": tuple(start),
-                "battery": 100.0,
-                "max_battery": 100.0,
-                "mission": "outbound",  # outbound, delivering, inbound, resting
-                "delivery_time": 0,
-                "resting_time": 0,
-                "mission_complete": False
-            }
+        self.agent_dict = {}
+        self.add_agent("agent0", goal, start)
+
+    def add_agent(self, agent_name, goal, start=None, battery=100.0):
+        """Registra um drone da frota; por padrão ele parte (e volta) da base inicial S"""
+        start = tuple(start) if start is not None else self.home_base
+        self.agent_dict[agent_name] = {
+            "start": start,
+            "goal": tuple(goal),
+            "home_base": start,
+            "battery": battery,
+            "max_battery": 100.0,
+            "mission": "outbound",  # outbound, delivering, inbound, resting
+            "delivery_time": 0,
+            "resting_time": 0,
+            "mission_complete": False
         }
+        return self.agent_dict[agent_name]
+
+    def __getstate__(self):
+        # memoryviews não são serializáveis (processos de trabalho): a do campo de vento é recriada
+        state = self.__dict__.copy()
+        state.pop("_wind_view", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.wind_field is not None:
+            self._wind_view = memoryview(self.wind_field.reshape(-1))
 
     def apply_weather_conditions(self):
-        """Aplica condições climáticas dinâmicas"""
+        """
+        Aplica condições climáticas dinâmicas: a máscara de vento é sorteada de uma vez
+        sobre a grade (Environment.weather) e só as células escolhidas são escritas
+        """
+        import numpy as np
+        from Environment.weather import weather_layers, weather_seed, wind_mask
+        
         grid_copy = [row.copy() for row in self.original_grid]
         
-        print("🌤️  Aplicando condições climáticas...")
+        logger.info("🌤️  Aplicando condições climáticas...")
         
-        potential_wind_areas = []
-        for y in range(self.rows):
-            for x in range(self.cols):
-                cell = self.original_grid[y][x]
-                if cell in ["0", "", "P"]:
-                    potential_wind_areas.append((x, y))
+        free_cells = {"0", "", "P"}
+        free = np.fromiter((cell in free_cells for row in self.original_grid for cell in row),
+                           dtype=np.bool_, count=self.rows * self.cols).reshape(self.rows, self.cols)
+        rng = np.random.default_rng(weather_seed(self.weather_conditions))
+        ys, xs = np.nonzero(wind_mask(free, weather_layers(self.weather_conditions), rng))
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            grid_copy[y][x] = "W"
+        
+        return grid_copy
+
+    def apply_weather_compiled(self, compiled_grid):
+        """Mesmas regras de apply_weather_conditions, direto sobre os códigos de célula"""
+        import numpy as np
+        from Environment.compiled_grid import FREE_CODES
+        from Environment.weather import weather_layers, weather_seed, wind_mask
         
-        wind_intensity = self.weather_conditions.get('wind_intensity', 0)
-        print(f"   Intensidade do vento: {wind_intensity:.2f}")
+        logger.info("🌤️  Aplicando condições climáticas...")
         
-        if wind_intensity > 0.3:
-            num_wind_areas = max(1, int(len(potential_wind_areas) * wind_intensity * 0.4))
-            wind_cells = random.sample(potential_wind_areas, num_wind_areas)
-            for x, y in wind_cells:
-                grid_copy[y][x] = "W"
-                print(f"    Adicionado W em ({x}, {y})")
+        free = np.isin(compiled_grid.codes, FREE_CODES)
+        rng = np.random.default_rng(weather_seed(self.weather_conditions))
+        wind = wind_mask(free, weather_layers(self.weather_conditions), rng)
+        if not wind.any():
+            return compiled_grid
+        return compiled_grid.with_cells(np.flatnonzero(wind), "W")
+
+    def apply_weather_tiled(self, tiled_map):
+        """
+        Clima de um mapa em blocos: cada célula livre vira W com a mesma fração
+        esperada de apply_weather_conditions, sorteada bloco a bloco quando a busca
+        chega ao bloco (semente em weather_conditions['seed'] ou tirada de random)
+        """
+        from Environment.weather import weather_layers, weather_seed, wind_probabilities
         
-        return grid_copy
+        logger.info("🌤️  Aplicando condições climáticas...")
+        
+        if self.weather_conditions.get('wind_field') is not None:
+            logger.warning("⚠️ wind_field é ignorado em mapas em blocos: o vento vem das células W")
+        layers = weather_layers(self.weather_conditions)
+        for intensity, region in layers:
+            logger.info("   Intensidade do vento: %.2f%s", intensity, f" em {region}" if region else "")
+        return tiled_map.view(self.flight_height, self.power_mode, wind_probabilities(layers),
+                              weather_seed(self.weather_conditions))
+
+    def update_weather_cells(self, wind_on=(), wind_off=()):
+        """
+        Atualiza o clima célula a célula (p.ex. a cada tique durante o voo), sem refazer a grade:
+        as células livres de wind_on viram W e as células W de wind_off voltam ao tipo original.
+        Adjacência e abstração HPA* são corrigidas só nas células alteradas; tabelas de
+        distância passam a ser de um novo clima (nova chave). Retorna as células alteradas.
+        Com um campo de vento fornecido (weather_conditions['wind_field']) as células W não
+        definem o vento, então os tiques são recusados.
+        """
+        from Environment.hierarchy import abstract_graph_key, update_abstract_graphs
+        
+        if getattr(self, "_custom_wind", False):
+            raise ValueError("Tiques de clima trocam células W: não se aplicam com wind_field fornecido")
+        
+        changes = []
+        for cells, wind in ((wind_on, True), (wind_off, False)):
+            for position in cells:
+                position = tuple(position)
+                cell = self.get_cell_type(position)
+                if (cell in ["0", "", "P"]) if wind else (cell == "W"):
+                    changes.append((position, wind))
+        if not changes:
+            return []
+        
+        old_key = abstract_graph_key(self, None)[:-1]
+        if self.compiled is not None:
+            self._update_weather_compiled(changes)
+        elif self.tiled is not None:
+            self.tiled.set_wind(changes)
+        else:
+            for (x, y), wind in changes:
+                original = self.original_grid[y][x]
+                self.grid_with_weather[y][x] = "W" if wind else (original if original != "W" else "0")
+                self.wind_field[y, x] = float(wind)
+            self._update_cost_signature()
+        
+        cells = [position for position, _ in changes]
+        update_abstract_graphs(self, old_key, cells)
+        print(f"🌬️  Clima atualizado: {len(cells)} células alteradas")
+        return cells
+
+    def _update_weather_compiled(self, changes):
+        """Mudanças de vento no modo compilado: mapa e grafo viram cópias próprias do ambiente"""
+        from Environment.adjacency import graph_cache_key
+        
+        if not self._private_weather:
+            # Mapa e adjacência podem ser compartilhados (cache, mapeamento em memória):
+            # copiados uma vez, os tiques seguintes alteram só as células envolvidas
+            self.compiled = self.compiled.copy()
+            self.graph = self.graph.copy()
+            self._private_weather = True
+        
+        # Células que perdem o vento voltam ao tipo do mapa sem clima (0, vazio ou P)
+        groups = {}
+        for (x, y), wind in changes:
+            groups.setdefault("W" if wind else self._calm_cell(x, y), []).append(y * self.cols + x)
+        for cell, indices in groups.items():
+            strength = float(cell == "W")
+            self.compiled.set_cells(indices, cell)
+            self.wind_field.flat[indices] = strength
+            self.graph.set_cell_costs(indices, self._move_cost + strength * self._move_cost,
+                                      tuple(self._move_cost + strength * cost for cost in self._wind_costs))
+        self._update_cost_signature()
+        self.graph_key = graph_cache_key(self.compiled, self.flight_height, self.power_mode, self.cost_signature)
+
+    def _calm_cell(self, x, y):
+        """Tipo da célula no mapa sem clima (self.grid); W do próprio mapa volta como livre"""
+        grid = self.grid
+        original = grid.cell_type(x, y) if getattr(grid, "codes", None) is not None else grid[y][x]
+        return original if original != "W" else "0"
+
+    def compile_grid(self, compiled_grid=None):
+        """
+        Converte a grade com clima em arrays compactos (CompiledGrid), ou adota
+        um já pronto. As cópias lista-de-listas deixam de ser mantidas após a compilação.
+        """
+        from Environment.adjacency import get_neighbor_graph
+        from Environment.compiled_grid import CompiledGrid
+        
+        if compiled_grid is None:
+            compiled_grid = CompiledGrid.from_grid(self.grid_with_weather)
+        self.compiled = compiled_grid
+        passable = self.compiled.passable_mask(self.flight_height, self.power_mode)
+        
+        # Indexação escalar em arrays NumPy é lenta no laço interno das buscas;
+        # as máscaras achatadas em bytes mantêm o acesso O(1) e compacto
+        self._passable_flat = passable.tobytes()
+        self._set_wind_field(self.compiled.wind)
+        self._private_weather = False
+        
+        # Adjacência CSR compartilhada entre ambientes com o mesmo mapa, clima e configuração
+        self.graph_key, self.graph = get_neighbor_graph(
+            self.compiled, self.flight_height, self.power_mode,
+            passable, self._move_cost, self._wind_costs, self.wind_field, self.cost_signature
+        )
+        
+        self.original_grid = None
+        self.grid_with_weather = None
+        return self.compiled
+
+    def compiled_copy(self):
+        """
+        O ambiente no modo compilado (ou em blocos) para planejadores que exigem a adjacência CSR:
+        o próprio, ou uma cópia compilada que compartilha os agentes, deixando intacta a grade
+        de listas deste ambiente (que a interface pode estar usando)
+        """
+        import copy
+
+        if self.compiled is not None or self.tiled is not None:
+            return self
+        env = copy.copy(self)
+        env.compile_grid()
+        return env
+
+    def _weather_move_costs(self):
+        """
+        Custo de entrar numa célula calma e acréscimo por unidade de vento em cada direção
+        de movimento (ordem de Environment.weather.MOVES): vento contra o movimento custa mais
+        """
+        from Environment.weather import direction_factors
+        
+        move_cost = self.min_move_cost()
+        self.wind_factors = direction_factors(self.weather_conditions)
+        self.wind_directional = any(factor != 1.0 for factor in self.wind_factors)
+        return move_cost, tuple(move_cost * factor for factor in self.wind_factors)
+
+    def _wind_mask_lists(self):
+        """Máscara das células W da grade de listas"""
+        import numpy as np
+        
+        return np.fromiter((cell == "W" for row in self.grid_with_weather for cell in row),
+                           dtype=np.bool_, count=self.rows * self.cols).reshape(self.rows, self.cols)
+
+    def _set_wind_field(self, wind):
+        """
+        Campo contínuo de vento (float32, intensidade por célula): weather_conditions['wind_field']
+        quando fornecido, senão 1.0 nas células W. Lido no laço das buscas por uma memoryview.
+        """
+        import numpy as np
+        from Environment.weather import custom_wind_field
+        
+        field = custom_wind_field(self.weather_conditions, self.rows, self.cols)
+        self._custom_wind = field is not None
+        self.wind_field = field if field is not None else wind.astype(np.float32)
+        self._wind_view = memoryview(self.wind_field.reshape(-1))
+        self._update_cost_signature()
+
+    def _update_cost_signature(self):
+        from Environment.weather import cost_signature
+        
+        custom = self.wind_field if getattr(self, "_custom_wind", False) else None
+        self.cost_signature = cost_signature(self.weather_conditions, custom)
 
     def find_charging_stations(self):
         """Encontra bases de carregamento"""
+        if self.tiled is not None:
+            stations = {pos: {"type": "charging_station", "charge_rate": 15.0}
+                        for pos in self.tiled.map.charging_stations()}
+            print(f"🔋 Bases de carregamento: {len(stations)} (índice do mapa)")
+            return stations
+        if self.compiled is not None:
+            stations = {pos: {"type": "charging_station", "charge_rate": 15.0}
+                        for pos in self.compiled.positions(self.compiled.charging)}
+            print(f"🔋 Bases de carregamento: {list(stations.keys())}")
+            return stations
+        
         stations = {}
         for y in range(self.rows):
             for x in range(self.cols):
@@ -76,6 +316,17 @@ class Environment:
 
     def find_delivery_points(self):
         """Encontra pontos de entrega"""
+        if self.tiled is not None:
+            points = {pos: {"type": "delivery_point", "delivery_time": 3}
+                      for pos in self.tiled.map.delivery_points().values()}
+            print(f"📦 Pontos de entrega: {list(points.keys())}")
+            return points
+        if self.compiled is not None:
+            points = {pos: {"type": "delivery_point", "delivery_time": 3}
+                      for pos in self.compiled.positions(self.compiled.delivery)}
+            print(f"📦 Pontos de entrega: {list(points.keys())}")
+            return points
+        
         points = {}
         for y in range(self.rows):
             for x in range(self.cols):
@@ -84,20 +335,99 @@ class Environment:
         print(f"📦 Pontos de entrega: {list(points.keys())}")
         return points
 
+    def find_wind_cells(self):
+        """Células com vento (W, ou intensidade positiva no campo de vento)"""
+        if self.tiled is not None:
+            return self.tiled.wind_cells()
+        ys, xs = (self.wind_field > 0).nonzero()
+        return list(zip(xs.tolist(), ys.tolist()))
+
     def admissible_heuristic(self, state, agent_name):
         """Heurística baseada na missão atual"""
-        current_mission = self.agent_dict[agent_name]["mission"]
+        return self.goal_heuristic(self.get_current_goal(agent_name))(state)
+
+    def goal_heuristic(self, goal):
+        """
+        Função h(posição) para um objetivo fixo, resolvida uma única vez por busca.
+        No modo compilado usa a tabela de distâncias exata (Dijkstra reverso sobre
+        a grade com clima); caso contrário, Manhattan escalada pelo menor custo de passo.
+        """
+        goal = tuple(goal)
+        if self.compiled is not None:
+            return self.distance_table(goal).cost
         
-        if current_mission == "outbound":
-            # Indo para entrega
-            goal = self.agent_dict[agent_name]["goal"]
-        elif current_mission == "inbound":
-            # Voltando para base
-            goal = self.agent_dict[agent_name]["home_base"]
-        else:
-            goal = self.agent_dict[agent_name]["goal"]
+        step_cost = self.min_move_cost()
+        gx, gy = goal
+        return lambda state: (abs(gx - state[0]) + abs(gy - state[1])) * step_cost
+
+    def distance_table(self, root, reverse=True):
+        """Tabela de distâncias (em cache) até a raiz, ou a partir dela se reverse=False"""
+        from Environment.distance_tables import get_distance_table
+        
+        return get_distance_table(self.graph_key, self.graph, tuple(root), reverse)
+
+    def lazy_distance_table(self, root, reverse=True):
+        """Árvore de caminhos da raiz montada só até onde as consultas precisaram (em cache)"""
+        from Environment.distance_tables import get_lazy_distance_table
+        
+        return get_lazy_distance_table(self.graph_key, self.graph, tuple(root), reverse)
+
+    def weather_forecast(self):
+        """
+        Previsão do tempo usada no planejamento espaço-tempo (Environment.forecast).
+        Pode ser atribuída diretamente em self.forecast; senão é montada a partir do
+        clima atual com weather_conditions['forecast'] = {"steps", "drift", "interval"}
+        (sem essa chave o clima atual fica parado)
+        """
+        if self.forecast is None:
+            from Environment.forecast import WeatherForecast
             
-        return abs(goal[0] - state[0]) + abs(goal[1] - state[1])
+            spec = self.weather_conditions.get('forecast') or {"steps": 0}
+            self.forecast = WeatherForecast.from_environment(self, **spec)
+        return self.forecast
+
+    def abstract_graph(self, cluster_size=None):
+        """Abstração hierárquica (HPA*) da configuração, montada cluster a cluster sob demanda"""
+        from Environment.hierarchy import get_abstract_graph
+        
+        return get_abstract_graph(self, cluster_size)
+
+    def entry_costs(self, x0, y0, x1, y1, directional=False):
+        """
+        Custo de entrar em cada célula do retângulo [x0, x1) x [y0, y1), como array 2D
+        (inf nas células intransitáveis). Com directional=True o array é 3D: um plano por
+        direção do movimento de entrada (ordem de Environment.weather.MOVES).
+        """
+        import numpy as np
+        
+        if self.compiled is not None:
+            passable = np.frombuffer(self._passable_flat, dtype=np.bool_).reshape(self.rows, self.cols)
+            passable = passable[y0:y1, x0:x1]
+            if not directional:
+                return np.where(passable, self.graph.cell_costs[y0:y1, x0:x1], np.inf)
+            wind = self.wind_field[y0:y1, x0:x1].astype(np.float64)
+        elif self.tiled is not None:
+            passable, wind = self.tiled.window(x0, y0, x1, y1)
+            if not directional:
+                return np.where(passable, self._move_cost + wind * self._move_cost, np.inf)
+        else:
+            passable = np.array([[self.is_passable((x, y)) for x in range(x0, x1)]
+                                 for y in range(y0, y1)], dtype=np.bool_)
+            wind = self.wind_field[y0:y1, x0:x1].astype(np.float64)
+            if not directional:
+                return np.where(passable, self._move_cost + wind * self._move_cost, np.inf)
+        
+        return np.stack([np.where(passable, self._move_cost + wind * cost, np.inf)
+                         for cost in self._wind_costs])
+
+    def min_move_cost(self):
+        """Menor custo possível de um passo (célula sem vento), com o efeito da temperatura"""
+        from Environment.weather import temperature_factor
+        
+        base_cost = 1.5 if self.flight_height == "high" else 0.8
+        if self.power_mode == "battery_saver":
+            base_cost *= 0.7
+        return base_cost * temperature_factor(self.weather_conditions)
 
     def is_mission_complete(self, state, agent_name):
         """Verifica se a missão completa foi concluída"""
@@ -164,6 +494,11 @@ class Environment:
 
     def get_neighbors(self, state, current_battery=100.0, ignore_battery=False):
         """Vizinhos considerando bateria"""
+        if self.compiled is not None:
+            return self._get_neighbors_compiled(state, current_battery, ignore_battery)
+        if self.tiled is not None:
+            return self._get_neighbors_tiled(state, current_battery, ignore_battery)
+        
         (x, y) = state
         moves = [(1,0), (-1,0), (0,1), (0,-1)]
         neighbors = []
@@ -187,26 +522,98 @@ class Environment:
                 
         return neighbors
 
-    def calculate_move_cost(self, from_pos, to_pos, current_battery):
-        """Custo de movimento"""
-        base_cost = 1.0
+    def get_predecessors(self, state):
+        """
+        Células das quais é possível mover-se para state (busca reversa).
+        A transitabilidade depende só da célula de destino: se state é transitável,
+        todos os vizinhos dentro do mapa o alcançam.
+        """
+        if not self.is_passable(state):
+            return []
+        (x, y) = state
+        return [(x + dx, y + dy) for dx, dy in [(1,0), (-1,0), (0,1), (0,-1)]
+                if 0 <= x + dx < self.cols and 0 <= y + dy < self.rows]
+
+    def is_passable(self, position):
+        """Se a célula pode ser ocupada com a altura e o modo de potência atuais"""
+        x, y = position
+        if self.compiled is not None:
+            return bool(self._passable_flat[y * self.cols + x])
+        if self.tiled is not None:
+            return self.tiled.passable(x, y)
         
-        if self.flight_height == "high":
-            base_cost *= 1.5
-        else:
-            base_cost *= 0.8
+        cell = self.grid_with_weather[y][x]
+        if cell in ["X", "x"]:
+            return False
+        if cell == "A" and (self.flight_height == "low" or self.power_mode == "battery_saver"):
+            return False
+        return True
 
-        tx, ty = to_pos
-        if self.grid_with_weather[ty][tx] == "W":
-            base_cost *= 2.0
+    def is_windy(self, position):
+        """Se a célula tem vento (clima atual); nos mapas em blocos só o bloco da célula é lido"""
+        x, y = position
+        if self.tiled is not None:
+            return self.tiled.wind(x, y)
+        return self._wind_view[y * self.cols + x] > 0
 
-        if self.power_mode == "battery_saver":
-            base_cost *= 0.7
+    def _get_neighbors_compiled(self, state, current_battery, ignore_battery):
+        """Vizinhos lidos da adjacência CSR pré-calculada"""
+        (x, y) = state
+        cols = self.cols
+        indptr, indices, costs = self.graph.views()
+        index = y * cols + x
+        neighbors = []
+
+        for edge in range(indptr[index], indptr[index + 1]):
+            if ignore_battery or costs[edge] <= current_battery:
+                ny, nx = divmod(indices[edge], cols)
+                neighbors.append((nx, ny))
+                
+        return neighbors
+
+    def _get_neighbors_tiled(self, state, current_battery, ignore_battery):
+        """Vizinhos lidos das camadas dos blocos (carregados sob demanda)"""
+        (x, y) = state
+        tiled = self.tiled
+        neighbors = []
 
-        return base_cost
+        for move, (dx, dy) in enumerate([(1,0), (-1,0), (0,1), (0,-1)]):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.cols and 0 <= ny < self.rows and tiled.passable(nx, ny):
+                move_cost = self._move_cost + self._wind_costs[move] if tiled.wind(nx, ny) else self._move_cost
+                if ignore_battery or move_cost <= current_battery:
+                    neighbors.append((nx, ny))
+                
+        return neighbors
+
+    def calculate_move_cost(self, from_pos, to_pos, current_battery):
+        """
+        Custo de movimento: custo da célula calma (altura, modo de potência, temperatura)
+        mais a intensidade do vento na célula de destino vezes o acréscimo da direção do
+        movimento. Sem from_pos, o acréscimo é o sem direção (média das quatro).
+        """
+        tx, ty = to_pos
+        if self.tiled is not None:
+            wind = 1.0 if self.tiled.wind(tx, ty) else 0.0
+        else:
+            wind = self._wind_view[ty * self.cols + tx]
+        if not wind:
+            return self._move_cost
+        if from_pos is None or not self.wind_directional:
+            return self._move_cost + wind * self._move_cost
+        
+        if tx != from_pos[0]:
+            move = 0 if tx > from_pos[0] else 1
+        else:
+            move = 2 if ty > from_pos[1] else 3
+        return self._move_cost + wind * self._wind_costs[move]
 
     def get_cell_type(self, position):
         x, y = position
+        if self.compiled is not None:
+            return self.compiled.cell_type(x, y)
+        if self.tiled is not None:
+            return self.tiled.cell_type(x, y)
         return self.grid_with_weather[y][x]
 
     def get_current_goal(self, agent_name):
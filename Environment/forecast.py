@@ -0,0 +1,93 @@
+import numpy as np
+
+from config import settings
+
+# Multiplicadores guardados em uint8: multiplicador = MULTIPLIER_MIN + código * MULTIPLIER_STEP
+# (0.5 a ~8.47, com 1.0 e 2.0 exatos)
+MULTIPLIER_MIN = 0.5
+MULTIPLIER_STEP = 1 / 32
+
+
+def quantize_multipliers(multipliers):
+    """Códigos uint8 dos multiplicadores (saturados na faixa representável)"""
+    codes = np.rint((np.asarray(multipliers, dtype=np.float64) - MULTIPLIER_MIN) / MULTIPLIER_STEP)
+    return np.clip(codes, 0, 255).astype(np.uint8)
+
+
+def shift_layer(layer, dx, dy, fill=1.0):
+    """Camada deslocada (dx, dy) células; o que entra pela borda recebe fill"""
+    rows, cols = layer.shape
+    shifted = np.full_like(layer, fill)
+    if abs(dx) >= cols or abs(dy) >= rows:
+        return shifted
+    shifted[max(dy, 0):rows + min(dy, 0), max(dx, 0):cols + min(dx, 0)] = \
+        layer[max(-dy, 0):rows + min(-dy, 0), max(-dx, 0):cols + min(-dx, 0)]
+    return shifted
+
+
+class WeatherForecast:
+    """
+    Previsão do tempo: multiplicadores do custo de entrada de cada célula ao longo do tempo.
+    Só os quadros-chave (a cada `interval` passos, de 0 ao horizonte) são guardados,
+    como bytes de códigos uint8; o multiplicador de um passo intermediário é
+    interpolado linearmente na hora da consulta, só na célula consultada.
+    Depois do horizonte vale o último quadro.
+    """
+
+    def __init__(self, keyframes, interval=None):
+        codes = [quantize_multipliers(keyframe) for keyframe in keyframes]
+        self.rows, self.cols = codes[0].shape
+        self.interval = interval or settings.FORECAST_INTERVAL
+        self.horizon = (len(codes) - 1) * self.interval
+        self.frames = [frame.tobytes() for frame in codes]
+        low = np.minimum.reduce(codes)
+        self.min_multiplier = MULTIPLIER_MIN + int(low.min()) * MULTIPLIER_STEP
+        self._lower_bound = low
+
+    @classmethod
+    def from_environment(cls, env, steps=None, drift=(0.0, 0.0), interval=None):
+        """
+        Previsão a partir do clima atual do ambiente, que se desloca drift células
+        por passo (frente de vento); drift=(0, 0) mantém o clima parado
+        """
+        steps = settings.FORECAST_STEPS if steps is None else steps
+        interval = interval or settings.FORECAST_INTERVAL
+        costs = env.entry_costs(0, 0, env.cols, env.rows)
+        current = np.where(np.isfinite(costs), costs / env.min_move_cost(), 1.0)
+
+        dx, dy = drift
+        if steps <= 0 or (dx == 0 and dy == 0):
+            return cls([current], interval)
+        keyframes = []
+        for k in range(-(-steps // interval) + 1):
+            t = k * interval
+            keyframes.append(shift_layer(current, int(round(dx * t)), int(round(dy * t))))
+        return cls(keyframes, interval)
+
+    def multiplier(self, x, y, t):
+        """Multiplicador da célula no passo t (interpolado entre os quadros vizinhos)"""
+        index = y * self.cols + x
+        if t >= self.horizon:
+            return MULTIPLIER_MIN + self.frames[-1][index] * MULTIPLIER_STEP
+        k, offset = divmod(t, self.interval)
+        code = self.frames[k][index]
+        if offset:
+            code += (self.frames[k + 1][index] - code) * offset / self.interval
+        return MULTIPLIER_MIN + code * MULTIPLIER_STEP
+
+    def layer(self, t):
+        """Multiplicadores do mapa inteiro no passo t (float32, montado só quando pedido)"""
+        t = min(t, self.horizon)
+        k, offset = divmod(t, self.interval)
+        code = np.frombuffer(self.frames[k], dtype=np.uint8).astype(np.float32)
+        if offset:
+            following = np.frombuffer(self.frames[k + 1], dtype=np.uint8).astype(np.float32)
+            code += (following - code) * (offset / self.interval)
+        return (MULTIPLIER_MIN + code * MULTIPLIER_STEP).reshape(self.rows, self.cols)
+
+    def lower_bound(self):
+        """Menor multiplicador de cada célula em todo o horizonte (base de heurísticas admissíveis)"""
+        return MULTIPLIER_MIN + self._lower_bound.astype(np.float64) * MULTIPLIER_STEP
+
+    def nbytes(self):
+        return sum(len(frame) for frame in self.frames) + self._lower_bound.nbytes
@@ -0,0 +1,331 @@
+import copy
+import heapq
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+from config import settings
+
+# Cada trecho livre de fronteira recebe uma transição no par de células mais barato;
+# os trechos a partir deste comprimento, também nas pontas
+LONG_ENTRANCE = 6
+
+_abstract_cache = OrderedDict()
+
+
+class LocalTree:
+    """
+    Caminhos mínimos dentro do retângulo de um cluster, enraizados numa célula.
+    reverse=False: da raiz até cada célula; reverse=True: de cada célula até a raiz.
+    link[i] é o índice local da célula vizinha rumo à raiz (-1 na raiz e nas não alcançadas).
+    """
+
+    def __init__(self, root, x0, y0, width, link, reverse=False, dist=None):
+        self.root = root
+        self.x0 = x0
+        self.y0 = y0
+        self.width = width
+        self.link = link
+        self.reverse = reverse
+        self.dist = dist
+
+    def cost(self, position):
+        x, y = position
+        return self.dist[(y - self.y0) * self.width + x - self.x0]
+
+    def path(self, position):
+        """Caminho na ordem de percurso: raiz → posição, ou posição → raiz na árvore reversa"""
+        x0, y0, width, link = self.x0, self.y0, self.width, self.link
+        x, y = position
+        index = (y - y0) * width + x - x0
+        path = [position]
+        while link[index] != -1:
+            index = link[index]
+            ly, lx = divmod(index, width)
+            path.append((x0 + lx, y0 + ly))
+        if not self.reverse:
+            path.reverse()
+        return path
+
+
+def local_dijkstra(costs, width, height, source, stop, reverse=False):
+    """
+    Dijkstra restrito a um retângulo (índices locais y * width + x).
+    costs[m][i] é o custo de entrar na célula i com o movimento m (ordem de
+    Environment.weather.MOVES; inf se intransitável). As células de stop
+    são alcançadas mas não expandidas: numa base de carregamento a bateria muda,
+    então ela só pode ser extremidade de uma aresta abstrata, nunca ponto intermediário.
+    Retorna (dist, link) como listas.
+    """
+    inf = float("inf")
+    dist = [inf] * (width * height)
+    link = [-1] * (width * height)
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    east, west, south, north = costs
+
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u] or (u in stop and u != source):
+            continue
+        y, x = divmod(u, width)
+        for v, inside, forward, backward in ((u + 1, x + 1 < width, east, west), (u - 1, x > 0, west, east),
+                                             (u + width, y + 1 < height, south, north),
+                                             (u - width, y > 0, north, south)):
+            if not inside or east[v] == inf:
+                continue
+            # Mover de a para b custa a entrada em b: na busca reversa o passo é v → u, no sentido oposto
+            nd = d + (backward[u] if reverse else forward[v])
+            if nd < dist[v]:
+                dist[v] = nd
+                link[v] = u
+                heapq.heappush(heap, (nd, v))
+
+    return dist, link
+
+
+class AbstractGraph:
+    """
+    Abstração hierárquica do mapa (HPA*) para uma configuração de voo e um clima.
+    O mapa é dividido em clusters cluster_size x cluster_size. Os nós abstratos são as
+    transições entre clusters vizinhos (de uma a três por trecho livre de fronteira)
+    e as bases de carregamento; as arestas internas guardam o custo mínimo entre os
+    nós de um mesmo cluster sem passar por outra base, então a bateria ao longo de
+    uma aresta cai exatamente do seu custo.
+    Fronteiras e clusters são montados na primeira vez que a busca chega a eles
+    e invalidados individualmente quando o clima muda (invalidate).
+    """
+
+    def __init__(self, env, cluster_size):
+        self.env = env
+        self.cluster_size = cluster_size
+        self.rows, self.cols = env.rows, env.cols
+        self.clusters_x = -(-self.cols // cluster_size)
+        self.clusters_y = -(-self.rows // cluster_size)
+        self.min_step = env.min_move_cost()
+        self.clusters_built = 0
+
+        # Bases agrupadas por cluster uma única vez (o mapa pode ter milhares delas)
+        self.stations = {}
+        for (x, y) in env.charging_stations:
+            self.stations.setdefault((x // cluster_size, y // cluster_size), []).append((x, y))
+
+        self._borders = {}
+        self._clusters = {}
+
+    def cluster_of(self, position):
+        x, y = position
+        return x // self.cluster_size, y // self.cluster_size
+
+    def bounds(self, key):
+        """Retângulo [x0, x1) x [y0, y1) do cluster"""
+        cx, cy = key
+        size = self.cluster_size
+        x0, y0 = cx * size, cy * size
+        return x0, y0, min(x0 + size, self.cols), min(y0 + size, self.rows)
+
+    def border_keys(self, key):
+        """Fronteiras do cluster: ("v", cx, cy) separa (cx, cy) de (cx+1, cy); ("h", ...) de (cx, cy+1)"""
+        cx, cy = key
+        keys = []
+        if cx > 0:
+            keys.append(("v", cx - 1, cy))
+        if cx + 1 < self.clusters_x:
+            keys.append(("v", cx, cy))
+        if cy > 0:
+            keys.append(("h", cx, cy - 1))
+        if cy + 1 < self.clusters_y:
+            keys.append(("h", cx, cy))
+        return keys
+
+    def border_clusters(self, border_key):
+        orientation, cx, cy = border_key
+        return [(cx, cy), (cx + 1, cy) if orientation == "v" else (cx, cy + 1)]
+
+    def border(self, border_key):
+        """{célula de transição: [(célula do outro lado, custo do passo)]} da fronteira"""
+        links = self._borders.get(border_key)
+        if links is None:
+            links = self._borders[border_key] = self._build_border(border_key)
+        return links
+
+    def _build_border(self, border_key):
+        orientation, cx, cy = border_key
+        size = self.cluster_size
+        # forward: custo do passo a → b (entrar em b), backward: de b → a (entrar em a)
+        if orientation == "v":
+            x = (cx + 1) * size - 1
+            y0, y1 = cy * size, min((cy + 1) * size, self.rows)
+            costs = self.env.entry_costs(x, y0, x + 2, y1, directional=True).transpose(0, 2, 1)
+            forward, backward = costs[0][1], costs[1][0]
+            cells = [((x, y), (x + 1, y)) for y in range(y0, y1)]
+        else:
+            y = (cy + 1) * size - 1
+            x0, x1 = cx * size, min((cx + 1) * size, self.cols)
+            costs = self.env.entry_costs(x0, y, x1, y + 2, directional=True)
+            forward, backward = costs[2][1], costs[3][0]
+            cells = [((x, y), (x, y + 1)) for x in range(x0, x1)]
+
+        # Trechos contíguos em que as duas células frente a frente são transitáveis
+        open_pairs = np.isfinite(forward) & np.isfinite(backward)
+        edges = np.diff(np.concatenate(([0], open_pairs.view(np.int8), [0])))
+        starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        pair_costs = (forward + backward).tolist()
+
+        links = {}
+        for run_start, run_end in zip(starts.tolist(), ends.tolist()):
+            # Par mais barato do trecho (vento), desempatando pelo meio
+            middle = (run_start + run_end - 1) / 2
+            cheapest = min(range(run_start, run_end),
+                           key=lambda i: (pair_costs[i], abs(i - middle)))
+            if run_end - run_start >= LONG_ENTRANCE:
+                picks = sorted({run_start, cheapest, run_end - 1})
+            else:
+                picks = [cheapest]
+            for i in picks:
+                a, b = cells[i]
+                links.setdefault(a, []).append((b, float(forward[i])))
+                links.setdefault(b, []).append((a, float(backward[i])))
+        return links
+
+    def cluster(self, key):
+        """Nós, arestas internas e árvores locais do cluster"""
+        data = self._clusters.get(key)
+        if data is None:
+            data = self._clusters[key] = self._build_cluster(key)
+            self.clusters_built += 1
+        return data
+
+    def _build_cluster(self, key):
+        x0, y0, x1, y1 = self.bounds(key)
+        width, height = x1 - x0, y1 - y0
+        if self.env.wind_directional:
+            costs = tuple(layer.ravel().tolist()
+                          for layer in self.env.entry_costs(x0, y0, x1, y1, directional=True))
+        else:
+            # Sem direção do vento os quatro movimentos compartilham a mesma lista
+            costs = (self.env.entry_costs(x0, y0, x1, y1).ravel().tolist(),) * 4
+        local = lambda position: (position[1] - y0) * width + position[0] - x0
+
+        nodes = set()
+        for border_key in self.border_keys(key):
+            nodes.update(position for position in self.border(border_key)
+                         if x0 <= position[0] < x1 and y0 <= position[1] < y1)
+        stations = [position for position in self.stations.get(key, ())
+                    if costs[0][local(position)] != float("inf")]
+        nodes.update(stations)
+        stop = {local(position) for position in stations}
+
+        edges = {}
+        trees = {}
+        for node in nodes:
+            dist, link = local_dijkstra(costs, width, height, local(node), stop)
+            # Índices locais cabem em int32; a árvore fica compacta em memória
+            trees[node] = LocalTree(node, x0, y0, width, array("i", link))
+            edges[node] = [(other, dist[local(other)]) for other in nodes
+                           if other != node and dist[local(other)] != float("inf")]
+
+        return {"costs": costs, "stop": stop, "edges": edges, "trees": trees}
+
+    def successors(self, node):
+        """Arestas (vizinho, custo, árvore local ou None) do nó abstrato"""
+        key = self.cluster_of(node)
+        data = self.cluster(key)
+        trees = data["trees"]
+        result = [(other, cost, trees[node]) for other, cost in data["edges"].get(node, ())]
+        for border_key in self.border_keys(key):
+            result.extend((other, cost, None) for other, cost in self.border(border_key).get(node, ()))
+        return result
+
+    def connect(self, position, reverse=False):
+        """
+        Liga uma célula qualquer (início ou objetivo) aos nós abstratos do seu cluster.
+        Retorna (árvore local com distâncias, {nó: custo}); com reverse=True os custos
+        são dos nós até a célula.
+        """
+        key = self.cluster_of(position)
+        data = self.cluster(key)
+        x0, y0, x1, y1 = self.bounds(key)
+        width = x1 - x0
+        local = lambda cell: (cell[1] - y0) * width + cell[0] - x0
+
+        dist, link = local_dijkstra(data["costs"], width, y1 - y0, local(position), data["stop"], reverse)
+        tree = LocalTree(position, x0, y0, width, link, reverse, dist)
+        costs = {node: dist[local(node)] for node in data["edges"]
+                 if node != position and dist[local(node)] != float("inf")}
+        return tree, costs
+
+    def rebind(self, env):
+        """Cópia ligada a outro ambiente, reaproveitando fronteiras e clusters já montados"""
+        graph = copy.copy(self)
+        graph.env = env
+        graph._borders = dict(self._borders)
+        graph._clusters = dict(self._clusters)
+        return graph
+
+    def invalidate(self, cells):
+        """
+        Descarta os clusters que contêm as células alteradas (e refaz suas fronteiras).
+        Se as transições de uma fronteira mudarem, o cluster do outro lado também é descartado.
+        Retorna quantos clusters foram invalidados.
+        """
+        touched = {self.cluster_of(cell) for cell in cells}
+        dropped = set(touched)
+        for key in touched:
+            self._clusters.pop(key, None)
+        for key in touched:
+            for border_key in self.border_keys(key):
+                old_links = self._borders.pop(border_key, None)
+                if old_links is None:
+                    continue
+                if self.border(border_key).keys() != old_links.keys():
+                    for other in self.border_clusters(border_key):
+                        self._clusters.pop(other, None)
+                        dropped.add(other)
+        return len(dropped)
+
+
+def abstract_graph_key(env, cluster_size):
+    """Chave da abstração: mapa + clima + configuração de voo"""
+    if env.compiled is not None:
+        return env.graph_key, cluster_size
+    if env.tiled is not None:
+        tiled = env.tiled
+        return (tiled.map.path, env.flight_height, env.power_mode, env.cost_signature, tiled.wind_layers,
+                tiled.weather_seed, tiled.weather_version, cluster_size)
+    # Grade de listas: a abstração é do próprio ambiente (que ela mantém vivo enquanto em cache)
+    return "env", id(env), cluster_size
+
+
+def get_abstract_graph(env, cluster_size=None):
+    """Abstração da configuração do ambiente, compartilhada entre ambientes equivalentes (LRU)"""
+    cluster_size = cluster_size or settings.HPA_CLUSTER_SIZE
+    key = abstract_graph_key(env, cluster_size)
+    graph = _abstract_cache.get(key)
+    if graph is not None:
+        _abstract_cache.move_to_end(key)
+        return graph
+
+    graph = _abstract_cache[key] = AbstractGraph(env, cluster_size)
+    while len(_abstract_cache) > settings.HPA_CACHE_SIZE:
+        _abstract_cache.popitem(last=False)
+    return graph
+
+
+def update_abstract_graphs(env, old_key, cells):
+    """
+    Traz as abstrações do clima anterior (chave old_key, sem o tamanho do cluster) para o
+    clima atual do ambiente, refazendo só os clusters das células alteradas.
+    As entradas antigas continuam em cache para ambientes que ainda estão naquele clima.
+    """
+    for key in [key for key in _abstract_cache if key[:-1] == old_key]:
+        graph = _abstract_cache[key].rebind(env)
+        graph.invalidate(cells)
+        _abstract_cache[abstract_graph_key(env, graph.cluster_size)] = graph
+    while len(_abstract_cache) > settings.HPA_CACHE_SIZE:
+        _abstract_cache.popitem(last=False)
+
+
+def clear_abstract_cache():
+    _abstract_cache.clear()
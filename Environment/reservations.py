@@ -0,0 +1,102 @@
+from collections import defaultdict
+
+from config import settings
+
+
+class ReservationTable:
+    """
+    Tabela de reservas espaço-tempo: quem ocupa a célula (x, y) no passo t.
+    As ocupações são intervalos [início, fim] (uma espera longa, como a pausa da entrega
+    ou o repouso na base, é uma única entrada) indexados num dicionário por
+    (célula, balde de tempo): a consulta olha um só balde, com poucos intervalos.
+    Os movimentos reservados (origem → destino chegando em t) impedem trocas de célula.
+    Nas células seguras (a base compartilhada) nada é reservado.
+    advance(t) descarta os baldes que terminam antes de t, limitando a memória
+    em horizontes longos.
+    """
+
+    def __init__(self, safe_cells=(), bucket_size=None):
+        bucket_size = bucket_size or settings.RESERVATION_BUCKET_SIZE
+        # Baldes de tamanho potência de 2: o balde de t é t >> shift
+        self.shift = max(bucket_size - 1, 0).bit_length()
+        self.safe_cells = frozenset(safe_cells)
+        self.last_time = 0
+        self._slots = {}                   # (célula, balde) → [(início, fim, dono)]
+        self._moves = {}                   # (origem, destino, t) → dono
+        self._by_bucket = defaultdict(set) # balde → chaves de _slots e _moves que o tocam
+        self._start_bucket = 0
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._slots.values()) + len(self._moves)
+
+    def reserve(self, cell, start, end=None, owner=None):
+        """Reserva a célula de start a end (inclusive; padrão: só o passo start)"""
+        if cell in self.safe_cells:
+            return
+        end = start if end is None else end
+        entry = (start, end, owner)
+        for bucket in range(max(start >> self.shift, self._start_bucket), (end >> self.shift) + 1):
+            key = (cell, bucket)
+            self._slots.setdefault(key, []).append(entry)
+            self._by_bucket[bucket].add(key)
+        self.last_time = max(self.last_time, end)
+
+    def reserve_move(self, source, target, t, owner=None):
+        """Reserva o movimento source → target que chega no passo t"""
+        key = (source, target, t)
+        self._moves[key] = owner
+        self._by_bucket[t >> self.shift].add(key)
+        self.last_time = max(self.last_time, t)
+
+    def reserve_path(self, path, owner=None, start_time=0):
+        """Reserva um caminho (célula em cada passo); paradas seguidas viram um só intervalo"""
+        first = 0
+        for index in range(1, len(path) + 1):
+            if index < len(path) and path[index] == path[first]:
+                continue
+            self.reserve(path[first], start_time + first, start_time + index - 1, owner)
+            if index < len(path):
+                self.reserve_move(path[index - 1], path[index], start_time + index, owner)
+            first = index
+
+    def is_reserved(self, cell, t, ignore=None):
+        """Se a célula está reservada no passo t por alguém além de ignore"""
+        entries = self._slots.get((cell, t >> self.shift))
+        if not entries:
+            return False
+        return any(start <= t <= end and (ignore is None or owner != ignore) for start, end, owner in entries)
+
+    def crosses(self, source, target, t, ignore=None):
+        """Se o movimento source → target chegando em t cruza um movimento reservado no sentido oposto"""
+        key = (target, source, t)
+        return key in self._moves and (ignore is None or self._moves[key] != ignore)
+
+    def is_move_free(self, source, target, t, ignore=None):
+        """Se o movimento source → target chegando em t não colide com nenhuma reserva"""
+        return not (self.is_reserved(target, t, ignore) or self.crosses(source, target, t, ignore))
+
+    def is_free(self, cell, start, end, ignore=None):
+        """Se a célula fica livre de start a end (inclusive)"""
+        for bucket in range(start >> self.shift, (end >> self.shift) + 1):
+            for first, last, owner in self._slots.get((cell, bucket), ()):
+                if first <= end and start <= last and (ignore is None or owner != ignore):
+                    return False
+        return True
+
+    def is_path_free(self, path, start_time=0, ignore=None):
+        """Se o caminho inteiro pode ser percorrido sem colidir com as reservas"""
+        if not self.is_free(path[0], start_time, start_time, ignore):
+            return False
+        return all(self.is_move_free(source, target, t, ignore)
+                   for t, (source, target) in enumerate(zip(path, path[1:]), start_time + 1))
+
+    def advance(self, t):
+        """Descarta os baldes anteriores ao do passo t (o passado não é mais consultado)"""
+        bucket = t >> self.shift
+        for old in [old for old in self._by_bucket if old < bucket]:
+            for key in self._by_bucket.pop(old):
+                if len(key) == 3:
+                    self._moves.pop(key, None)
+                else:
+                    self._slots.pop(key, None)
+        self._start_bucket = max(self._start_bucket, bucket)
@@ -0,0 +1,273 @@
+import json
+import os
+import struct
+from collections import OrderedDict
+
+import numpy as np
+
+from config import settings
+from Environment.compiled_grid import (AREA_A_CODES, BLOCKED_CODES, CELL_CODES, CHARGING_CODES,
+                                       FREE_CODES, WIND_CODES)
+from Environment.weather import bernoulli_wind
+
+TILED_MAGIC = b"DRNTILE1"
+TILED_EXTENSION = ".tmap"
+# Blocos começam em fronteira de página: ler um bloco só toca as páginas dele
+PAGE_ALIGNMENT = 4096
+_LENGTH = struct.Struct("<I")
+# Células indexadas no cabeçalho (primeira ocorrência de cada)
+POI_LABELS = ["S", "1", "2", "3", "4"]
+
+
+def _aligned(offset, alignment):
+    return offset + (-offset % alignment)
+
+
+class TiledMap:
+    """
+    Mapa em blocos mapeado em memória (.tmap).
+    Os códigos de célula ficam gravados bloco a bloco (tile_size x tile_size contíguos),
+    então um bloco é lido do disco só quando a busca chega nele; o cabeçalho guarda
+    partida, entregas e o índice das bases de carregamento, sem varrer o mapa.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        with open(self.path, "rb") as handle:
+            magic = handle.read(len(TILED_MAGIC))
+            if magic != TILED_MAGIC:
+                raise ValueError(f"{path} não é um mapa {TILED_EXTENSION} (assinatura {magic!r})")
+            (length,) = _LENGTH.unpack(handle.read(_LENGTH.size))
+            self.metadata = json.loads(handle.read(length).decode("utf-8"))
+
+        self.rows = self.metadata["rows"]
+        self.cols = self.metadata["cols"]
+        self.tile_size = self.metadata["tile_size"]
+        self.tiles_x = self.metadata["tiles_x"]
+        self.tiles_y = self.metadata["tiles_y"]
+        self.vocabulary = self.metadata["vocabulary"]
+
+        self._charging = np.memmap(self.path, dtype=np.uint64, mode="r",
+                                   offset=self.metadata["charging_offset"],
+                                   shape=(self.metadata["charging_count"],))
+        self._tiles = np.memmap(self.path, dtype=np.uint8, mode="r",
+                                offset=self.metadata["tiles_offset"],
+                                shape=(self.tiles_y, self.tiles_x, self.tile_size, self.tile_size))
+
+    def __getstate__(self):
+        # Entre processos basta o caminho: os mapeamentos são refeitos ao desserializar
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+    def tile_codes(self, tx, ty):
+        """Códigos do bloco (visão do mapeamento; o sistema operacional pagina sob demanda)"""
+        return self._tiles[ty, tx]
+
+    def cell_type(self, x, y):
+        ts = self.tile_size
+        return self.vocabulary[self._tiles[y // ts, x // ts, y % ts, x % ts]]
+
+    def start(self):
+        start = self.metadata["start"]
+        return tuple(start) if start else None
+
+    def delivery_points(self):
+        """{rótulo: (x, y)} lido do cabeçalho"""
+        return {label: tuple(position) for label, position in self.metadata["delivery_points"].items()}
+
+    def charging_stations(self):
+        """Posições das bases B, do índice gravado no arquivo"""
+        ys, xs = np.divmod(np.asarray(self._charging, dtype=np.int64), self.cols)
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def view(self, flight_height, power_mode, wind_layers=(), weather_seed=0,
+             cache_size=None):
+        """
+        Camadas de transitabilidade e vento de uma configuração de voo, por bloco;
+        wind_layers são pares (probabilidade, região ou None), ver Environment.weather
+        """
+        return TiledView(self, flight_height, power_mode, tuple(wind_layers), weather_seed,
+                         cache_size or settings.TILE_CACHE_SIZE)
+
+
+class TiledView:
+    """
+    Transitabilidade e vento de um TiledMap para uma configuração de voo e um clima.
+    Cada bloco é decodificado na primeira consulta (bytes por célula, acesso O(1))
+    e mantido num cache LRU limitado. As áreas de vento são sorteadas por bloco
+    com semente derivada de (weather_seed, bloco): o mesmo clima reaparece
+    se o bloco sair do cache e for carregado de novo.
+    """
+
+    def __init__(self, tiled_map, flight_height, power_mode, wind_layers, weather_seed, cache_size):
+        self.map = tiled_map
+        self.rows, self.cols = tiled_map.rows, tiled_map.cols
+        self.tile_size = tiled_map.tile_size
+        self.wind_layers = wind_layers
+        self.weather_seed = weather_seed
+        self.cache_size = cache_size
+        self.tiles_loaded = 0
+        # Mudanças de clima feitas depois da criação: {bloco: {índice local: vento}}
+        self.wind_overrides = {}
+        self.weather_version = 0
+
+        blocked = BLOCKED_CODES
+        if flight_height == "low" or power_mode == "battery_saver":
+            blocked = blocked + AREA_A_CODES
+        self._blocked_codes = blocked
+        self._layers = OrderedDict()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_layers"] = OrderedDict()
+        return state
+
+    def layer(self, tx, ty):
+        """(transitável, vento) do bloco, como bytes indexados por (y % ts) * ts + x % ts"""
+        key = (tx, ty)
+        layer = self._layers.get(key)
+        if layer is not None:
+            self._layers.move_to_end(key)
+            return layer
+
+        codes = np.asarray(self.map.tile_codes(tx, ty))
+        wind = np.isin(codes, WIND_CODES)
+        if self.wind_layers:
+            rng = np.random.default_rng((self.weather_seed, tx, ty))
+            ts = self.tile_size
+            wind |= bernoulli_wind(np.isin(codes, FREE_CODES), self.wind_layers, rng, (tx * ts, ty * ts))
+        passable = ~np.isin(codes, self._blocked_codes)
+
+        wind = bytearray(wind.tobytes())
+        for index, value in self.wind_overrides.get(key, {}).items():
+            wind[index] = value
+        layer = (passable.tobytes(), wind)
+        self._layers[key] = layer
+        self.tiles_loaded += 1
+        while len(self._layers) > self.cache_size:
+            self._layers.popitem(last=False)
+        return layer
+
+    def passable(self, x, y):
+        ts = self.tile_size
+        return self.layer(x // ts, y // ts)[0][(y % ts) * ts + x % ts] == 1
+
+    def wind(self, x, y):
+        ts = self.tile_size
+        return self.layer(x // ts, y // ts)[1][(y % ts) * ts + x % ts] == 1
+
+    def set_wind(self, changes):
+        """Aplica mudanças de vento [((x, y), vento)] nos blocos em cache e nos que vierem a ser lidos"""
+        ts = self.tile_size
+        for (x, y), wind in changes:
+            key = (x // ts, y // ts)
+            index = (y % ts) * ts + x % ts
+            self.wind_overrides.setdefault(key, {})[index] = int(wind)
+            layer = self._layers.get(key)
+            if layer is not None:
+                layer[1][index] = int(wind)
+        self.weather_version += 1
+
+    def window(self, x0, y0, x1, y1):
+        """Máscaras (transitável, vento) do retângulo [x0, x1) x [y0, y1), montadas dos blocos"""
+        ts = self.tile_size
+        passable = np.empty((y1 - y0, x1 - x0), dtype=np.bool_)
+        wind = np.empty((y1 - y0, x1 - x0), dtype=np.bool_)
+        for ty in range(y0 // ts, (y1 - 1) // ts + 1):
+            for tx in range(x0 // ts, (x1 - 1) // ts + 1):
+                tile_passable, tile_wind = self.layer(tx, ty)
+                # Interseção do retângulo com o bloco, em coordenadas do bloco
+                ax, ay = max(x0, tx * ts), max(y0, ty * ts)
+                bx, by = min(x1, (tx + 1) * ts), min(y1, (ty + 1) * ts)
+                local = np.s_[ay - ty * ts:by - ty * ts, ax - tx * ts:bx - tx * ts]
+                target = np.s_[ay - y0:by - y0, ax - x0:bx - x0]
+                passable[target] = np.frombuffer(tile_passable, dtype=np.bool_).reshape(ts, ts)[local]
+                wind[target] = np.frombuffer(tile_wind, dtype=np.bool_).reshape(ts, ts)[local]
+        return passable, wind
+
+    def cell_type(self, x, y):
+        return "W" if self.wind(x, y) else self.map.cell_type(x, y)
+
+    def wind_cells(self):
+        """Todas as células W (percorre todos os blocos)"""
+        ts = self.tile_size
+        cells = []
+        for ty in range(self.map.tiles_y):
+            for tx in range(self.map.tiles_x):
+                wind = np.frombuffer(self.layer(tx, ty)[1], dtype=np.bool_).reshape(ts, ts)
+                ys, xs = np.nonzero(wind)
+                cells.extend((tx * ts + x, ty * ts + y) for x, y in zip(xs.tolist(), ys.tolist())
+                             if tx * ts + x < self.cols and ty * ts + y < self.rows)
+        return cells
+
+
+def save_tiled_map(path, codes, vocabulary=None, tile_size=None, source=None):
+    """
+    Grava códigos de célula (array 2D, p.ex. np.memmap de um .dmap) no formato em blocos.
+    A conversão percorre uma faixa de tile_size linhas por vez: a memória usada
+    não depende do tamanho do mapa. Blocos da borda são completados com X.
+    """
+    tile_size = tile_size or settings.TILE_SIZE
+    vocabulary = list(vocabulary or CELL_CODES)
+    rows, cols = codes.shape
+    tiles_y = -(-rows // tile_size)
+    tiles_x = -(-cols // tile_size)
+    points = {}
+    charging = []
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as handle:
+        # O cabeçalho depende do índice de POIs: os blocos são gravados primeiro
+        # num arquivo temporário e o arquivo final é montado no fim
+        tiles_path = path + ".tiles.tmp"
+        with open(tiles_path, "wb") as tiles_handle:
+            for ty in range(tiles_y):
+                band = np.asarray(codes[ty * tile_size:(ty + 1) * tile_size], dtype=np.uint8)
+                band_rows = band.shape[0]
+
+                for label in POI_LABELS:
+                    if label in points or label not in vocabulary:
+                        continue
+                    ys, xs = np.nonzero(band == vocabulary.index(label))
+                    if len(ys):
+                        points[label] = [int(xs[0]), int(ty * tile_size + ys[0])]
+                charging.append(np.flatnonzero(np.isin(band, CHARGING_CODES)).astype(np.uint64)
+                                + np.uint64(ty * tile_size * cols))
+
+                padded = np.full((tile_size, tiles_x * tile_size), CELL_CODES["X"], dtype=np.uint8)
+                padded[:band_rows, :cols] = band
+                tiles = padded.reshape(tile_size, tiles_x, tile_size).transpose(1, 0, 2)
+                tiles_handle.write(np.ascontiguousarray(tiles).tobytes())
+
+        charging = np.concatenate(charging) if charging else np.zeros(0, dtype=np.uint64)
+        metadata = {
+            "rows": rows, "cols": cols, "tile_size": tile_size,
+            "tiles_x": tiles_x, "tiles_y": tiles_y, "vocabulary": vocabulary,
+            "start": points.pop("S", None), "delivery_points": dict(sorted(points.items())),
+            "charging_count": int(len(charging)), "source": source,
+        }
+        # Offsets fixados com folga para o próprio cabeçalho caber antes deles
+        header_estimate = len(json.dumps(metadata).encode("utf-8")) + 128
+        metadata["charging_offset"] = _aligned(len(TILED_MAGIC) + _LENGTH.size + header_estimate, 64)
+        metadata["tiles_offset"] = _aligned(metadata["charging_offset"] + charging.nbytes, PAGE_ALIGNMENT)
+        header = json.dumps(metadata).encode("utf-8")
+
+        handle.write(TILED_MAGIC)
+        handle.write(_LENGTH.pack(len(header)))
+        handle.write(header)
+        handle.write(b"\0" * (metadata["charging_offset"] - handle.tell()))
+        handle.write(charging.tobytes())
+        handle.write(b"\0" * (metadata["tiles_offset"] - handle.tell()))
+        with open(tiles_path, "rb") as tiles_handle:
+            while True:
+                chunk = tiles_handle.read(1 << 24)
+                if not chunk:
+                    break
+                handle.write(chunk)
+        os.remove(tiles_path)
+
+    os.replace(tmp_path, path)
+    return path
+
@@ -0,0 +1,172 @@
+import hashlib
+import logging
+import math
+import random
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Intensidade a partir da qual surgem áreas de vento, e fração das células livres
+# atingidas por unidade de intensidade
+WIND_THRESHOLD = 0.3
+WIND_FRACTION = 0.4
+
+# Movimentos da grade, na ordem usada pelos fatores de direção
+MOVES = [(1,0), (-1,0), (0,1), (0,-1)]
+# Vento de intensidade 1 dobra o custo de entrada; a favor do movimento o acréscimo cai
+# para (1 - WIND_ALIGNMENT), contra ele sobe para (1 + WIND_ALIGNMENT)
+WIND_ALIGNMENT = 0.5
+# Fora da faixa ideal de temperatura da bateria (°C), cada grau aumenta o consumo nesta fração
+BATTERY_TEMPERATURE_RANGE = (15.0, 25.0)
+TEMPERATURE_COEFFICIENT = 0.01
+
+
+def weather_layers(weather_conditions):
+    """
+    Camadas de vento das condições climáticas: a intensidade global (mapa inteiro)
+    seguida de weather_conditions['layers'], cada uma {"wind_intensity", "region"},
+    com region = (x0, y0, x1, y1) semiaberta ou ausente para o mapa inteiro
+    """
+    layers = [(weather_conditions.get('wind_intensity', 0), None)]
+    for layer in weather_conditions.get('layers', ()):
+        region = layer.get('region')
+        layers.append((layer.get('wind_intensity', 0), tuple(region) if region is not None else None))
+    return layers
+
+
+def weather_seed(weather_conditions):
+    """
+    Semente do clima: weather_conditions['seed'] ou, sem ela, tirada do módulo random,
+    para que random.seed() continue reproduzindo o mesmo clima
+    """
+    seed = weather_conditions.get('seed')
+    return random.getrandbits(64) if seed is None else seed
+
+
+def region_slice(region, shape, origin=(0, 0)):
+    """
+    Interseção da região (coordenadas do mapa) com o retângulo de forma shape
+    posicionado em origin, como fatia local; None se não se tocam
+    """
+    rows, cols = shape
+    ox, oy = origin
+    if region is None:
+        return np.s_[0:rows, 0:cols]
+    x0, y0, x1, y1 = region
+    x0, x1 = max(x0 - ox, 0), min(x1 - ox, cols)
+    y0, y1 = max(y0 - oy, 0), min(y1 - oy, rows)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return np.s_[y0:y1, x0:x1]
+
+
+def wind_mask(free, layers, rng):
+    """
+    Máscara de vento (bool 2D) sobre as células livres.
+    Cada camada acima de WIND_THRESHOLD sorteia, sem reposição e dentro da sua região,
+    max(1, int(livres * intensidade * WIND_FRACTION)) células; as camadas se combinam com OU.
+    """
+    mask = np.zeros(free.shape, dtype=np.bool_)
+    for intensity, region in layers:
+        logger.info("   Intensidade do vento: %.2f%s", intensity, f" em {region}" if region else "")
+        if intensity <= WIND_THRESHOLD:
+            continue
+        window = region_slice(region, free.shape)
+        if window is None:
+            continue
+        candidates = np.flatnonzero(free[window])
+        if not len(candidates):
+            continue
+
+        count = max(1, int(len(candidates) * intensity * WIND_FRACTION))
+        layer_mask = np.zeros(free[window].shape, dtype=np.bool_)
+        layer_mask.flat[rng.choice(candidates, size=count, replace=False)] = True
+        mask[window] |= layer_mask
+
+    logger.info("    Adicionadas %d áreas W", int(mask.sum()))
+    if logger.isEnabledFor(logging.DEBUG):
+        ys, xs = np.nonzero(mask)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            logger.debug("    Adicionado W em (%d, %d)", x, y)
+    return mask
+
+
+def wind_probabilities(layers):
+    """Camadas como (probabilidade por célula livre, região), para o sorteio bloco a bloco"""
+    return tuple((intensity * WIND_FRACTION, region) for intensity, region in layers
+                 if intensity > WIND_THRESHOLD)
+
+
+def bernoulli_wind(free, wind_layers, rng, origin=(0, 0)):
+    """
+    Vento de um bloco: cada célula livre vira W com a probabilidade de cada camada
+    que a cobre (mesma fração esperada de wind_mask, sem depender do resto do mapa)
+    """
+    mask = np.zeros(free.shape, dtype=np.bool_)
+    for probability, region in wind_layers:
+        window = region_slice(region, free.shape, origin)
+        if window is not None:
+            mask[window] |= rng.random(free[window].shape) < probability
+    return mask & free
+
+
+def direction_factors(weather_conditions):
+    """
+    Fator do acréscimo de vento para cada movimento (ordem de MOVES).
+    weather_conditions['wind_direction'] é o ângulo, em graus, para onde o vento sopra
+    (0 = +x, 90 = +y); sem direção todos os fatores são 1.
+    """
+    direction = weather_conditions.get('wind_direction')
+    if direction is None:
+        return (1.0,) * len(MOVES)
+    angle = math.radians(direction)
+    ux, uy = round(math.cos(angle), 12), round(math.sin(angle), 12)
+    return tuple(1.0 - WIND_ALIGNMENT * (dx * ux + dy * uy) for dx, dy in MOVES)
+
+
+def temperature_factor(weather_conditions):
+    """Multiplicador do consumo pela temperatura (1 dentro da faixa ideal da bateria)"""
+    temperature = weather_conditions.get('temperature')
+    if temperature is None:
+        return 1.0
+    low, high = BATTERY_TEMPERATURE_RANGE
+    return 1.0 + TEMPERATURE_COEFFICIENT * max(low - temperature, temperature - high, 0.0)
+
+
+def move_index(from_pos, to_pos):
+    """Índice em MOVES do passo de from_pos a to_pos (vizinhos na grade)"""
+    if to_pos[0] != from_pos[0]:
+        return 0 if to_pos[0] > from_pos[0] else 1
+    return 2 if to_pos[1] > from_pos[1] else 3
+
+
+def custom_wind_field(weather_conditions, rows, cols):
+    """
+    Campo de intensidade do vento fornecido em weather_conditions['wind_field']
+    (float32, valores ≥ 0), ou None se o campo vem das células W
+    """
+    field = weather_conditions.get('wind_field')
+    if field is None:
+        return None
+    field = np.array(field, dtype=np.float32)
+    if field.shape != (rows, cols):
+        raise ValueError(f"wind_field com forma {field.shape}, esperado {(rows, cols)}")
+    if (field < 0).any():
+        raise ValueError("wind_field não pode ter intensidades negativas")
+    return field
+
+
+def cost_signature(weather_conditions, field=None):
+    """
+    Identifica as regras de custo além das células W (direção, temperatura, campo fornecido)
+    para as chaves de cache; None quando o custo é o padrão (W dobra o custo)
+    """
+    factors = direction_factors(weather_conditions)
+    temperature = temperature_factor(weather_conditions)
+    if field is None and temperature == 1.0 and all(factor == 1.0 for factor in factors):
+        return None
+    digest = hashlib.sha1(repr((factors, temperature)).encode())
+    if field is not None:
+        digest.update(field.tobytes())
+    return digest.hexdigest()[:16]
@@ -0,0 +1,82 @@
+import time
+
+from algorithms.astar import AStar
+from algorithms.battery_state import DEFAULT_BATTERY_RESOLUTION
+from algorithms.mission_planner import MissionPlanner
+
+class BatchPlanner(MissionPlanner):
+    """
+    Planeja as missões completas do ponto de partida para vários destinos numa só chamada.
+    As idas saem de uma única árvore de Dijkstra enraizada no início e as voltas da
+    árvore reversa enraizada na base, ambas montadas sob demanda: cada missão só
+    assenta os nós que as anteriores ainda não tinham assentado, então N destinos
+    custam no máximo uma busca por árvore.
+    Pernas inviáveis com a bateria são refeitas pelo A*.
+    """
+    name = "Lote"
+    icon = "📦"
+
+    def __init__(self, env, battery_resolution=DEFAULT_BATTERY_RESOLUTION, **kwargs):
+        # As árvores de caminhos mínimos são montadas sobre a adjacência CSR
+        super().__init__(env.compiled_copy(), battery_resolution, **kwargs)
+        self.fallback = AStar(self.env, battery_resolution, reuse_return_tree=False)
+        self.outbound_tree = None
+
+    def plan_all(self, goals=None, agent_name="agent0"):
+        """
+        Planeja uma missão por objetivo (padrão: todos os pontos de entrega).
+        Retorna {objetivo: {"path", "total_cost", "nodes_explored", "computation_time"}};
+        path é a lista vazia quando a missão não é planejável.
+        """
+        agent = self.agent_dict[agent_name]
+        start = agent["start"]
+        if goals is None:
+            goals = sorted(self.env.delivery_points)
+
+        batch_start = time.time()
+        if self.env.compiled is not None:
+            self.outbound_tree = self.env.lazy_distance_table(start, reverse=False)
+        else:
+            # Mapas em blocos não têm tabelas globais: cada perna é uma busca A*
+            print(f"{self.icon} Mapa em blocos: pernas planejadas pelo A*")
+
+        original_goal, original_battery = agent["goal"], agent["battery"]
+        plans = {}
+        try:
+            for goal in goals:
+                goal = tuple(goal)
+                agent["goal"] = goal
+                agent["battery"] = original_battery
+
+                goal_start = time.time()
+                path = self.plan_complete_mission(agent_name, start, original_battery)
+                plans[goal] = {
+                    "path": path,
+                    "total_cost": self.total_cost if path else 0.0,
+                    "nodes_explored": self.total_nodes_explored,
+                    "computation_time": time.time() - goal_start,
+                }
+        finally:
+            agent["goal"], agent["battery"] = original_goal, original_battery
+            self.outbound_tree = None
+
+        planned = sum(1 for plan in plans.values() if plan["path"])
+        print(f"✅ {self.name}: {planned}/{len(plans)} missões planejadas em {time.time() - batch_start:.4f}s")
+        return plans
+
+    def find_path(self, start, goal, initial_battery, agent_name, ignore_battery=False):
+        tree = self.outbound_tree
+        if tree is not None and tuple(start) == tree.root:
+            tree_nodes = tree.expand_to(tuple(goal))
+            path = tree.path(tuple(goal))
+            if path is None:
+                return None # Objetivo inalcançável a partir do início
+            if ignore_battery or self.is_battery_feasible(path, initial_battery):
+                return path, tree.cost(tuple(goal)), tree_nodes
+            result = self.fallback.find_path(start, goal, initial_battery, agent_name, ignore_battery)
+            if result is None:
+                return None
+            path, final_cost, nodes_explored = result
+            return path, final_cost, nodes_explored + tree_nodes
+
+        return self.fallback.find_path(start, goal, initial_battery, agent_name, ignore_battery)
@@ -0,0 +1,45 @@
+import math
+
+# Resolução padrão da bateria nos estados de busca: décimos de ponto percentual
+DEFAULT_BATTERY_RESOLUTION = 0.1
+
+
+def quantize_battery(battery, resolution):
+    """
+    Converte a bateria (float) em unidades inteiras da resolução.
+    Arredonda para baixo, nunca atribuindo ao estado mais bateria do que a real.
+    Com resolution=None a bateria é usada sem discretização.
+    """
+    if resolution is None:
+        return battery
+    return math.floor(battery / resolution + 1e-9)
+
+
+class ParetoLabels:
+    """
+    Rótulos (custo, bateria) não dominados de cada célula.
+    Um rótulo domina outro quando chega à mesma célula com custo menor ou igual
+    e pelo menos a mesma bateria.
+    """
+
+    def __init__(self):
+        self.labels = {}
+
+    def is_dominated(self, position, cost, battery):
+        for label_cost, label_battery in self.labels.get(position, ()):
+            if label_cost <= cost and label_battery >= battery:
+                return True
+        return False
+
+    def add(self, position, cost, battery):
+        """Adiciona um rótulo e devolve as baterias dos rótulos que ele passou a dominar"""
+        labels = self.labels.get(position)
+        if labels is None:
+            self.labels[position] = [(cost, battery)]
+            return []
+
+        dominated = [b for c, b in labels if cost <= c and battery >= b]
+        if dominated:
+            labels[:] = [(c, b) for c, b in labels if not (cost <= c and battery >= b)]
+        labels.append((cost, battery))
+        return dominated
@@ -0,0 +1,106 @@
+import heapq
+
+FORWARD, BACKWARD = 0, 1
+
+class BidirectionalSearch:
+    """
+    Busca bidirecional ponto a ponto: uma frente a partir do início e outra a partir
+    do objetivo (sobre as arestas invertidas), que se encontram no meio.
+    Com use_heuristic=True é um A* bidirecional com potenciais médios
+    p(v) = (h_objetivo(v) - h_início(v)) / 2; sem heurística é um Dijkstra bidirecional.
+    Ignora a bateria: o planejador valida o caminho encontrado.
+    """
+
+    def __init__(self, env, use_heuristic=True):
+        self.env = env
+        self.use_heuristic = use_heuristic
+
+    def find_path(self, start, goal):
+        """Retorna (path, custo, nós_explorados) ou None"""
+        start, goal = tuple(start), tuple(goal)
+        if start == goal:
+            return [start], 0.0, 1
+
+        potential = self.potential(start, goal)
+        g_score = ({start: 0.0}, {goal: 0.0})
+        links = ({start: None}, {goal: None})
+        closed = (set(), set())
+        # A frente reversa usa o potencial simétrico -p(v)
+        heaps = ([(potential(start), start)], [(-potential(goal), goal)])
+
+        best_cost = float('inf')
+        meeting = None
+        nodes_explored = 0
+
+        while heaps[FORWARD] and heaps[BACKWARD]:
+            # Nenhum caminho ainda não examinado pode ser mais barato que o melhor encontro
+            if heaps[FORWARD][0][0] + heaps[BACKWARD][0][0] >= best_cost:
+                break
+
+            side = FORWARD if heaps[FORWARD][0][0] <= heaps[BACKWARD][0][0] else BACKWARD
+            sign = 1.0 if side == FORWARD else -1.0
+            _, current = heapq.heappop(heaps[side])
+            if current in closed[side]:
+                continue
+            closed[side].add(current)
+            nodes_explored += 1
+
+            current_g = g_score[side][current]
+            other_g = g_score[1 - side]
+
+            for neighbor, move_cost in self.expand(current, side, start):
+                tentative_g = current_g + move_cost
+                if tentative_g < g_score[side].get(neighbor, float('inf')):
+                    g_score[side][neighbor] = tentative_g
+                    links[side][neighbor] = current
+                    heapq.heappush(heaps[side], (tentative_g + sign * potential(neighbor), neighbor))
+
+                    if neighbor in other_g and tentative_g + other_g[neighbor] < best_cost:
+                        best_cost = tentative_g + other_g[neighbor]
+                        meeting = neighbor
+
+        if meeting is None:
+            return None
+
+        # Início → encontro pelos pais da frente direta, encontro → objetivo pela frente reversa
+        path = []
+        node = meeting
+        while node is not None:
+            path.append(node)
+            node = links[FORWARD][node]
+        path.reverse()
+        node = links[BACKWARD][meeting]
+        while node is not None:
+            path.append(node)
+            node = links[BACKWARD][node]
+
+        return path, best_cost, nodes_explored
+
+    def expand(self, current, side, start):
+        """Vizinhos (posição, custo da aresta no sentido do caminho) de uma das frentes"""
+        env = self.env
+        if side == FORWARD:
+            return [(neighbor, env.calculate_move_cost(current, neighbor, float('inf')))
+                    for neighbor in env.get_neighbors(current, ignore_battery=True)]
+
+        # Células bloqueadas só podem iniciar um caminho, nunca atravessá-lo
+        return [(previous, env.calculate_move_cost(previous, current, float('inf')))
+                for previous in env.get_predecessors(current)
+                if previous == start or env.is_passable(previous)]
+
+    def potential(self, start, goal):
+        """Potencial médio consistente a partir de Manhattan escalada pelo menor custo de passo"""
+        if not self.use_heuristic:
+            return lambda state: 0.0
+
+        step_cost = self.env.min_move_cost()
+        sx, sy = start
+        gx, gy = goal
+
+        def potential(state):
+            x, y = state
+            to_goal = abs(gx - x) + abs(gy - y)
+            to_start = abs(sx - x) + abs(sy - y)
+            return (to_goal - to_start) * step_cost * 0.5
+
+        return potential
@@ -0,0 +1,295 @@
+import contextlib
+import heapq
+import io
+import itertools
+import time
+
+from algorithms.battery_state import DEFAULT_BATTERY_RESOLUTION
+from algorithms.mission_planner import DELIVERY_STEPS, REST_STEPS
+from algorithms.spacetime_astar import SpaceTimeAStar
+from config.settings import CBS_MAX_NODES
+from Environment.reservations import ReservationTable
+
+class ConstrainedSpaceTimeAStar(SpaceTimeAStar):
+    """
+    Planejador de baixo nível do CBS: A* espaço-tempo que respeita as restrições de um agente.
+    Restrições de vértice (célula, passo) proíbem estar na célula no passo; restrições de
+    aresta (origem, destino, passo) proíbem o movimento que chega ao destino no passo.
+    Nas células seguras (a base S compartilhada) vários drones cabem ao mesmo tempo,
+    e esperar pousado nelas não gasta bateria. Entre caminhos de mesmo custo vence o que
+    cruza menos os caminhos atuais dos outros drones (tabela de desvio de conflitos).
+    Uma tabela de reservas (planejamento priorizado) proíbe tudo o que já foi reservado.
+    """
+    name = "A* Espaço-Tempo (restrito)"
+    icon = "🚦"
+
+    def __init__(self, env, battery_resolution=DEFAULT_BATTERY_RESOLUTION, safe_cells=(), **kwargs):
+        super().__init__(env, battery_resolution, **kwargs)
+        self.safe_cells = frozenset(safe_cells)
+        self.set_constraints(())
+
+    def set_constraints(self, constraints, other_paths=(), reservations=None):
+        """
+        Troca as restrições do agente planejado (iterável de tuplas de vértice e de aresta),
+        os caminhos dos outros drones, que só desempatam, e a tabela de reservas
+        """
+        self.reservations = reservations
+        self.avoidance = ReservationTable(self.safe_cells)
+        for path in other_paths:
+            self.avoidance.reserve_path(path)
+        self.constraint_horizon = max((len(path) for path in other_paths), default=0)
+        if reservations is not None:
+            self.constraint_horizon = max(self.constraint_horizon, reservations.last_time + 1)
+        self.vertex_constraints = set()
+        self.edge_constraints = set()
+        for constraint in constraints:
+            if len(constraint) == 2:
+                self.vertex_constraints.add(constraint)
+            else:
+                self.edge_constraints.add(constraint)
+            self.constraint_horizon = max(self.constraint_horizon, constraint[-1])
+
+    def state_horizon(self):
+        # Até a última restrição (ou o fim dos outros caminhos) o passo distingue estados
+        # e esperar pode valer a pena
+        return max(self.forecast.horizon, self.constraint_horizon)
+
+    def is_blocked(self, current, neighbor, arrival):
+        return ((neighbor, arrival) in self.vertex_constraints
+                or (current, neighbor, arrival) in self.edge_constraints
+                or (self.reservations is not None
+                    and not self.reservations.is_move_free(current, neighbor, arrival)))
+
+    def conflict_count(self, current, neighbor, arrival):
+        return (self.avoidance.is_reserved(neighbor, arrival)
+                + self.avoidance.crosses(current, neighbor, arrival))
+
+    def can_stop(self, goal, t, agent_name):
+        """O objetivo precisa ficar livre durante a pausa que segue a perna (entrega ou repouso)"""
+        if goal in self.safe_cells:
+            return True
+        pause = REST_STEPS if goal == self.agent_dict[agent_name]["home_base"] else DELIVERY_STEPS
+        if any((goal, t + step) in self.vertex_constraints for step in range(1, pause + 1)):
+            return False
+        return self.reservations is None or self.reservations.is_free(goal, t + 1, t + pause)
+
+    def move_cost(self, position, t, previous=None):
+        if previous == position and position in self.safe_cells:
+            return 0.0 # Pousado na base: esperar não gasta bateria
+        return super().move_cost(position, t, previous)
+
+def plan_agent_mission(planner, agent_name, constraints, other_paths=(), reservations=None, verbose=False):
+    """
+    Missão completa de um agente sob as restrições e reservas dadas, desviando dos outros caminhos.
+    Retorna (caminho desde a partida, custo, nós explorados) ou None.
+    """
+    planner.set_constraints(constraints, other_paths, reservations)
+    agent = planner.agent_dict[agent_name]
+    battery = agent["battery"]
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        with output:
+            path = planner.plan_complete_mission(agent_name, agent["start"], battery)
+    finally:
+        agent["battery"] = battery # A missão grava a bateria da entrega no agent_dict
+    if not path:
+        return None
+    return [agent["start"]] + path, planner.total_cost, planner.total_nodes_explored
+
+# Planejador de baixo nível de cada processo de trabalho (o ambiente chega uma só vez)
+_worker_planner = None
+
+def _init_worker(env, options):
+    global _worker_planner
+    _worker_planner = ConstrainedSpaceTimeAStar(env, **options)
+
+def _plan_in_worker(agent_name, constraints, other_paths, reservations):
+    return plan_agent_mission(_worker_planner, agent_name, constraints, other_paths, reservations)
+
+def find_conflicts(paths, safe_cells=()):
+    """
+    Conflitos entre caminhos (agente → célula em cada passo), em ordem de passo.
+    Vértice: (t, a, b, célula); aresta (dois drones trocando de célula): (t, a, b, origem_de_a, destino_de_a).
+    Depois do fim do caminho o drone pousou e saiu do espaço aéreo.
+    """
+    conflicts = []
+    horizon = max((len(path) for path in paths.values()), default=0)
+    for t in range(horizon):
+        occupied = {}
+        moves = {}
+        for agent, path in paths.items():
+            if t >= len(path):
+                continue
+            cell = path[t]
+            if cell not in safe_cells:
+                other = occupied.setdefault(cell, agent)
+                if other != agent:
+                    conflicts.append((t, other, agent, cell))
+            if t > 0 and path[t - 1] != cell:
+                other = moves.get((cell, path[t - 1]))
+                if other is not None:
+                    conflicts.append((t, other, agent, cell, path[t - 1]))
+                moves[(path[t - 1], cell)] = agent
+    return conflicts
+
+class ConflictBasedSearch:
+    """
+    Conflict-Based Search (CBS) para uma frota de drones saindo da mesma base.
+    O nível alto é uma busca de melhor primeiro sobre conjuntos de restrições: cada nó
+    guarda um caminho por agente, e o primeiro conflito entre dois deles gera dois filhos,
+    um com a restrição para cada agente, replanejado pelo A* espaço-tempo restrito.
+    A base de cada agente é uma zona segura, onde a frota espera sem conflito.
+    Com workers > 1 as buscas de baixo nível (a raiz inteira e os dois filhos de cada
+    conflito) rodam em paralelo num pool de processos.
+    Frotas grandes num gargalo (a saída da base) estouram o limite de nós: aí os caminhos
+    da raiz são acertados por planejamento priorizado, em que cada drone, na ordem dada,
+    contorna os caminhos já reservados pelos anteriores (ou espera na base até passarem).
+    """
+    name = "CBS"
+    icon = "🚦"
+
+    def __init__(self, env, battery_resolution=DEFAULT_BATTERY_RESOLUTION, workers=None,
+                 max_nodes=CBS_MAX_NODES, safe_cells=None, verbose=False):
+        # A heurística do A* espaço-tempo é uma tabela exata sobre a adjacência CSR
+        self.env = env.compiled_copy()
+        self.battery_resolution = battery_resolution
+        self.workers = workers
+        self.max_nodes = max_nodes
+        self.safe_cells = safe_cells
+        self.verbose = verbose
+        self.executor = None
+        self.planner = None
+        self.costs = {}
+        self.total_cost = 0.0
+        self.total_nodes_explored = 0
+        self.high_level_nodes = 0
+
+    def plan(self, agent_names=None):
+        """
+        Planeja missões sem colisões para os agentes (padrão: todos do agent_dict).
+        Retorna {"schedule": {agente: [{"t", "x", "y"}, ...]}}, ou None se não houver solução
+        dentro do limite de nós de alto nível.
+        """
+        from utils.parallel import create_executor
+
+        start_time = time.time()
+        agents = list(agent_names or self.env.agent_dict)
+        safe_cells = self.safe_cells
+        if safe_cells is None:
+            safe_cells = {self.env.agent_dict[agent]["home_base"] for agent in agents}
+        options = {"battery_resolution": self.battery_resolution, "safe_cells": frozenset(safe_cells)}
+
+        self.total_nodes_explored = 0
+        self.high_level_nodes = 0
+        print(f"{self.icon} {self.name} planejando {len(agents)} drones...")
+        if self.workers is not None and self.workers > 1:
+            self.executor = create_executor(self.workers, _init_worker, (self.env, options))
+        else:
+            self.planner = ConstrainedSpaceTimeAStar(self.env, **options)
+        try:
+            solution = self.search(agents, options["safe_cells"])
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+            self.executor = None
+            self.planner = None
+
+        if solution is None:
+            print(f"❌ {self.name} FALHOU: sem plano livre de conflitos")
+            return None
+
+        paths, self.costs = solution
+        self.total_cost = sum(self.costs.values())
+        print(f"✅ {self.name}: {len(agents)} drones sem conflitos, custo total {self.total_cost:.2f}")
+        print(f"   Nós de alto nível: {self.high_level_nodes} | Nós explorados: {self.total_nodes_explored}")
+        print(f"   Tempo de Execução (Planejamento): {time.time() - start_time:.4f}s")
+        return {"schedule": {
+            agent: [{"t": t, "x": x, "y": y} for t, (x, y) in enumerate(path)]
+            for agent, path in paths.items()
+        }}
+
+    def search(self, agents, safe_cells):
+        """Retorna (caminhos, custos) sem conflitos, ou None"""
+        # Raiz sem desvios: as missões independentes podem ser planejadas em paralelo
+        results = self.plan_missions([(agent, frozenset(), (), None) for agent in agents])
+        if any(result is None for result in results):
+            return None # Algum agente não tem missão nem sem restrições
+
+        paths = {agent: result[0] for agent, result in zip(agents, results)}
+        costs = {agent: result[1] for agent, result in zip(agents, results)}
+        solution = self.conflict_based_search(paths, costs, safe_cells)
+        if solution is None and self.high_level_nodes >= self.max_nodes:
+            print(f"   ⚠️ Limite de {self.max_nodes} nós de alto nível: recorrendo ao planejamento priorizado")
+            solution = self.prioritized_search(agents, paths, costs, safe_cells)
+        return solution
+
+    def conflict_based_search(self, paths, costs, safe_cells):
+        """Nível alto do CBS a partir dos caminhos independentes; retorna (caminhos, custos) ou None"""
+        agents = list(paths)
+        constraints = {agent: frozenset() for agent in agents}
+        counter = itertools.count()
+        conflicts = find_conflicts(paths, safe_cells)
+        # Nó: (custo total, nº de conflitos, desempate, restrições, caminhos, custos, conflitos)
+        open_set = [(sum(costs.values()), len(conflicts), next(counter), constraints, paths, costs, conflicts)]
+
+        while open_set and self.high_level_nodes < self.max_nodes:
+            _, _, _, constraints, paths, costs, conflicts = heapq.heappop(open_set)
+            self.high_level_nodes += 1
+            if not conflicts:
+                return paths, costs
+
+            conflict = conflicts[0]
+            t, first, second = conflict[:3]
+            if len(conflict) == 4:
+                cell = conflict[3]
+                new_constraints = [(first, (cell, t)), (second, (cell, t))]
+            else:
+                source, target = conflict[3:]
+                new_constraints = [(first, (source, target, t)), (second, (target, source, t))]
+
+            tasks = [(agent, constraints[agent] | {constraint},
+                      tuple(path for other, path in paths.items() if other != agent), None)
+                     for agent, constraint in new_constraints]
+            for (agent, agent_constraints, _, _), result in zip(tasks, self.plan_missions(tasks)):
+                if result is None:
+                    continue # Restrição impossível de cumprir: o ramo é podado
+                child_paths = dict(paths)
+                child_costs = dict(costs)
+                child_paths[agent], child_costs[agent] = result[0], result[1]
+                child_constraints = dict(constraints)
+                child_constraints[agent] = agent_constraints
+                child_conflicts = find_conflicts(child_paths, safe_cells)
+                heapq.heappush(open_set, (sum(child_costs.values()), len(child_conflicts), next(counter),
+                                          child_constraints, child_paths, child_costs, child_conflicts))
+        return None
+
+    def prioritized_search(self, agents, paths, costs, safe_cells):
+        """
+        Planejamento priorizado: cada drone mantém o caminho independente se ele não cruza os
+        já reservados, senão é replanejado com eles como restrições. Como os drones que
+        pousam saem do espaço aéreo, esperar na base sempre acaba liberando a rota.
+        """
+        paths, costs = dict(paths), dict(costs)
+        reservations = ReservationTable(safe_cells)
+        for agent in agents:
+            if not reservations.is_path_free(paths[agent]):
+                result = self.plan_missions([(agent, frozenset(), (), reservations)])[0]
+                if result is None:
+                    return None
+                paths[agent], costs[agent] = result[0], result[1]
+            reservations.reserve_path(paths[agent], agent)
+        return paths, costs
+
+    def plan_missions(self, tasks):
+        """
+        Missões de baixo nível para [(agente, restrições, outros caminhos, reservas)],
+        em paralelo se houver pool
+        """
+        if self.executor is not None:
+            futures = [self.executor.submit(_plan_in_worker, *task) for task in tasks]
+            results = [future.result() for future in futures]
+        else:
+            results = [plan_agent_mission(self.planner, agent, constraints, other_paths, reservations, self.verbose)
+                       for agent, constraints, other_paths, reservations in tasks]
+        self.total_nodes_explored += sum(result[2] for result in results if result is not None)
+        return results
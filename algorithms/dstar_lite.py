@@ -0,0 +1,191 @@
+import heapq
+
+from algorithms.battery_state import DEFAULT_BATTERY_RESOLUTION
+from algorithms.hpa_star import HPAStar
+from algorithms.mission_planner import F_SCORE_DIGITS, MissionPlanner
+
+MOVES = [(1,0), (-1,0), (0,1), (0,-1)]
+
+class DStarLiteSearch:
+    """
+    Estado de uma busca D* Lite rumo a um objetivo fixo.
+    A busca parte do objetivo: g(s) é o custo de s até ele e rhs(s) a estimativa
+    de um passo à frente (min sobre os sucessores de custo + g). Quando células mudam
+    de custo, só os predecessores delas são reavaliados e compute_shortest_path
+    reexpande apenas os nós cuja distância mudou; o início pode andar (move_to)
+    sem reordenar a fila, graças ao deslocamento km.
+    """
+
+    def __init__(self, env, goal):
+        self.env = env
+        self.goal = tuple(goal)
+        self.start = self.goal
+        self.last_start = self.goal
+        self.step_cost = env.min_move_cost()
+        self.km = 0.0
+        self.g = {}
+        self.rhs = {self.goal: 0.0}
+        # Fila com remoção preguiçosa: open_keys guarda a chave válida de cada nó na fila
+        self.open_set = []
+        self.open_keys = {}
+        self.push(self.goal)
+
+    def heuristic(self, position):
+        """Manhattan escalada entre o início atual e a posição (admissível e consistente)"""
+        return (abs(self.start[0] - position[0]) + abs(self.start[1] - position[1])) * self.step_cost
+
+    def calculate_key(self, position):
+        best = min(self.g.get(position, float('inf')), self.rhs.get(position, float('inf')))
+        return (round(best + self.heuristic(position) + self.km, F_SCORE_DIGITS), best)
+
+    def push(self, position):
+        key = self.calculate_key(position)
+        self.open_keys[position] = key
+        heapq.heappush(self.open_set, (key, position))
+
+    def neighbors(self, position):
+        """Vizinhos transitáveis; mover-se entre eles custa a entrada na célula de destino"""
+        x, y = position
+        env = self.env
+        return [(x + dx, y + dy) for dx, dy in MOVES
+                if 0 <= x + dx < env.cols and 0 <= y + dy < env.rows and env.is_passable((x + dx, y + dy))]
+
+    def edge_cost(self, source, target):
+        """Custo do passo source → target (entrada no destino, com a direção do vento)"""
+        return self.env.calculate_move_cost(source, target, float('inf'))
+
+    def update_vertex(self, position):
+        if position != self.goal:
+            best = float('inf')
+            if self.env.is_passable(position):
+                for neighbor in self.neighbors(position):
+                    best = min(best, self.edge_cost(position, neighbor) + self.g.get(neighbor, float('inf')))
+            self.rhs[position] = best
+
+        if self.g.get(position, float('inf')) != self.rhs.get(position, float('inf')):
+            self.push(position)
+        else:
+            self.open_keys.pop(position, None)
+
+    def move_to(self, start):
+        """O drone avançou: as chaves antigas ficam válidas somando h(início anterior, início novo)"""
+        start = tuple(start)
+        self.km += (abs(self.last_start[0] - start[0]) + abs(self.last_start[1] - start[1])) * self.step_cost
+        self.last_start = self.start = start
+
+    def notify_changes(self, cells):
+        """Células que mudaram de custo: reavalia quem entra nelas"""
+        for cell in cells:
+            cell = tuple(cell)
+            for position in self.neighbors(cell) + [cell]:
+                self.update_vertex(position)
+
+    def compute_shortest_path(self):
+        """Expande até o início ficar consistente; retorna quantos nós foram expandidos"""
+        nodes_explored = 0
+        open_set, open_keys = self.open_set, self.open_keys
+        g, rhs = self.g, self.rhs
+
+        while open_set:
+            key_old, position = open_set[0]
+            if open_keys.get(position) != key_old:
+                heapq.heappop(open_set) # Entrada obsoleta
+                continue
+            start = self.start
+            if not (key_old < self.calculate_key(start)
+                    or rhs.get(start, float('inf')) != g.get(start, float('inf'))):
+                break
+
+            heapq.heappop(open_set)
+            key_new = self.calculate_key(position)
+            if key_old < key_new:
+                # Chave calculada com um km antigo: reinserida com a chave atual
+                open_keys[position] = key_new
+                heapq.heappush(open_set, (key_new, position))
+                continue
+
+            del open_keys[position]
+            nodes_explored += 1
+            if g.get(position, float('inf')) > rhs[position]:
+                g[position] = rhs[position]
+                for predecessor in self.neighbors(position):
+                    self.update_vertex(predecessor)
+            else:
+                g[position] = float('inf')
+                for predecessor in self.neighbors(position) + [position]:
+                    self.update_vertex(predecessor)
+
+        return nodes_explored
+
+    def path(self):
+        """Caminho do início ao objetivo seguindo o menor custo + g, ou None se não há"""
+        position = self.start
+        if self.g.get(position, float('inf')) == float('inf'):
+            return None
+
+        path = [position]
+        max_steps = self.env.rows * self.env.cols
+        while position != self.goal:
+            if len(path) > max_steps:
+                return None
+            position = min(self.neighbors(position),
+                           key=lambda neighbor: self.edge_cost(position, neighbor) + self.g.get(neighbor, float('inf')))
+            path.append(position)
+        return path
+
+    def cost(self):
+        return self.g.get(self.start, float('inf'))
+
+
+class DStarLite(MissionPlanner):
+    """
+    D* Lite: replanejamento incremental quando o vento muda durante o voo.
+    Mantém uma busca por objetivo (entrega e base); weather_tick aplica as mudanças
+    de clima no ambiente e repara as buscas em vez de planejar do zero.
+    Como no JPS, a busca ignora a bateria: se a rota reparada não for viável com a
+    bateria disponível, a perna é refeita pelo HPA*, cuja abstração (com as bases de
+    carregamento) também é atualizada só nos clusters tocados pelo clima.
+    """
+    name = "D* Lite"
+    icon = "🔷"
+
+    def __init__(self, env, battery_resolution=DEFAULT_BATTERY_RESOLUTION, reuse_return_tree=False, **kwargs):
+        # A volta também é uma busca D* Lite, para ser reparada nos tiques de clima
+        super().__init__(env, battery_resolution, reuse_return_tree=reuse_return_tree, **kwargs)
+        self.searches = {}
+        self.current_goal = None
+        self.fallback = HPAStar(env, battery_resolution)
+
+    def find_path(self, start, goal, initial_battery, agent_name, ignore_battery=False):
+        goal = tuple(goal)
+        search = self.searches.get(goal)
+        if search is None:
+            search = self.searches[goal] = DStarLiteSearch(self.env, goal)
+        search.move_to(start)
+        nodes_explored = search.compute_shortest_path()
+        self.current_goal = goal
+
+        path = search.path()
+        if path is None:
+            return None # Sem caminho nem ignorando a bateria
+        if ignore_battery or self.is_battery_feasible(path, initial_battery):
+            return path, search.cost(), nodes_explored
+
+        result = self.fallback.find_path(tuple(start), goal, initial_battery, agent_name)
+        if result is None:
+            return None
+        path, final_cost, fallback_nodes = result
+        return path, final_cost, nodes_explored + fallback_nodes
+
+    def weather_tick(self, position, battery, wind_on=(), wind_off=(), agent_name="agent0"):
+        """
+        Tique de clima durante o voo: aplica as mudanças no ambiente, repara todas as
+        buscas mantidas e devolve a rota de position até o objetivo atual
+        ((path, custo, nós_explorados) ou None)
+        """
+        changed = self.env.update_weather_cells(wind_on, wind_off)
+        for search in self.searches.values():
+            search.notify_changes(changed)
+        if self.current_goal is None:
+            return None
+        return self.find_path(position, self.current_goal, battery, agent_name)
@@ -0,0 +1,310 @@
+import time
+
+import numpy as np
+
+from algorithms.astar import AStar
+from algorithms.battery_state import DEFAULT_BATTERY_RESOLUTION
+from algorithms.mission_planner import DELIVERY_STEPS, REST_STEPS
+from config.settings import FLEET_MAX_STOPS
+from Environment.distance_tables import sweep_costs
+
+def hungarian(cost):
+    """
+    Atribuição de custo mínimo (algoritmo húngaro, caminhos aumentantes com potenciais).
+    cost é uma matriz n x m; retorna, para cada linha, a coluna atribuída (n <= m) ou,
+    com mais linhas que colunas, None nas linhas que sobram. O laço interno é vetorizado.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    if cost.shape[0] > cost.shape[1]:
+        columns = hungarian(cost.T)
+        rows = [None] * cost.shape[0]
+        for column, row in enumerate(columns):
+            rows[row] = column
+        return rows
+
+    n, m = cost.shape
+    # Custos infinitos (pernas inalcançáveis) viram uma penalidade maior que qualquer solução finita
+    finite = np.isfinite(cost)
+    penalty = (np.abs(cost[finite]).sum() + 1.0) * (n + 1) if finite.any() else 1.0
+    cost = np.where(finite, cost, penalty)
+
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=np.int64) # owner[j]: linha (base 1) atribuída à coluna j; 0 = livre
+    way = np.zeros(m + 1, dtype=np.int64)
+    for row in range(1, n + 1):
+        owner[0] = row
+        column = 0
+        min_slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[column] = True
+            current_row = owner[column]
+            slack = cost[current_row - 1] - u[current_row] - v[1:]
+            improved = ~used[1:] & (slack < min_slack[1:])
+            min_slack[1:][improved] = slack[improved]
+            way[1:][improved] = column
+            candidates = np.where(used[1:], np.inf, min_slack[1:])
+            next_column = int(np.argmin(candidates)) + 1
+            delta = candidates[next_column - 1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            min_slack[1:][~used[1:]] -= delta
+            column = next_column
+            if owner[column] == 0:
+                break
+        # Inverte o caminho aumentante
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+
+    assignment = [None] * n
+    for column in range(1, m + 1):
+        if owner[column]:
+            assignment[owner[column] - 1] = column - 1
+    return assignment
+
+def tour_cost(legs, depot, stops):
+    """Custo da viagem depot → paradas → depot na matriz de pernas (índices de locais)"""
+    route = [depot] + list(stops) + [depot]
+    return float(sum(legs[a, b] for a, b in zip(route, route[1:])))
+
+def two_opt(legs, depot, stops):
+    """Melhora a ordem das paradas invertendo trechos enquanto o custo da viagem cai"""
+    route = [depot] + list(stops) + [depot]
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(route) - 2):
+            for j in range(i + 1, len(route) - 1):
+                a, b, c, d = route[i - 1], route[i], route[j], route[j + 1]
+                # A matriz pode ser assimétrica (vento direcional): compara o trecho invertido inteiro
+                before = legs[a, b] + legs[c, d] + sum(legs[route[k], route[k + 1]] for k in range(i, j))
+                after = legs[a, c] + legs[b, d] + sum(legs[route[k + 1], route[k]] for k in range(i, j))
+                if after < before - 1e-9:
+                    route[i:j + 1] = reversed(route[i:j + 1])
+                    improved = True
+    return route[1:-1]
+
+def nearest_neighbor_tours(legs, depot, stops, max_stops):
+    """Viagens de até max_stops paradas: sempre a entrega mais próxima ainda pendente"""
+    pending = list(stops)
+    tours = []
+    while pending:
+        tour = []
+        position = depot
+        while pending and len(tour) < max_stops:
+            nearest = min(range(len(pending)), key=lambda k: legs[position, pending[k]])
+            position = pending.pop(nearest)
+            tour.append(position)
+        tours.append(tour)
+    return tours
+
+class FleetAssignment:
+    """
+    Decide qual drone atende cada entrega e planeja as pernas escolhidas com o A*.
+    Os custos vêm de uma matriz de pernas entre os locais de interesse (bases dos drones,
+    entregas e, se alguma perna direta estourar a bateria, as bases de carregamento B),
+    calculada de uma vez para todas as origens (sweep_costs) e fechada por Floyd–Warshall
+    sobre as pernas viáveis com a bateria cheia (recarga nas bases e nas entregas).
+    Com no máximo uma entrega por drone a atribuição é ótima (algoritmo húngaro sobre
+    ida + volta); com mais entregas que drones monta viagens de até max_stops paradas
+    (vizinho mais próximo + 2-opt) e as distribui entre os drones equilibrando a carga.
+    """
+    name = "Frota"
+    icon = "🗺️"
+
+    def __init__(self, env, max_stops=FLEET_MAX_STOPS, battery_resolution=DEFAULT_BATTERY_RESOLUTION):
+        # A matriz de pernas é calculada sobre a adjacência CSR
+        self.env = env = env.compiled_copy()
+        self.max_stops = max_stops
+        self.planner = AStar(env, battery_resolution, reuse_return_tree=False)
+        self.unassigned = []
+        # Pernas já calculadas entre os locais conhecidos (todos os pares), válidas para um clima
+        self._legs = {}
+        self._known = {}
+        self._legs_key = None
+
+    def leg_costs(self, locations, agent_name=None):
+        """Matriz de custos entre os locais (inf quando nem recarregando pelo caminho há rota)"""
+        locations = list(locations)
+        agent_name = agent_name or next(iter(self.env.agent_dict))
+        direct = self._direct_costs(locations, agent_name)
+        max_battery = max(agent["max_battery"] for agent in self.env.agent_dict.values())
+        if np.all(direct[np.isfinite(direct)] <= max_battery):
+            return direct
+
+        # Alguma perna precisa de recarga no caminho: as bases B entram como escalas
+        stations = [station for station in self.env.charging_stations if station not in locations]
+        legs = self._direct_costs(locations + stations, agent_name)
+        legs[legs > max_battery] = np.inf
+        for k in range(len(legs)):
+            np.minimum(legs, legs[:, k:k + 1] + legs[k:k + 1, :], out=legs)
+        return legs[:len(locations), :len(locations)]
+
+    def _direct_costs(self, locations, agent_name):
+        """Custo mínimo de cada perna, sem bateria (linha: origem, coluna: destino)"""
+        env = self.env
+        weather_key = env.graph_key if env.compiled is not None else env.tiled.weather_version
+        if weather_key != self._legs_key:
+            # O clima mudou (update_weather_cells): as pernas guardadas não valem mais
+            self._legs, self._known, self._legs_key = {}, {}, weather_key
+
+        legs = self._legs
+        known = list(self._known)
+        new = [location for location in dict.fromkeys(locations) if location not in self._known]
+        if env.compiled is not None and new:
+            # Uma varredura conjunta a partir dos locais novos dá as pernas que saem deles; a do
+            # grafo transposto, as que chegam a eles vindas dos já conhecidos
+            targets = known + new
+            outgoing = sweep_costs(env.graph, new, targets)
+            for i, source in enumerate(new):
+                for j, target in enumerate(targets):
+                    legs[source, target] = float(outgoing[i, j])
+            if known:
+                incoming = sweep_costs(env.graph.reverse(), new, known)
+                for i, target in enumerate(new):
+                    for j, source in enumerate(known):
+                        legs[source, target] = float(incoming[i, j])
+        elif new:
+            # Mapa em blocos: sem tabelas globais, cada perna é uma busca A*
+            for source, target in [(a, b) for a in known + new for b in new] + [(a, b) for a in new for b in known]:
+                result = self.planner.find_path(source, target, 100.0, agent_name, ignore_battery=True)
+                legs[source, target] = result[1] if result is not None else np.inf
+        self._known.update(dict.fromkeys(new))
+
+        return np.array([[legs[source, target] for target in locations] for source in locations])
+
+    def assign(self, deliveries=None, agent_names=None):
+        """
+        Distribui as entregas (células; repetidas = vários pacotes) entre os drones.
+        Retorna {agente: [viagem, ...]}, cada viagem uma lista de paradas; entregas
+        inalcançáveis ficam em self.unassigned.
+        """
+        agents = list(agent_names or self.env.agent_dict)
+        if deliveries is None:
+            deliveries = sorted(self.env.delivery_points)
+        deliveries = [tuple(delivery) for delivery in deliveries]
+
+        assign_start = time.time()
+        agent_dict = self.env.agent_dict
+        locations = list(dict.fromkeys(
+            [agent_dict[agent]["start"] for agent in agents] +
+            [agent_dict[agent]["home_base"] for agent in agents] + deliveries))
+        index = {location: i for i, location in enumerate(locations)}
+        legs = self.leg_costs(locations, next(iter(agents), None))
+        starts = [index[agent_dict[agent]["start"]] for agent in agents]
+        homes = [index[agent_dict[agent]["home_base"]] for agent in agents]
+        stops = [index[delivery] for delivery in deliveries]
+
+        trips = {agent: [] for agent in agents}
+        self.unassigned = []
+        if len(stops) <= len(agents):
+            # Uma entrega por drone: ida a partir da posição atual + volta à própria base
+            cost = legs[np.ix_(starts, stops)].T + legs[np.ix_(stops, homes)]
+            for row, column in enumerate(hungarian(cost)):
+                if column is None or not np.isfinite(cost[row, column]):
+                    self.unassigned.append(deliveries[row])
+                else:
+                    trips[agents[column]].append([deliveries[row]])
+        else:
+            self._assign_tours(agents, homes, stops, legs, locations, trips)
+
+        assigned = sum(len(trip) for agent_trips in trips.values() for trip in agent_trips)
+        print(f"{self.icon} {self.name}: {assigned}/{len(deliveries)} entregas atribuídas a "
+              f"{len(agents)} drones em {time.time() - assign_start:.4f}s")
+        return trips
+
+    def _assign_tours(self, agents, homes, stops, legs, locations, trips):
+        """Viagens com várias paradas a partir de cada base, distribuídas pela menor carga"""
+        by_home = {}
+        for stop in stops:
+            # Cada entrega fica com a base (de algum drone) de ida e volta mais barata
+            home = min(set(homes), key=lambda h: legs[h, stop] + legs[stop, h])
+            if not np.isfinite(legs[home, stop] + legs[stop, home]):
+                self.unassigned.append(locations[stop])
+                continue
+            by_home.setdefault(home, []).append(stop)
+
+        for home, home_stops in by_home.items():
+            tours = [two_opt(legs, home, tour)
+                     for tour in nearest_neighbor_tours(legs, home, home_stops, self.max_stops)]
+            # Maior viagem primeiro, sempre para o drone menos carregado (LPT)
+            tours.sort(key=lambda tour: tour_cost(legs, home, tour), reverse=True)
+            loads = {agent: 0.0 for agent, agent_home in zip(agents, homes) if agent_home == home}
+            for tour in tours:
+                agent = min(loads, key=loads.get)
+                loads[agent] += tour_cost(legs, home, tour)
+                trips[agent].append([locations[stop] for stop in tour])
+
+    def plan(self, deliveries=None, agent_names=None):
+        """
+        Atribui as entregas e planeja com o A* as pernas de cada drone (ida, entregas com
+        pausa, volta e repouso por viagem). Retorna {agente: {"trips", "path", "total_cost",
+        "nodes_explored"}}; path fica vazio se alguma perna não for planejável.
+        """
+        trips = self.assign(deliveries, agent_names)
+        plans = {}
+        for agent, agent_trips in trips.items():
+            plans[agent] = self.plan_trips(agent, agent_trips)
+        return plans
+
+    def plan_trips(self, agent_name, trips):
+        """
+        Percorre as viagens do drone perna a perna com o A* (bateria simulada entre as pernas).
+        Se a bateria não basta para a próxima parada, o drone passa antes pela base para
+        recarregar; paradas inalcançáveis mesmo assim vão para self.unassigned.
+        """
+        agent = self.env.agent_dict[agent_name]
+        home = agent["home_base"]
+        plan = {"trips": trips, "path": [agent["start"]], "total_cost": 0.0, "nodes_explored": 0,
+                "position": agent["start"], "battery": agent["battery"], "return_leg": None}
+        for trip in trips:
+            for stop in trip:
+                if self.fly(plan, agent_name, stop):
+                    continue
+                if plan["position"] != home and self.fly(plan, agent_name, home) and self.fly(plan, agent_name, stop):
+                    continue
+                print(f"   ⚠️ {self.name}: entrega {stop} fora do alcance de {agent_name}")
+                self.unassigned.append(stop)
+            if plan["position"] != home and not self.fly(plan, agent_name, home):
+                print(f"   ❌ {self.name}: {agent_name} não consegue voltar de {plan['position']} para a base")
+                plan["path"] = []
+                break
+        del plan["position"], plan["battery"], plan["return_leg"]
+        return plan
+
+    def fly(self, plan, agent_name, goal):
+        """
+        Acrescenta ao plano a perna até goal e a pausa seguinte (entrega, ou repouso com recarga
+        na base); só voa até uma entrega se de lá ainda der para voltar à base
+        """
+        agent = self.env.agent_dict[agent_name]
+        home = agent["home_base"]
+        if goal == home and plan["return_leg"] is not None:
+            # Volta planejada ao conferir a última entrega (mesma posição e bateria)
+            leg, leg_cost, _ = plan["return_leg"]
+        else:
+            result = self.planner.find_path(plan["position"], goal, plan["battery"], agent_name)
+            if result is None:
+                return False
+            leg, leg_cost, leg_nodes = result
+            plan["nodes_explored"] += leg_nodes
+
+        if goal == home:
+            plan["path"].extend(leg[1:] + [goal] * REST_STEPS)
+            plan["battery"] = agent["max_battery"] # O repouso na base recarrega o drone
+            plan["return_leg"] = None
+        else:
+            battery = self.planner.battery_after(leg, plan["battery"])
+            return_leg = self.planner.find_path(goal, home, battery, agent_name)
+            if return_leg is None:
+                return False # Chegaria à entrega sem bateria para voltar
+            plan["nodes_explored"] += return_leg[2]
+            plan["path"].extend(leg[1:] + [goal] * DELIVERY_STEPS)
+            plan["battery"] = battery
+            plan["return_leg"] = return_leg
+        plan["position"] = goal
+        plan["total_cost"] += leg_cost
+        return True
@@ -0,0 +1,131 @@
+import heapq
+
+from algorithms.astar import AStar
+from algorithms.battery_state import DEFAULT_BATTERY_RESOLUTION, ParetoLabels
+from algorithms.mission_planner import F_SCORE_DIGITS, MissionPlanner
+
+class HPAStar(MissionPlanner):
+    """
+    HPA* (Hierarchical Path-Finding A*) para mapas grandes.
+    A busca com bateria roda sobre o grafo abstrato do ambiente (transições entre
+    clusters e bases de carregamento, ver Environment.hierarchy); início e objetivo são
+    ligados aos nós do próprio cluster por buscas locais, e só as arestas escolhidas
+    são refinadas em células, pelas árvores locais já calculadas.
+    O caminho é quase ótimo: cada trecho livre de fronteira oferece poucas transições.
+    """
+    name = "HPA*"
+    icon = "🟫"
+
+    def __init__(self, env, battery_resolution=DEFAULT_BATTERY_RESOLUTION, cluster_size=None,
+                 reuse_return_tree=False, **kwargs):
+        # A volta pela árvore reversa exigiria um Dijkstra sobre o mapa inteiro
+        super().__init__(env, battery_resolution, reuse_return_tree=reuse_return_tree, **kwargs)
+        self.cluster_size = cluster_size
+        self.graph = env.abstract_graph(cluster_size)
+        # Busca célula a célula para quando a abstração não acha rota viável com a bateria
+        self.fallback = AStar(env, battery_resolution, reuse_return_tree=False)
+
+    def find_path(self, start, goal, initial_battery, agent_name, ignore_battery=False):
+        result = self.find_path_hpa(start, goal, initial_battery, ignore_battery)
+        if result is not None or ignore_battery:
+            # Toda passagem entre clusters tem uma transição: sem bateria a abstração não perde rotas
+            return result
+
+        result = self.fallback.find_path_astar(start, goal, initial_battery, agent_name)
+        if result is None:
+            return None
+        path, final_cost, fallback_nodes = result
+        return path, final_cost, self.last_nodes_explored + fallback_nodes
+
+    def find_path_hpa(self, start, goal, initial_battery, ignore_battery=False):
+        """A* com bateria sobre o grafo abstrato; retorna (path, custo, nós_explorados) ou None"""
+        start, goal = tuple(start), tuple(goal)
+        self.last_nodes_explored = 0
+        if start == goal:
+            return [start], 0.0, 0
+
+        # O clima pode ter mudado (update_weather_cells): a abstração é buscada de novo no cache
+        graph = self.graph = self.env.abstract_graph(self.cluster_size)
+        charging_stations = self.env.charging_stations
+        start_tree, start_links = graph.connect(start)
+        goal_tree, goal_links = graph.connect(goal, reverse=True)
+        if graph.cluster_of(start) == graph.cluster_of(goal) and start_tree.cost(goal) != float('inf'):
+            # Caminho direto dentro do cluster (a rota ótima ainda pode sair dele)
+            start_links[goal] = start_tree.cost(goal)
+
+        # Manhattan escalada: uma tabela exata custaria um Dijkstra no mapa inteiro
+        gx, gy = goal
+        step_cost = graph.min_step
+        heuristic = lambda node: (abs(gx - node[0]) + abs(gy - node[1])) * step_cost
+
+        open_set = []
+        # Item: (custo_f, h, nó, bateria, custo_g)
+        start_h = heuristic(start)
+        heapq.heappush(open_set, (start_h, start_h, start, initial_battery, 0.0))
+        start_state = (start, self.battery_level(initial_battery, ignore_battery))
+        # Estado → (estado anterior, árvore local que refina a aresta ou None)
+        came_from = {}
+        g_score = {start_state: 0.0}
+        labels = ParetoLabels()
+        labels.add(start, 0.0, start_state[1])
+        nodes_explored = 0
+
+        while open_set:
+            current_f, current_h, current, current_battery, current_g = heapq.heappop(open_set)
+            current_state = (current, self.battery_level(current_battery, ignore_battery))
+            if g_score.get(current_state) != current_g:
+                continue
+            nodes_explored += 1
+
+            if current == goal:
+                self.last_nodes_explored = nodes_explored
+                path = self.refine(came_from, current_state)
+                if not ignore_battery and not self.is_battery_feasible(path, initial_battery):
+                    return None # Somas de ponto flutuante no limite da bateria
+                return path, current_g, nodes_explored
+
+            edges = graph.successors(current)
+            if current == start:
+                edges.extend((node, cost, start_tree) for node, cost in start_links.items())
+            if current in goal_links:
+                edges.append((goal, goal_links[current], goal_tree))
+
+            for neighbor, cost, tree in edges:
+                # Nenhuma base no meio da aresta: a bateria cai exatamente do custo
+                if not ignore_battery and cost > current_battery:
+                    continue
+                new_battery = 100.0 if neighbor in charging_stations else current_battery - cost
+
+                tentative_g = current_g + cost
+                level = self.battery_level(new_battery, ignore_battery)
+                if labels.is_dominated(neighbor, tentative_g, level):
+                    continue
+                for dominated_level in labels.add(neighbor, tentative_g, level):
+                    g_score.pop((neighbor, dominated_level), None)
+
+                state = (neighbor, level)
+                came_from[state] = (current_state, tree)
+                g_score[state] = tentative_g
+                h = heuristic(neighbor)
+                heapq.heappush(open_set, (round(tentative_g + h, F_SCORE_DIGITS), h, neighbor, new_battery, tentative_g))
+
+        self.last_nodes_explored = nodes_explored
+        return None
+
+    def refine(self, came_from, state):
+        """Expande as arestas abstratas do caminho em células"""
+        segments = []
+        while state in came_from:
+            previous, tree = came_from[state]
+            if tree is None:
+                segments.append([previous[0], state[0]]) # Transição entre clusters: um passo
+            elif tree.reverse:
+                segments.append(tree.path(previous[0]))
+            else:
+                segments.append(tree.path(state[0]))
+            state = previous
+
+        path = [state[0]]
+        for segment in reversed(segments):
+            path.extend(segment[1:])
+        return path
@@ -0,0 +1,150 @@
+import time
+
+from algorithms.battery_state import DEFAULT_BATTERY_RESOLUTION
+from algorithms.mission_planner import MissionPlanner
+
+# Tolerância na comparação f <= limite (somas de custos em ponto flutuante)
+THRESHOLD_EPSILON = 1e-9
+# Maior mapa (em células) em que a heurística de Manhattan termina dentro de time_limit
+MANHATTAN_MAX_CELLS = 400
+
+class IDAStar(MissionPlanner):
+    """
+    IDA*: aprofundamento iterativo sobre o limite de f = g + h, com bateria.
+    A memória da busca é proporcional à profundidade do caminho
+    (pilha de sucessores + buffer do caminho), sem tabelas de estados visitados.
+    No modo compilado a heurística padrão (exact_heuristic=None → True) é a tabela de
+    distâncias exata do objetivo, que fica em cache de qualquer forma, e a volta é lida
+    da árvore reversa da base: cada perna sai numa única iteração.
+    Sem o modo compilado (ou com exact_heuristic=False) a heurística é Manhattan escalada
+    pelo menor custo de passo e a volta é uma busca própria; o número de iterações cresce
+    rápido com o mapa, e acima de MANHATTAN_MAX_CELLS pernas longas esgotam time_limit
+    (p.ex. o destino 2 de mapa-real). supports() diz em quais mapas o IDA* é oferecido.
+    """
+    name = "IDA*"
+    icon = "🟪"
+
+    def __init__(self, env, battery_resolution=DEFAULT_BATTERY_RESOLUTION, time_limit=30.0,
+                 exact_heuristic=None):
+        if exact_heuristic is None:
+            exact_heuristic = env.compiled is not None
+        super().__init__(env, battery_resolution, reuse_return_tree=exact_heuristic)
+        self.time_limit = time_limit
+        self.exact_heuristic = exact_heuristic
+
+    @classmethod
+    def supports(cls, env):
+        """Com tabelas exatas (modo compilado) qualquer mapa; com Manhattan, só os pequenos"""
+        return env.compiled is not None or env.rows * env.cols <= MANHATTAN_MAX_CELLS
+
+    def find_path(self, start, goal, initial_battery, agent_name, ignore_battery=False):
+        if self.exact_heuristic:
+            heuristic = self.env.goal_heuristic(goal)
+        else:
+            step_cost = self.env.min_move_cost()
+            gx, gy = goal
+            heuristic = lambda position: (abs(gx - position[0]) + abs(gy - position[1])) * step_cost
+        threshold = heuristic(start)
+        if threshold == float('inf'):
+            return None
+
+        deadline = time.time() + self.time_limit
+        nodes_explored = 0
+
+        while True:
+            result, next_threshold, nodes = self.bounded_search(
+                start, goal, initial_battery, threshold, heuristic, ignore_battery, deadline
+            )
+            nodes_explored += nodes
+
+            if result is not None:
+                path, final_cost = result
+                return path, final_cost, nodes_explored
+
+            if time.time() > deadline:
+                print(f"   ❌ IDA*: TIMEOUT após {self.time_limit:.0f} segundos")
+                return None
+            if next_threshold == float('inf'):
+                return None
+
+            threshold = next_threshold
+
+    def bounded_search(self, start, goal, initial_battery, threshold, heuristic, ignore_battery, deadline):
+        """
+        Busca em profundidade limitada por f, sem recursão.
+        Retorna ((caminho, custo) ou None, próximo limite, nós explorados).
+        """
+        nodes_count = 1
+        if start == goal:
+            return ([start], 0.0), threshold, nodes_count
+
+        limit = threshold + THRESHOLD_EPSILON
+        next_threshold = float('inf')
+
+        path = [start]
+        # Células no caminho atual → maior bateria com que aparecem nele;
+        # voltar a uma célula só faz sentido com mais bateria (após recarga)
+        on_path = {start: self.battery_level(initial_battery, ignore_battery)}
+        restore = [None]
+        stack = [[self.successors(start, initial_battery, 0.0, heuristic, ignore_battery), 0]]
+
+        while stack:
+            frame = stack[-1]
+            children, position = frame
+
+            if position == len(children):
+                stack.pop()
+                cell = path.pop()
+                previous = restore.pop()
+                if previous is None:
+                    del on_path[cell]
+                else:
+                    on_path[cell] = previous
+                continue
+
+            f, h, neighbor, g, battery = children[position]
+            frame[1] += 1
+
+            if f > limit:
+                # Sucessores ordenados por f: os restantes também excedem o limite
+                next_threshold = min(next_threshold, f)
+                frame[1] = len(children)
+                continue
+
+            level = self.battery_level(battery, ignore_battery)
+            if on_path.get(neighbor, -1) >= level:
+                continue
+
+            nodes_count += 1
+            if neighbor == goal:
+                path.append(neighbor)
+                return (path, g), threshold, nodes_count
+
+            path.append(neighbor)
+            restore.append(on_path.get(neighbor))
+            on_path[neighbor] = level
+            stack.append([self.successors(neighbor, battery, g, heuristic, ignore_battery), 0])
+
+            if nodes_count % 4096 == 0 and time.time() > deadline:
+                return None, float('inf'), nodes_count
+
+        return None, next_threshold, nodes_count
+
+    def successors(self, current, current_battery, current_g, heuristic, ignore_battery):
+        """Sucessores (f, h, posição, g, bateria) ordenados por f"""
+        children = []
+        for neighbor in self.env.get_neighbors(current, current_battery, ignore_battery):
+            move_cost = self.env.calculate_move_cost(current, neighbor, current_battery)
+            new_battery = current_battery - move_cost
+
+            if neighbor in self.env.charging_stations:
+                new_battery = 100.0 # Carrega completamente
+
+            h = heuristic(neighbor)
+            if h == float('inf'):
+                continue
+            g = current_g + move_cost
+            children.append((g + h, h, neighbor, g, new_battery))
+
+        children.sort()
+        return children
@@ -1,89 +1,111 @@
 import time
-import sys
 
 class IDS:
-    def __init__(self, env):
+    def __init__(self, env, max_depth=None, time_limit=30.0):
         self.env = env
         self.agent_dict = env.agent_dict
-        self.max_depth_map = {
-            (10, 10): 100,
-            (20, 20): 50,
-            (50, 50): 30,
-            (100, 100): 20
-        }
-    
+        # Um caminho simples nunca tem mais passos do que células no mapa
+        self.max_depth = max_depth or env.rows * env.cols
+        self.time_limit = time_limit
+        self.total_nodes_explored = 0
+
     def search(self, agent_name):
         print(f"🟩 IDS iniciando busca...")
         start_time = time.time()
-        
+        deadline = start_time + self.time_limit
+
         start = self.agent_dict[agent_name]["start"]
         goal = self.agent_dict[agent_name]["goal"]
-        
+
         rows, cols = self.env.rows, self.env.cols
-        max_depth = 30
-        
-        for (max_rows, max_cols), depth in self.max_depth_map.items():
-            if rows <= max_rows and cols <= max_cols:
-                max_depth = depth
-                break
-        
+        max_depth = self.max_depth
+
         print(f"   Mapa: {rows}x{cols}, Limite IDS: {max_depth}")
-        
-        depth = 0
+
+        # Nenhum caminho é mais curto que a distância de Manhattan
+        depth = abs(goal[0] - start[0]) + abs(goal[1] - start[1])
         nodes_explored = 0
-        
+        self.total_nodes_explored = 0
+
         while depth < max_depth:
             # IDS busca SOMENTE ida para entrega (sem bateria/custo)
-            result, nodes = self.depth_limited_search(start, goal, depth, agent_name, [], set(), 0)
+            result, nodes, cutoff = self.depth_limited_search(start, goal, depth, deadline)
             nodes_explored += nodes
-            
+            self.total_nodes_explored = nodes_explored
+
             if result is not None:
                 # O IDS retorna apenas o caminho de ida (Path Finding Simples)
                 computation_time = time.time() - start_time
                 print(f"✅ IDS SUCESSO: Caminho de ida encontrado em {len(result)} passos")
                 print(f"   Nós Explorados: {nodes_explored}")
                 print(f"   Tempo de Execução (Planejamento): {computation_time:.4f}s")
-                
+
                 # Para uma missão COMPLETA, o código externo deve planejar a volta.
                 # Retornamos o caminho de ida, que é o máximo que o IDS simples pode fazer.
-                return result 
-            
+                return result
+
+            if time.time() > deadline:
+                print(f"❌ IDS: TIMEOUT após {self.time_limit:.0f} segundos")
+                return []
+
+            if not cutoff:
+                # Nenhum ramo foi cortado pelo limite: aprofundar não encontra nada novo
+                print(f"❌ IDS: Objetivo inalcançável")
+                print(f"   Nós Explorados: {nodes_explored}")
+                return []
+
             depth += 1
             if depth % 5 == 0:
                 print(f"   IDS: Profundidade {depth}, {nodes_explored} nós explorados...")
-                
-            if time.time() - start_time > 30:
-                print(f"❌ IDS: TIMEOUT após 30 segundos")
-                return []
-        
+
         computation_time = time.time() - start_time
         print(f"❌ IDS: Limite de profundidade {max_depth} atingido")
         print(f"   Nós Explorados: {nodes_explored}")
         return []
-    
-    def depth_limited_search(self, current, goal, depth, agent_name, path, visited, nodes_count):
-        nodes_count += 1
-        
-        if nodes_count > 100000:
-            return None, nodes_count
-            
-        if current == goal:
-            return path + [current], nodes_count
-        
-        if depth <= 0:
-            return None, nodes_count
-        
-        visited.add(current)
-        
+
+    def depth_limited_search(self, start, goal, depth_limit, deadline=None):
+        """
+        Busca em profundidade limitada sem recursão.
+        Mantém um único buffer de caminho e uma pilha de iteradores de vizinhos;
+        best_depth guarda a menor profundidade com que cada célula foi alcançada
+        nesta iteração, podando revisitas que não podem ir mais longe.
+        Retorna (caminho ou None, nós explorados, houve corte pelo limite).
+        """
+        nodes_count = 1
+        if start == goal:
+            return [start], nodes_count, False
+
+        path = [start]
         # O IDS simples ignora a bateria, assume 100%
-        neighbors = self.env.get_neighbors(current, 100.0) 
-        
-        for neighbor in neighbors:
-            if neighbor not in visited:
-                result, nodes_count = self.depth_limited_search(
-                    neighbor, goal, depth-1, agent_name, path + [current], visited.copy(), nodes_count
-                )
-                if result is not None:
-                    return result, nodes_count
-        
-        return None, nodes_count
\ No newline at end of file
+        stack = [iter(self.env.get_neighbors(start, 100.0))]
+        best_depth = {start: 0}
+        cutoff = False
+
+        while stack:
+            neighbor = next(stack[-1], None)
+
+            if neighbor is None:
+                stack.pop()
+                path.pop()
+                continue
+
+            depth = len(path)
+            if best_depth.get(neighbor, depth_limit + 1) <= depth:
+                continue
+            best_depth[neighbor] = depth
+            nodes_count += 1
+
+            if neighbor == goal:
+                path.append(neighbor)
+                return path, nodes_count, cutoff
+
+            if depth < depth_limit:
+                path.append(neighbor)
+                stack.append(iter(self.env.get_neighbors(neighbor, 100.0)))
+            else:
+                cutoff = True
+
+            if deadline is not None and nodes_count % 4096 == 0 and time.time() > deadline:
+                return None, nodes_count, False
+
+        return None, nodes_count, cutoff
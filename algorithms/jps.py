@@ -0,0 +1,201 @@
+import heapq
+
+import numpy as np
+
+from algorithms.astar import AStar
+from algorithms.battery_state import DEFAULT_BATTERY_RESOLUTION
+from algorithms.mission_planner import F_SCORE_DIGITS, MissionPlanner
+
+MOVES = [(1,0), (-1,0), (0,1), (0,-1)]
+
+class JPS(MissionPlanner):
+    """
+    Jump Point Search para grade 4-conectada com custo uniforme.
+    Saltos em linha reta atravessam as regiões abertas e só param em pontos de salto
+    (vizinhos forçados por X/A, objetivo e a vizinhança das células W); nesses pontos
+    irregulares a expansão volta a ser a do A* normal. Para as regras de vizinho forçado
+    as células W contam como obstáculo, já que contorná-las pode ser mais barato.
+    O caminho retornado é célula a célula, no mesmo formato dos outros planejadores.
+    """
+    name = "JPS"
+    icon = "🟧"
+
+    def __init__(self, env, battery_resolution=DEFAULT_BATTERY_RESOLUTION, **kwargs):
+        super().__init__(env, battery_resolution, **kwargs)
+        # Busca célula a célula usada quando o caminho dos saltos não é viável com a bateria
+        self.fallback = AStar(env, battery_resolution, reuse_return_tree=False)
+        self.wind_mask = self.irregular_mask = None
+
+    def find_path(self, start, goal, initial_battery, agent_name, ignore_battery=False):
+        """
+        Os saltos ignoram a bateria. Se o caminho ótimo resultante for viável com a
+        bateria disponível, ele também é ótimo com a restrição; caso contrário a perna
+        é refeita pelo A* com bateria (o desvio para recarga pode estar no meio de um salto).
+        """
+        result = self.find_path_jps(start, goal)
+        if result is None:
+            return None # Sem caminho nem ignorando a bateria
+        
+        path, final_cost, nodes_explored = result
+        if ignore_battery or self.is_battery_feasible(path, initial_battery):
+            return result
+        
+        result = self.fallback.find_path_astar(start, goal, initial_battery, agent_name)
+        if result is None:
+            return None
+        path, final_cost, fallback_nodes = result
+        return path, final_cost, nodes_explored + fallback_nodes
+
+    def find_path_jps(self, start, goal):
+        """A* sobre pontos de salto; retorna (path, custo, nós_explorados) ou None"""
+        start, goal = tuple(start), tuple(goal)
+        # O clima pode ter mudado desde a última busca (update_weather_cells)
+        self.wind_mask, self.irregular_mask = self.wind_masks()
+        heuristic = self.env.goal_heuristic(goal)
+        start_h = heuristic(start)
+        if start_h == float('inf'):
+            return None
+
+        open_set = []
+        # Item: (custo_f, h, posição, custo_g)
+        heapq.heappush(open_set, (start_h, start_h, start, 0.0))
+        came_from = {start: None}
+        g_score = {start: 0.0}
+        closed = set()
+        nodes_explored = 0
+
+        while open_set:
+            current_f, current_h, current, current_g = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            closed.add(current)
+            nodes_explored += 1
+
+            if current == goal:
+                jump_points = []
+                node = current
+                while node is not None:
+                    jump_points.append(node)
+                    node = came_from[node]
+                jump_points.reverse()
+                return self.expand_jump_points(jump_points), current_g, nodes_explored
+
+            for dx, dy in self.pruned_directions(current, came_from[current]):
+                jump = self.jump(current, dx, dy, goal)
+                if jump is None:
+                    continue
+                jump_point, jump_cost = jump
+
+                tentative_g = current_g + jump_cost
+                if tentative_g < g_score.get(jump_point, float('inf')):
+                    came_from[jump_point] = current
+                    g_score[jump_point] = tentative_g
+                    h = heuristic(jump_point)
+                    heapq.heappush(open_set, (round(tentative_g + h, F_SCORE_DIGITS), h, jump_point, tentative_g))
+
+        return None
+
+    def pruned_directions(self, node, parent):
+        """Direções naturais e forçadas a partir do ponto de salto"""
+        if parent is None or self.irregular(*node):
+            return MOVES
+
+        (x, y), (px, py) = node, parent
+        dx = (x > px) - (x < px)
+        dy = (y > py) - (y < py)
+        if dx != 0:
+            return [(dx, 0), (0, 1), (0, -1)]
+        return [(0, dy), (1, 0), (-1, 0)]
+
+    def jump(self, node, dx, dy, goal):
+        """
+        Avança em linha reta até o próximo ponto de salto.
+        Retorna (ponto, custo acumulado) ou None se bater num obstáculo.
+        """
+        walkable = self.walkable
+        uniform = self.uniform
+        irregular = self.irregular
+        x, y = node
+        cost = 0.0
+
+        while True:
+            nx, ny = x + dx, y + dy
+            if not walkable(nx, ny):
+                return None
+            cost += self.env.calculate_move_cost((x, y), (nx, ny), float('inf'))
+            x, y = nx, ny
+
+            if (x, y) == goal or irregular(x, y):
+                return (x, y), cost
+
+            if dx != 0:
+                if ((uniform(x, y - 1) and not uniform(x - dx, y - 1)) or
+                        (uniform(x, y + 1) and not uniform(x - dx, y + 1))):
+                    return (x, y), cost
+            else:
+                if ((uniform(x - 1, y) and not uniform(x - 1, y - dy)) or
+                        (uniform(x + 1, y) and not uniform(x + 1, y - dy))):
+                    return (x, y), cost
+                # Em saltos verticais, um ponto de salto na horizontal também exige parada
+                if self.scan_horizontal(x, y, 1, goal) or self.scan_horizontal(x, y, -1, goal):
+                    return (x, y), cost
+
+    def scan_horizontal(self, x, y, dx, goal):
+        """Se um salto horizontal a partir de (x, y) encontra algum ponto de salto"""
+        walkable = self.walkable
+        uniform = self.uniform
+        irregular = self.irregular
+        while True:
+            x += dx
+            if not walkable(x, y):
+                return False
+            if (x, y) == goal or irregular(x, y):
+                return True
+            if ((uniform(x, y - 1) and not uniform(x - dx, y - 1)) or
+                    (uniform(x, y + 1) and not uniform(x - dx, y + 1))):
+                return True
+
+    def walkable(self, x, y):
+        return 0 <= x < self.env.cols and 0 <= y < self.env.rows and self.env.is_passable((x, y))
+
+    def wind_masks(self):
+        """
+        Máscaras achatadas (com uma borda calma) das células W e das células W ou vizinhas
+        de W, montadas do clima atual. Nos mapas em blocos retorna (None, None): o vento
+        é lido célula a célula, só nos blocos por onde os saltos passam.
+        """
+        env = self.env
+        if env.tiled is not None:
+            return None, None
+        wind = np.zeros((env.rows + 2, env.cols + 2), dtype=np.bool_)
+        wind[1:-1, 1:-1] = env.wind_field > 0
+        irregular = wind.copy()
+        irregular[1:-1, 1:-1] |= wind[:-2, 1:-1] | wind[2:, 1:-1] | wind[1:-1, :-2] | wind[1:-1, 2:]
+        return wind.tobytes(), irregular.tobytes()
+
+    def windy(self, x, y):
+        if self.wind_mask is None:
+            return 0 <= x < self.env.cols and 0 <= y < self.env.rows and self.env.is_windy((x, y))
+        return self.wind_mask[(y + 1) * (self.env.cols + 2) + x + 1]
+
+    def irregular(self, x, y):
+        """Célula W ou vizinha de W: ali o custo deixa de ser uniforme"""
+        if self.irregular_mask is not None:
+            return self.irregular_mask[(y + 1) * (self.env.cols + 2) + x + 1]
+        windy = self.windy
+        return windy(x, y) or windy(x + 1, y) or windy(x - 1, y) or windy(x, y + 1) or windy(x, y - 1)
+
+    def uniform(self, x, y):
+        """Transitável e com custo uniforme (não W)"""
+        return self.walkable(x, y) and not self.windy(x, y)
+
+    def expand_jump_points(self, jump_points):
+        """Interpola os segmentos retos entre pontos de salto, célula a célula"""
+        path = [jump_points[0]]
+        for (x, y), (nx, ny) in zip(jump_points, jump_points[1:]):
+            dx = (nx > x) - (nx < x)
+            dy = (ny > y) - (ny < y)
+            while (x, y) != (nx, ny):
+                x, y = x + dx, y + dy
+                path.append((x, y))
+        return path
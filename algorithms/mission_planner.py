@@ -0,0 +1,227 @@
+import time
+
+from algorithms.battery_state import DEFAULT_BATTERY_RESOLUTION, quantize_battery
+from algorithms.bidirectional import BidirectionalSearch
+
+# f = g + h arredondado nas chaves de prioridade: com heurística exata, o ruído de
+# ponto flutuante desfaria os empates que o desempate por h deveria decidir
+F_SCORE_DIGITS = 9
+
+# Pausas da missão (em passos): entrega no destino e repouso na base
+DELIVERY_STEPS = 3
+REST_STEPS = 5
+
+class MissionPlanner:
+    """
+    Base dos planejadores de missão completa (ida → entrega → volta → repouso).
+    Subclasses implementam find_path(start, goal, initial_battery, agent_name, ignore_battery)
+    retornando (path, custo_final, nós_explorados) ou None.
+    """
+    name = "Planner"
+    icon = "🔹"
+    # Modo bidirecional: A* com potenciais (True) ou Dijkstra bidirecional (False)
+    bidirectional_heuristic = False
+
+    def __init__(self, env, battery_resolution=DEFAULT_BATTERY_RESOLUTION, bidirectional=False,
+                 reuse_return_tree=True):
+        self.env = env
+        self.battery_resolution = battery_resolution
+        self.bidirectional = bidirectional
+        self.reuse_return_tree = reuse_return_tree
+        self.agent_dict = env.agent_dict
+        self.total_cost = 0.0
+        self.total_nodes_explored = 0
+        # Passo da missão em que a perna atual começa (clima variável no tempo)
+        self.leg_start_time = 0
+
+    @classmethod
+    def supports(cls, env):
+        """Se o planejador consegue terminar no mapa do ambiente (listado na interface e no lote)"""
+        return True
+
+    def search(self, agent_name):
+        start_time = time.time()
+        
+        start = self.agent_dict[agent_name]["start"]
+        initial_battery = self.agent_dict[agent_name]["battery"]
+        
+        print(f"{self.icon} {self.name} planejando missão completa...")
+        
+        full_mission_path = self.plan_complete_mission(agent_name, start, initial_battery)
+        
+        computation_time = time.time() - start_time
+        
+        if full_mission_path:
+            print(f"✅ {self.name} MISSÃO CONCLUÍDA: {len(full_mission_path)} passos totais")
+            print(f"   Custo Total da Missão (g(n)): {self.total_cost:.2f}")
+            print(f"   Nós Explorados: {self.total_nodes_explored}")
+            print(f"   Tempo de Execução (Planejamento): {computation_time:.4f}s")
+            return full_mission_path
+        else:
+            print(f"❌ {self.name} FALHOU: Missão não planejável")
+            return []
+
+    def plan_complete_mission(self, agent_name, start, initial_battery):
+        mission_path = []
+        current_position = start
+        current_battery = initial_battery
+        self.total_cost = 0.0
+        self.total_nodes_explored = 0
+        self.leg_start_time = 0
+        
+        # FASE 1: Ida para entrega
+        print(f"   FASE 1: Indo para entrega ({self.name})...")
+        delivery_goal = self.agent_dict[agent_name]["goal"]
+        
+        # O find_path retorna (path, final_cost, nodes_explored)
+        result = self.find_path(current_position, delivery_goal, current_battery, agent_name)
+        
+        if not result:
+            # 2. A busca falhou. Tenta novamente com Bateria Infinita (ignore_battery=True)
+            print("   ❌ Busca falhou com restrição de bateria. Re-testando viabilidade de caminho...")
+            
+            viability_result = self.find_path(current_position, delivery_goal, current_battery, agent_name, ignore_battery=True)
+            
+            if viability_result:
+                # 3. Sucesso no modo Bateria Infinita
+                print("   ⚠️ DIAGNÓSTICO: Caminho existe, mas é inviável por falta de bateria (Outbound).")
+            else:
+                # 4. Falha no modo Bateria Infinita
+                print("   💀 DIAGNÓSTICO: Caminho está BLOQUEADO (Obstáculos ou Mapa Desconectado).")
+                
+            print("   ❌ Não foi possível planejar ida para entrega")
+            return []
+        
+        outbound_path, outbound_cost, nodes_exp_out = result
+        self.total_cost += outbound_cost
+        self.total_nodes_explored += nodes_exp_out
+        
+        mission_path.extend(outbound_path[1:])
+        
+        # Atualizar bateria após ida
+        # O último estado do caminho encontrado define a bateria e a posição
+        current_position = delivery_goal
+        # Simula a bateria ao longo do caminho: recargas no meio da ida contam
+        current_battery = self.battery_after(outbound_path, current_battery)
+        
+        delivery_time_steps = len(outbound_path) - 1 # Passos de movimento
+        
+        print(f"   ✅ Chegou na entrega. Bateria: {current_battery:.1f}%")
+        
+        # FASE 2: Entrega (pausa)
+        print("   FASE 2: Realizando entrega...")
+        delivery_steps = [current_position] * DELIVERY_STEPS  # frames de entrega
+        mission_path.extend(delivery_steps)
+        self.total_cost += 0.0
+        delivery_time_steps += DELIVERY_STEPS # Adiciona os frames de pausa
+        print(f"   Tempo de Entrega (Endereço + Pausa): {delivery_time_steps} passos")
+        
+        # FASE 3: Volta para base
+        print(f"   FASE 3: Voltando para base ({self.name})...")
+        # ⚡️ NOVO BLOCO DE CARREGAMENTO EXPLÍCITO APÓS A ENTREGA
+        if current_position in self.env.charging_stations:
+            # Assumimos que a taxa de carregamento é de +20 (conforme o seu código anterior),
+            # mas o drone carrega durante a pausa da entrega.
+            charge_amount = 100.0 
+            current_battery = min(self.env.agent_dict[agent_name]["max_battery"], current_battery + charge_amount)
+            
+            # Atualiza o estado da bateria no dicionário do agente (importante para logs futuros)
+            self.env.agent_dict[agent_name]["battery"] = current_battery 
+            
+            print(f"   ⚡ CARREGAMENTO NO DESTINO CONCLUÍDO. Bateria atualizada: {current_battery:.1f}%")
+        # ⚡️ FIM DO NOVO BLOCO
+        home_base = self.agent_dict[agent_name]["home_base"]
+        self.leg_start_time = delivery_time_steps
+        result = self.find_return_path(current_position, home_base, current_battery, agent_name)
+        
+        if not result:
+            print(f"   ❌ {self.name}: Não foi possível planejar volta para base")
+            return []
+            
+        inbound_path, inbound_cost, nodes_exp_in = result
+        self.total_cost += inbound_cost
+        self.total_nodes_explored += nodes_exp_in
+        
+        mission_path.extend(inbound_path[1:])
+        current_position = home_base
+        
+        # FASE 4: Repouso (pausa)
+        print("   FASE 4: Repousando na base...")
+        rest_steps = [current_position] * REST_STEPS  # frames de repouso
+        mission_path.extend(rest_steps)
+        self.total_cost += 0.0
+        
+        return mission_path
+
+    def find_path(self, start, goal, initial_battery, agent_name, ignore_battery=False):
+        raise NotImplementedError
+
+    def find_return_path(self, start, home_base, initial_battery, agent_name):
+        """
+        Perna de volta (entrega → base).
+        No ambiente compilado a volta é lida da árvore de Dijkstra reversa enraizada
+        na base, montada sob demanda: ela só cresce até assentar a entrega, e a perna
+        conta apenas os nós que assentou a mais. Só há nova busca se esse caminho não
+        for viável com a bateria disponível.
+        """
+        tree_nodes = 0
+        if self.reuse_return_tree and self.env.compiled is not None:
+            tree = self.env.lazy_distance_table(home_base)
+            tree_nodes = tree.expand_to(start)
+            path = tree.path(start)
+            if path is None:
+                return None # A base não é alcançável a partir da entrega
+            if self.is_battery_feasible(path, initial_battery):
+                return path, tree.cost(start), tree_nodes
+        
+        result = self.find_path(start, home_base, initial_battery, agent_name)
+        if result is None or not tree_nodes:
+            return result
+        path, final_cost, nodes_explored = result
+        return path, final_cost, nodes_explored + tree_nodes
+
+    def find_path_bidirectional(self, start, goal, initial_battery, agent_name, ignore_battery, fallback):
+        """
+        Perna ponto a ponto com busca bidirecional (sem bateria).
+        Se o caminho ótimo não for viável com a bateria disponível,
+        recorre à busca unidirecional com bateria (fallback).
+        """
+        search = BidirectionalSearch(self.env, use_heuristic=self.bidirectional_heuristic)
+        result = search.find_path(start, goal)
+        if result is None:
+            return None # Sem caminho nem ignorando a bateria
+        
+        path, final_cost, nodes_explored = result
+        if ignore_battery or self.is_battery_feasible(path, initial_battery):
+            return result
+        
+        result = fallback(start, goal, initial_battery, agent_name, ignore_battery)
+        if result is None:
+            return None
+        path, final_cost, fallback_nodes = result
+        return path, final_cost, nodes_explored + fallback_nodes
+
+    def is_battery_feasible(self, path, initial_battery):
+        """Se o caminho pode ser percorrido sem esgotar a bateria"""
+        return self.battery_after(path, initial_battery) is not None
+
+    def battery_after(self, path, initial_battery):
+        """
+        Simula a bateria ao longo do caminho (recarga completa nas bases).
+        Retorna a bateria ao final, ou None se ela se esgota no meio do caminho.
+        """
+        battery = initial_battery
+        for current, neighbor in zip(path, path[1:]):
+            move_cost = self.env.calculate_move_cost(current, neighbor, battery)
+            if move_cost > battery:
+                return None
+            battery -= move_cost
+            if neighbor in self.env.charging_stations:
+                battery = 100.0
+        return battery
+
+    def battery_level(self, battery, ignore_battery=False):
+        """Bateria discretizada usada como parte da chave de estado"""
+        if ignore_battery:
+            return 0
+        return quantize_battery(battery, self.battery_resolution)
@@ -0,0 +1,35 @@
+import importlib
+
+# Planejadores disponíveis: chave → (módulo, classe).
+# A importação é adiada até o uso, para que processos de trabalho e a linha de
+# comando carreguem apenas os algoritmos que de fato executam.
+PLANNERS = {
+    "astar": ("algorithms.astar", "AStar"),
+    "ucs": ("algorithms.ucs", "UCS"),
+    "ids": ("algorithms.ids", "IDS"),
+    "ida_star": ("algorithms.ida_star", "IDAStar"),
+    "jps": ("algorithms.jps", "JPS"),
+    "hpa_star": ("algorithms.hpa_star", "HPAStar"),
+    "dstar_lite": ("algorithms.dstar_lite", "DStarLite"),
+    "spacetime_astar": ("algorithms.spacetime_astar", "SpaceTimeAStar"),
+}
+
+def get_planner_class(key):
+    """Classe do planejador registrado com a chave dada"""
+    if key not in PLANNERS:
+        raise ValueError(f"Planejador desconhecido: {key} (disponíveis: {', '.join(PLANNERS)})")
+    module_name, class_name = PLANNERS[key]
+    return getattr(importlib.import_module(module_name), class_name)
+
+def create_planner(key, env, **options):
+    """Instancia o planejador registrado sobre o ambiente"""
+    return get_planner_class(key)(env, **options)
+
+def supports_map(key, env):
+    """Se o planejador registrado termina no mapa do ambiente (ver MissionPlanner.supports)"""
+    supports = getattr(get_planner_class(key), "supports", None)
+    return supports is None or supports(env)
+
+def planners_for(env, keys=None):
+    """Chaves (padrão: todas as registradas) dos planejadores oferecidos para o ambiente"""
+    return [key for key in (PLANNERS if keys is None else keys) if supports_map(key, env)]
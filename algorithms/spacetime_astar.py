@@ -0,0 +1,168 @@
+import heapq
+
+import numpy as np
+
+from algorithms.battery_state import DEFAULT_BATTERY_RESOLUTION, ParetoLabels
+from algorithms.mission_planner import F_SCORE_DIGITS, MissionPlanner
+from Environment.weather import move_index
+
+class SpaceTimeAStar(MissionPlanner):
+    """
+    A* espaço-tempo sobre a previsão do tempo do ambiente (Environment.weather_forecast).
+    O estado é (célula, passo): entrar numa célula no passo t custa o custo base vezes o
+    multiplicador previsto para ela em t (com o acréscimo do vento ajustado pela direção
+    do movimento, como em Environment.calculate_move_cost), e o drone pode pairar no
+    lugar (pagando o multiplicador da própria célula) esperando o vento passar.
+    Depois do horizonte da previsão o clima não muda mais e o passo deixa de distinguir estados.
+    """
+    name = "A* Espaço-Tempo"
+    icon = "🕒"
+
+    def __init__(self, env, battery_resolution=DEFAULT_BATTERY_RESOLUTION, forecast=None, allow_wait=True,
+                 reuse_return_tree=False, **kwargs):
+        # A árvore de volta em cache usa o clima parado: a volta é sempre planejada no tempo
+        super().__init__(env, battery_resolution, reuse_return_tree=reuse_return_tree, **kwargs)
+        self.forecast = forecast if forecast is not None else env.weather_forecast()
+        self.allow_wait = allow_wait
+        self.step_cost = env.min_move_cost()
+        self.wind_factors = env.wind_factors if env.wind_directional else None
+        self._heuristics = {}
+
+    def move_cost(self, position, t, previous=None):
+        """Custo de chegar em position no passo t vindo de previous (None ou a própria célula: pairar)"""
+        multiplier = self.forecast.multiplier(position[0], position[1], t)
+        if self.wind_factors is None or previous is None or previous == position:
+            return self.step_cost * multiplier
+        return self.step_cost * (1.0 + (multiplier - 1.0) * self.wind_factors[move_index(previous, position)])
+
+    def lower_bound_multipliers(self):
+        """Menor multiplicador efetivo de cada célula no horizonte, em qualquer direção de movimento"""
+        bound = self.forecast.lower_bound()
+        if self.wind_factors is None:
+            return bound
+        return 1.0 + (bound - 1.0) * np.where(bound >= 1.0, min(self.wind_factors), max(self.wind_factors))
+
+    def state_horizon(self):
+        """Passo a partir do qual o tempo deixa de distinguir estados (fim da previsão)"""
+        return self.forecast.horizon
+
+    def is_blocked(self, current, neighbor, arrival):
+        """Se o movimento current → neighbor chegando no passo arrival é proibido (restrições de subclasses)"""
+        return False
+
+    def conflict_count(self, current, neighbor, arrival):
+        """Conflitos do movimento com outros drones: desempata caminhos de mesmo custo (subclasses)"""
+        return 0
+
+    def can_stop(self, goal, t, agent_name):
+        """Se o drone pode encerrar a perna no objetivo alcançado no passo t"""
+        return True
+
+    def goal_heuristic(self, goal):
+        """
+        Limite inferior do custo até o objetivo com o menor multiplicador previsto de cada
+        célula: tabela exata (Dijkstra reverso) no modo compilado, Manhattan nos demais
+        """
+        heuristic = self._heuristics.get(goal)
+        if heuristic is not None:
+            return heuristic
+
+        env = self.env
+        if env.compiled is not None:
+            from Environment.adjacency import NeighborGraph
+            from Environment.distance_tables import shortest_path_tree
+
+            graph = env.graph
+            cell_costs = self.lower_bound_multipliers() * self.step_cost
+            bound = NeighborGraph(graph.rows, graph.cols, graph.indptr, graph.indices,
+                                  cell_costs.ravel()[graph.indices], cell_costs)
+            heuristic = shortest_path_tree(bound, goal).cost
+        else:
+            step_cost = self.step_cost * float(self.lower_bound_multipliers().min())
+            gx, gy = goal
+            heuristic = lambda state: (abs(gx - state[0]) + abs(gy - state[1])) * step_cost
+        self._heuristics[goal] = heuristic
+        return heuristic
+
+    def find_path(self, start, goal, initial_battery, agent_name, ignore_battery=False):
+        start, goal = tuple(start), tuple(goal)
+        heuristic = self.goal_heuristic(goal)
+        horizon = self.state_horizon()
+        charging_stations = self.env.charging_stations
+        start_time = self.leg_start_time
+
+        open_set = []
+        # Item: (custo_f, conflitos, h, posição, passo, bateria, custo_g)
+        start_h = heuristic(start)
+        if start_h == float('inf'):
+            return None # Objetivo inalcançável a partir do início
+        heapq.heappush(open_set, (start_h, 0, start_h, start, start_time, initial_battery, 0.0))
+        came_from = {}
+
+        # Chave: (posição, passo até o horizonte, bateria discretizada)
+        start_state = (start, min(start_time, horizon), self.battery_level(initial_battery, ignore_battery))
+        g_score = {start_state: 0.0}
+        labels = ParetoLabels()
+        labels.add(start_state[:2], 0.0, start_state[2])
+        nodes_explored = 0
+
+        while open_set:
+            current_f, conflicts, current_h, current, t, current_battery, current_g = heapq.heappop(open_set)
+            current_state = (current, min(t, horizon), self.battery_level(current_battery, ignore_battery))
+            if g_score.get(current_state) != current_g:
+                continue
+            nodes_explored += 1
+
+            if current == goal and self.can_stop(goal, t, agent_name):
+                path = []
+                state = current_state
+                while state in came_from:
+                    path.append(state[0])
+                    state = came_from[state]
+                path.append(start)
+                path.reverse()
+                return path, current_g, nodes_explored
+
+            # Vizinhos sem filtro de bateria: o custo depende do passo de chegada
+            moves = self.env.get_neighbors(current, ignore_battery=True)
+            if self.allow_wait and t < horizon:
+                moves.append(current) # Pairar: só faz sentido enquanto o clima ainda muda
+
+            arrival = t + 1
+            step = min(arrival, horizon)
+            for neighbor in moves:
+                if self.is_blocked(current, neighbor, arrival):
+                    continue
+                move_cost = self.move_cost(neighbor, arrival, current)
+                if not ignore_battery and move_cost > current_battery:
+                    continue
+                new_battery = 100.0 if neighbor in charging_stations else current_battery - move_cost
+
+                tentative_g = current_g + move_cost
+                level = self.battery_level(new_battery, ignore_battery)
+                if labels.is_dominated((neighbor, step), tentative_g, level):
+                    continue
+                for dominated_level in labels.add((neighbor, step), tentative_g, level):
+                    g_score.pop((neighbor, step, dominated_level), None)
+
+                state = (neighbor, step, level)
+                came_from[state] = current_state
+                g_score[state] = tentative_g
+                h = heuristic(neighbor)
+                heapq.heappush(open_set, (round(tentative_g + h, F_SCORE_DIGITS),
+                                          conflicts + self.conflict_count(current, neighbor, arrival),
+                                          h, neighbor, arrival, new_battery, tentative_g))
+
+        return None
+
+    def battery_after(self, path, initial_battery):
+        """Como em MissionPlanner, com o custo previsto para o passo de cada movimento"""
+        battery = initial_battery
+        for t, (current, neighbor) in enumerate(zip(path, path[1:]), self.leg_start_time + 1):
+            move_cost = self.move_cost(neighbor, t, current)
+            if move_cost > battery:
+                return None
+            battery -= move_cost
+            if neighbor in self.env.charging_stations:
+                battery = 100.0
+        return battery
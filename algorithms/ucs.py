@@ -1,168 +1,76 @@
 import heapq
-import time
 
-class UCS:
-    def __init__(self, env):
-        self.env = env
-        self.agent_dict = env.agent_dict
-        self.total_cost = 0.0
-        self.total_nodes_explored = 0
-    
-    def search(self, agent_name):
-        start_time = time.time()
-        
-        start = self.agent_dict[agent_name]["start"]
-        initial_battery = self.agent_dict[agent_name]["battery"]
-        
-        print(f"🟦 UCS planejando missão completa...")
-        
-        full_mission_path = self.plan_complete_mission(agent_name, start, initial_battery)
-        
-        computation_time = time.time() - start_time
-        
-        if full_mission_path:
-            print(f"✅ UCS MISSÃO CONCLUÍDA: {len(full_mission_path)} passos totais")
-            print(f"   Custo Total da Missão (g(n)): {self.total_cost:.2f}")
-            print(f"   Nós Explorados: {self.total_nodes_explored}")
-            print(f"   Tempo de Execução (Planejamento): {computation_time:.4f}s")
-            return full_mission_path
-        else:
-            print(f"❌ UCS FALHOU: Missão não planejável")
-            return []
+from algorithms.battery_state import ParetoLabels
+from algorithms.mission_planner import MissionPlanner
 
-    def plan_complete_mission(self, agent_name, start, initial_battery):
-        mission_path = []
-        current_position = start
-        current_battery = initial_battery
-        self.total_cost = 0.0
-        self.total_nodes_explored = 0
-        
-        # FASE 1: Ida para entrega
-        print("   FASE 1: Indo para entrega (UCS)...")
-        delivery_goal = self.agent_dict[agent_name]["goal"]
-        
-        result = self.find_path_ucs(current_position, delivery_goal, current_battery, agent_name)
-        
-        if not result:
-            # 2. A busca falhou. Tenta novamente com Bateria Infinita (ignore_battery=True)
-            print("   ❌ Busca falhou com restrição de bateria. Re-testando viabilidade de caminho...")
-            
-            viability_result = self.find_path(current_position, delivery_goal, current_battery, agent_name, ignore_battery=True)
-            
-            if viability_result:
-                # 3. Sucesso no modo Bateria Infinita
-                print("   ⚠️ DIAGNÓSTICO: Caminho existe, mas é inviável por falta de bateria (Outbound).")
-            else:
-                # 4. Falha no modo Bateria Infinita
-                print("   💀 DIAGNÓSTICO: Caminho está BLOQUEADO (Obstáculos ou Mapa Desconectado).")
-                
-            print("   ❌ Não foi possível planejar ida para entrega")
-            return []
-            
-        outbound_path, outbound_cost, nodes_exp_out = result
-        self.total_cost += outbound_cost
-        self.total_nodes_explored += nodes_exp_out
-        
-        mission_path.extend(outbound_path[1:])
-        
-        # Atualizar bateria após ida
-        current_position = delivery_goal
-        current_battery -= outbound_cost # Simplificado: o custo é igual à bateria consumida
-        
-        delivery_time_steps = len(outbound_path) - 1
-        
-        print(f"   ✅ UCS Chegou na entrega. Bateria: {current_battery:.1f}%")
-        
-        # FASE 2: Entrega (pausa)
-        print("   FASE 2: Realizando entrega...")
-        delivery_steps = [current_position] * 3
-        mission_path.extend(delivery_steps)
-        self.total_cost += 0.0
-        delivery_time_steps += 3
-        print(f"   Tempo de Entrega (Endereço + Pausa): {delivery_time_steps} passos")
-        
-        # FASE 3: Volta para base
-        print("   FASE 3: Voltando para base (UCS)...")
-        # ⚡️ NOVO BLOCO DE CARREGAMENTO EXPLÍCITO APÓS A ENTREGA
-        if current_position in self.env.charging_stations:
-            # Assumimos que a taxa de carregamento é de +20 (conforme o seu código anterior),
-            # mas o drone carrega durante a pausa da entrega.
-            charge_amount = 100.0 
-            current_battery = min(self.env.agent_dict[agent_name]["max_battery"], current_battery + charge_amount)
-            
-            # Atualiza o estado da bateria no dicionário do agente (importante para logs futuros)
-            self.env.agent_dict[agent_name]["battery"] = current_battery 
-            
-            print(f"   ⚡ CARREGAMENTO NO DESTINO CONCLUÍDO. Bateria atualizada: {current_battery:.1f}%")
-        # ⚡️ FIM DO NOVO BLOCO
-        home_base = self.agent_dict[agent_name]["home_base"]
-        result = self.find_path_ucs(current_position, home_base, current_battery, agent_name)
-        
-        if not result:
-            print("   ❌ UCS: Não foi possível planejar volta para base")
-            return []
-            
-        inbound_path, inbound_cost, nodes_exp_in = result
-        self.total_cost += inbound_cost
-        self.total_nodes_explored += nodes_exp_in
-        
-        mission_path.extend(inbound_path[1:])
-        current_position = home_base
-        
-        # FASE 4: Repouso (pausa)
-        print("   FASE 4: Repousando na base...")
-        rest_steps = [current_position] * 5
-        mission_path.extend(rest_steps)
-        self.total_cost += 0.0
-        
-        return mission_path
+class UCS(MissionPlanner):
+    name = "UCS"
+    icon = "🟦"
+
+    def find_path(self, start, goal, initial_battery, agent_name, ignore_battery=False):
+        if self.bidirectional:
+            return self.find_path_bidirectional(start, goal, initial_battery, agent_name,
+                                                ignore_battery, self.find_path_ucs)
+        return self.find_path_ucs(start, goal, initial_battery, agent_name, ignore_battery)
 
     def find_path_ucs(self, start, goal, initial_battery, agent_name, ignore_battery=False):
         frontier = []
         # Item: (custo_g, posição, bateria)
-        heapq.heappush(frontier, (0, start, initial_battery))
-        came_from = {(start, initial_battery): None}
-        cost_so_far = {(start, initial_battery): 0}
+        heapq.heappush(frontier, (0.0, start, initial_battery))
+        
+        # Chave: (posição, bateria discretizada); sem restrição de bateria só a posição importa
+        start_state = (start, self.battery_level(initial_battery, ignore_battery))
+        came_from = {start_state: None}
+        cost_so_far = {start_state: 0.0}
+        labels = ParetoLabels()
+        labels.add(start, 0.0, start_state[1])
         
         nodes_explored = 0
         
         while frontier:
             current_cost, current, current_battery = heapq.heappop(frontier)
+            current_state = (current, self.battery_level(current_battery, ignore_battery))
+            
+            # Entrada obsoleta: o estado foi melhorado ou dominado após ser inserido
+            if cost_so_far.get(current_state) != current_cost:
+                continue
             nodes_explored += 1 # Contagem de nós expandidos
             
             if current == goal:
                 # Reconstruir caminho
                 path = []
-                state = (current, current_battery)
-                final_cost = cost_so_far.get(state, float('inf'))
+                state = current_state
                 
                 while state in came_from and came_from[state] is not None:
-                    pos, bat = state
-                    path.append(pos)
+                    path.append(state[0])
                     state = came_from[state]
                 path.append(start)
                 path.reverse()
                 
-                return path, final_cost, nodes_explored # Retorna o caminho, custo final e nós explorados
+                return path, current_cost, nodes_explored # Retorna o caminho, custo final e nós explorados
             
-            neighbors = self.env.get_neighbors(current, current_battery)
+            neighbors = self.env.get_neighbors(current, current_battery, ignore_battery)
             
             for neighbor in neighbors:
                 move_cost = self.env.calculate_move_cost(current, neighbor, current_battery)
                 new_battery = current_battery - move_cost
-                #new_battery = 100.0
                 
                 if neighbor in self.env.charging_stations:
-                    #new_battery = min(100.0, new_battery + 20)
                     new_battery = 100.0 # Carrega completamente
                 
-                new_cost = cost_so_far[(current, current_battery)] + move_cost
-                new_state = (neighbor, new_battery)
+                new_cost = current_cost + move_cost
+                level = self.battery_level(new_battery, ignore_battery)
+                
+                # Poda de Pareto: descarta se a célula já foi alcançada com custo
+                # menor ou igual e pelo menos a mesma bateria
+                if labels.is_dominated(neighbor, new_cost, level):
+                    continue
+                for dominated_level in labels.add(neighbor, new_cost, level):
+                    cost_so_far.pop((neighbor, dominated_level), None)
                 
-                if new_state not in cost_so_far or new_cost < cost_so_far[new_state]:
-                    cost_so_far[new_state] = new_cost
-                    priority = new_cost
-                    heapq.heappush(frontier, (priority, neighbor, new_battery))
-                    came_from[new_state] = (current, current_battery)
+                new_state = (neighbor, level)
+                cost_so_far[new_state] = new_cost
+                heapq.heappush(frontier, (new_cost, neighbor, new_battery))
+                came_from[new_state] = current_state
         
-        return None
\ No newline at end of file
+        return None
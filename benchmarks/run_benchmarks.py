@@ -0,0 +1,230 @@
+"""
+Benchmark padrão dos planejadores, com acompanhamento de regressões.
+
+    python -m benchmarks.run_benchmarks                       # suíte rápida, compara com a base
+    python -m benchmarks.run_benchmarks --suite full          # mapas sintéticos até 2000x2000
+    python -m benchmarks.run_benchmarks --save-baseline       # grava os resultados como nova base
+
+Cada caso (mapa, vento, planejador) registra nós expandidos, tempo de parede,
+pico de memória (tracemalloc, numa segunda execução) e custo do caminho.
+Os caches de heurística são esvaziados antes de cada execução: mede-se o planejamento a frio.
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from algorithms.registry import create_planner
+from config import settings
+from Environment.adjacency import clear_graph_cache
+from Environment.compiled_grid import CompiledGrid
+from Environment.distance_tables import clear_table_cache
+from Environment.hierarchy import clear_abstract_cache
+from Environment.environment import Environment
+from utils.map_format import MAP_EXTENSION, load_map
+from utils.map_generator import generate_map
+from utils.scenarios import find_cell
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+
+SUITES = {
+    "quick": [50, 100, 200],
+    "full": [50, 100, 200, 500, 1000, 2000],
+}
+PLANNERS = ["astar", "ucs", "ids", "hpa_star"]
+# Acima destes tamanhos o planejador só mediria o próprio timeout
+PLANNER_MAX_SIZE = {"ids": 100, "ucs": 500}
+WIND_SETTINGS = {"calm": 0.0, "windy": 0.5}
+WEATHER_SEED = 42
+MAP_SEED = 7
+SYNTHETIC_LAYOUT = "random"
+
+# Tolerâncias relativas padrão para acusar regressão
+TIME_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 0.2
+COST_TOLERANCE = 1e-6
+
+def load_cases(sizes, include_bundled=True, layout=SYNTHETIC_LAYOUT):
+    """Lista de (nome do mapa, grade): mapas de pal/*.dmap e sintéticos"""
+    cases = []
+    if include_bundled:
+        for path in sorted(glob.glob(os.path.join(settings.PROJECT_ROOT, "pal", "*" + MAP_EXTENSION))):
+            cases.append((os.path.splitext(os.path.basename(path))[0], load_map(path)[0]))
+    for size in sizes:
+        cases.append((f"synthetic-{layout}-{size}x{size}", generate_map(size, layout=layout, seed=MAP_SEED)))
+    return cases
+
+def build_environment(grid, wind_intensity):
+    """Ambiente compilado e com clima reproduzível (semente fixa)"""
+    random.seed(WEATHER_SEED)
+    start = find_cell(grid, "S")
+    goal = find_cell(grid, "1")
+    return Environment(grid, start, goal, flight_height="high",
+                       weather_conditions={"wind_intensity": wind_intensity},
+                       compiled=True)
+
+def path_cost(env, path):
+    """Custo dos movimentos do caminho (as pausas na mesma célula não custam)"""
+    cost = 0.0
+    for current, neighbor in zip(path, path[1:]):
+        if current != neighbor:
+            cost += env.calculate_move_cost(current, neighbor, float('inf'))
+    return cost
+
+def run_once(grid, wind_intensity, planner_key, trace_memory):
+    """Uma execução a frio; retorna (caminho, ambiente, planejador, tempo, pico de memória)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = build_environment(grid, wind_intensity)
+    clear_table_cache()
+    clear_graph_cache()
+    clear_abstract_cache()
+    planner = create_planner(planner_key, env)
+
+    if trace_memory:
+        tracemalloc.start()
+    start_time = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        path = planner.search("agent0")
+    elapsed = time.perf_counter() - start_time
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return path, env, planner, elapsed, peak
+
+def run_case(map_name, grid, wind_name, planner_key, measure_memory=True):
+    path, env, planner, elapsed, _ = run_once(grid, WIND_SETTINGS[wind_name], planner_key, False)
+    peak = None
+    if measure_memory:
+        # tracemalloc distorce o tempo: a memória é medida numa execução separada
+        peak = run_once(grid, WIND_SETTINGS[wind_name], planner_key, True)[4]
+
+    return {
+        "case": f"{map_name}/{wind_name}/{planner_key}",
+        "map": map_name,
+        "size": [env.cols, env.rows],
+        "wind": wind_name,
+        "planner": planner_key,
+        "found": bool(path),
+        "path_length": len(path),
+        "cost": round(path_cost(env, path), 6) if path else None,
+        "nodes_expanded": getattr(planner, "total_nodes_explored", None),
+        "wall_time": elapsed,
+        "peak_memory": peak,
+    }
+
+def run_suite(sizes, planners=PLANNERS, include_bundled=True, measure_memory=True,
+              layout=SYNTHETIC_LAYOUT):
+    results = []
+    for map_name, grid in load_cases(sizes, include_bundled, layout):
+        size = max(grid.rows, grid.cols) if isinstance(grid, CompiledGrid) else max(len(grid), len(grid[0]))
+        for wind_name in WIND_SETTINGS:
+            for planner_key in planners:
+                if size > PLANNER_MAX_SIZE.get(planner_key, size):
+                    continue
+                result = run_case(map_name, grid, wind_name, planner_key, measure_memory)
+                results.append(result)
+                memory = f"{result['peak_memory'] / 1e6:8.2f} MB" if result["peak_memory"] is not None else "      -"
+                print(f"   {result['case']:<45} nós={str(result['nodes_expanded']):>9} "
+                      f"tempo={result['wall_time']:8.3f}s memória={memory} custo={result['cost']}")
+    return results
+
+def compare_with_baseline(results, baseline, time_tolerance=TIME_TOLERANCE,
+                          memory_tolerance=MEMORY_TOLERANCE):
+    """Lista de regressões (textos) em relação à base; casos novos são ignorados"""
+    previous = {entry["case"]: entry for entry in baseline["results"]}
+    regressions = []
+
+    for result in results:
+        before = previous.get(result["case"])
+        if before is None:
+            continue
+        case = result["case"]
+
+        if before["found"] and not result["found"]:
+            regressions.append(f"{case}: deixou de encontrar caminho")
+            continue
+        if before["cost"] is not None and result["cost"] is not None:
+            if result["cost"] > before["cost"] + COST_TOLERANCE:
+                regressions.append(f"{case}: custo {before['cost']} → {result['cost']}")
+        if before["nodes_expanded"] is not None and result["nodes_expanded"] is not None:
+            if result["nodes_expanded"] > before["nodes_expanded"]:
+                regressions.append(f"{case}: nós {before['nodes_expanded']} → {result['nodes_expanded']}")
+        if result["wall_time"] > before["wall_time"] * (1 + time_tolerance) and result["wall_time"] > 0.05:
+            regressions.append(f"{case}: tempo {before['wall_time']:.3f}s → {result['wall_time']:.3f}s")
+        if before.get("peak_memory") and result["peak_memory"] is not None:
+            if result["peak_memory"] > before["peak_memory"] * (1 + memory_tolerance):
+                regressions.append(f"{case}: memória {before['peak_memory']} → {result['peak_memory']} bytes")
+
+    return regressions
+
+def save_results(results, file_path):
+    payload = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(file_path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2, ensure_ascii=False)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos planejadores de rota")
+    parser.add_argument("--suite", choices=sorted(SUITES), default="quick")
+    parser.add_argument("--sizes", help="Tamanhos dos mapas sintéticos, separados por vírgula (substitui --suite)")
+    parser.add_argument("--planners", default=",".join(PLANNERS))
+    parser.add_argument("--layout", choices=["city", "random", "corridor"], default=SYNTHETIC_LAYOUT,
+                        help="Layout dos mapas sintéticos")
+    parser.add_argument("--no-bundled", action="store_true", help="Não inclui os mapas de pal/*.dmap")
+    parser.add_argument("--no-memory", action="store_true", help="Não mede o pico de memória")
+    parser.add_argument("-o", "--output", default=os.path.join(BENCHMARK_DIR, "results.json"))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Grava os resultados como nova base")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",")] if args.sizes else SUITES[args.suite]
+    planners = [key.strip() for key in args.planners.split(",") if key.strip()]
+
+    # Sem cache em disco: cada execução reconstrói suas tabelas de heurística
+    settings.HEURISTIC_CACHE_PERSIST = False
+
+    print(f"📊 Benchmark: mapas sintéticos ({args.layout}) {sizes}, planejadores {planners}")
+    results = run_suite(sizes, planners, not args.no_bundled, not args.no_memory, args.layout)
+    save_results(results, args.output)
+    print(f"💾 Resultados gravados em {args.output}")
+
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"📌 Nova base gravada em {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("⚠️  Sem base para comparar (use --save-baseline)")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    regressions = compare_with_baseline(results, baseline, args.time_tolerance, args.memory_tolerance)
+    if regressions:
+        print(f"❌ {len(regressions)} regressões em relação à base:")
+        for regression in regressions:
+            print(f"   • {regression}")
+        return 1
+
+    print("✅ Nenhuma regressão em relação à base")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
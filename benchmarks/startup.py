@@ -0,0 +1,86 @@
+"""
+Benchmark de inicialização (partida a frio) baseado em `python -X importtime`.
+
+    python -m benchmarks.startup                     # mede 'import main'
+    python -m benchmarks.startup --module headless --budget-ms 300
+
+Importa o módulo de entrada num processo novo, soma o tempo de importação,
+lista os módulos mais pesados e acusa módulos pesados que só deveriam ser
+carregados sob demanda (FORBIDDEN_AT_STARTUP).
+"""
+import argparse
+import subprocess
+import sys
+
+from config import settings
+
+# Carregados apenas quando a funcionalidade que os usa é acionada
+FORBIDDEN_AT_STARTUP = {
+    "main": ["pandas", "openpyxl", "matplotlib.pyplot", "matplotlib.animation",
+             "algorithms.astar", "algorithms.ucs", "algorithms.ids",
+             "ui.multi_drone_animation", "concurrent.futures.process", "utils.map_format"],
+    "headless": ["pandas", "openpyxl", "tkinter", "matplotlib"],
+}
+DEFAULT_RUNS = 5
+
+def measure_import(module, python=sys.executable):
+    """
+    Importa o módulo num processo novo com -X importtime.
+    Retorna {módulo: (próprio_us, acumulado_us)} e o tempo total (us).
+    """
+    result = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=settings.PROJECT_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {module}:\n{result.stderr.strip().splitlines()[-1]}")
+
+    timings = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = len(name) - len(name.lstrip())
+        name = name.strip()
+        timings[name] = (int(self_us), int(cumulative_us))
+        if depth == 1:
+            # Importações de primeiro nível: a soma é o custo total de partida
+            total += int(cumulative_us)
+    return timings, total
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tempo de inicialização (python -X importtime)")
+    parser.add_argument("--module", default="main", help="Módulo de entrada (padrão: main)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Execuções; vale a mais rápida")
+    parser.add_argument("--top", type=int, default=15, help="Quantos módulos mais pesados listar")
+    parser.add_argument("--budget-ms", type=float, help="Falha se a partida passar deste tempo")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        runs = [measure_import(args.module) for _ in range(args.runs)]
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 2
+    timings, total = min(runs, key=lambda run: run[1])
+
+    print(f"🚀 import {args.module}: {total / 1000:.1f} ms (melhor de {args.runs} execuções)")
+    print(f"   {len(timings)} módulos importados; mais pesados (tempo próprio):")
+    heaviest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+    for name, (self_us, cumulative_us) in heaviest:
+        print(f"   {self_us / 1000:8.1f} ms  (acumulado {cumulative_us / 1000:8.1f} ms)  {name}")
+
+    status = 0
+    loaded = [name for name in FORBIDDEN_AT_STARTUP.get(args.module, []) if name in timings]
+    if loaded:
+        print(f"❌ Módulos que deveriam carregar sob demanda: {', '.join(loaded)}")
+        status = 1
+    if args.budget_ms is not None and total / 1000 > args.budget_ms:
+        print(f"❌ Partida acima do orçamento de {args.budget_ms:.0f} ms")
+        status = 1
+    if status == 0:
+        print("✅ Partida dentro do esperado")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Diretório dos caches persistidos (tabelas de heurística, etc.)
+CACHE_DIR = os.environ.get("DRONE_PLANNER_CACHE_DIR", os.path.join(PROJECT_ROOT, ".cache"))
+
+# Tabelas de distância exatas por objetivo (Dijkstra reverso)
+HEURISTIC_CACHE_DIR = os.path.join(CACHE_DIR, "heuristics")
+HEURISTIC_CACHE_PERSIST = True
+HEURISTIC_CACHE_MAX_FILES = 256
+HEURISTIC_MEMORY_CACHE_SIZE = 32
+# Distâncias de várias origens calculadas juntas (sweep_costs): células x origens por lote
+SWEEP_MAX_CELLS = 4_000_000
+
+# Mapas em blocos (.tmap): lado do bloco e blocos decodificados mantidos em memória (LRU)
+TILE_SIZE = 256
+TILE_CACHE_SIZE = 256
+
+# Abstração hierárquica (HPA*): lado dos clusters e abstrações mantidas em memória (LRU)
+HPA_CLUSTER_SIZE = 16
+HPA_CACHE_SIZE = 8
+
+# Previsão do tempo (planejamento espaço-tempo): passos previstos e intervalo entre quadros-chave
+FORECAST_STEPS = 60
+FORECAST_INTERVAL = 5
+
+# Frota (CBS): nós de alto nível expandidos antes de desistir
+CBS_MAX_NODES = 100
+
+# Tabela de reservas espaço-tempo: passos por balde do índice (potência de 2)
+RESERVATION_BUCKET_SIZE = 8
+
+# Atribuição de entregas à frota: paradas (pacotes) por viagem nas rotas com várias entregas
+FLEET_MAX_STOPS = 3
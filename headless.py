@@ -0,0 +1,62 @@
+"""
+Execução em lote sem interface gráfica.
+
+    python headless.py cenarios.csv -o resultados.csv --planners astar,ucs --workers 8
+
+Não importa tkinter nem matplotlib: pode rodar em servidores sem display.
+"""
+import argparse
+import os
+import sys
+import time
+
+from algorithms.registry import PLANNERS
+from utils.parallel import create_executor
+from utils.scenarios import load_scenarios, run_scenario, write_results
+
+# Tarefas entregues de uma vez a cada processo (reduz o custo de comunicação)
+DEFAULT_CHUNKSIZE = 4
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Planejamento de rotas de drones em lote (sem interface)")
+    parser.add_argument("scenarios", help="Arquivo de cenários (.csv ou .json)")
+    parser.add_argument("-o", "--output", default="resultados.csv",
+                        help="Arquivo de resultados (.csv ou .parquet)")
+    parser.add_argument("-p", "--planners", default="astar,ucs",
+                        help=f"Planejadores separados por vírgula ({', '.join(PLANNERS)})")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="Número de processos (padrão: todos os núcleos)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Mostra a saída dos planejadores")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    planner_keys = [key.strip() for key in args.planners.split(",") if key.strip()]
+    unknown = [key for key in planner_keys if key not in PLANNERS]
+    if unknown:
+        print(f"❌ Planejadores desconhecidos: {', '.join(unknown)}")
+        return 2
+
+    scenarios = load_scenarios(args.scenarios)
+    tasks = [(scenario, key, args.verbose) for scenario in scenarios for key in planner_keys]
+    print(f"🚁 {len(scenarios)} cenários × {len(planner_keys)} planejadores = {len(tasks)} execuções "
+          f"em {args.workers} processos")
+
+    start_time = time.time()
+    results = []
+    progress_step = max(1, len(tasks) // 20)
+    with create_executor(max_workers=args.workers) as executor:
+        for result in executor.map(run_scenario, tasks, chunksize=args.chunksize):
+            results.append(result)
+            if len(results) % progress_step == 0 or len(results) == len(tasks):
+                print(f"   {len(results)}/{len(tasks)} concluídas ({time.time() - start_time:.1f}s)")
+
+    write_results(results, args.output)
+    failed = sum(1 for result in results if result["status"] != "ok")
+    print(f"✅ Resultados gravados em {args.output} ({failed} sem rota ou com erro)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
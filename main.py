@@ -1,16 +1,26 @@
+import logging
+import os
 import traceback
-import pandas as pd
 from ui.drone_ui import DroneControlUI
 #import sys
 
 def main():
+    # Diagnósticos do ambiente (clima etc.) vão para o logging; DEBUG mostra cada célula W
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     try:
         # Força a codificação UTF-8 para a saída do console (Windows) #descomente a linha asseguir no windows
         #sys.stdout.reconfigure(encoding='utf-8')
         
-        # Carregar mapa
-        df = pd.read_excel("./pal/maputo-map.xlsx", header=None, engine="openpyxl")
-        grid = df.astype(str).values.tolist()
+        # Carregar mapa (formato binário; o .xlsx só é lido se ainda não foi convertido)
+        from utils.map_format import MAP_EXTENSION, load_map
+        map_path = "./pal/maputo-map" + MAP_EXTENSION
+        if os.path.exists(map_path):
+            compiled, _ = load_map(map_path)
+            grid = compiled.to_lists()
+        else:
+            import pandas as pd
+            df = pd.read_excel("./pal/maputo-map.xlsx", header=None, engine="openpyxl")
+            grid = df.astype(str).values.tolist()
         
         # Iniciar interface
         ui = DroneControlUI(grid)
@@ -0,0 +1,53 @@
+import contextlib
+import io
+import os
+
+import pytest
+
+from algorithms.astar import AStar
+from algorithms.batch_planner import BatchPlanner
+from Environment import distance_tables
+from Environment.environment import Environment
+from utils.map_format import load_map
+
+MAP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pal")
+
+def path_cost(env, path):
+    return sum(env.calculate_move_cost(current, neighbor, float("inf"))
+               for current, neighbor in zip(path, path[1:]) if current != neighbor)
+
+@pytest.mark.parametrize("map_name", ["mapa-real", "maputo-map"])
+def test_batch_matches_separate_astar_missions(map_name, monkeypatch):
+    grid, meta = load_map(os.path.join(MAP_DIR, f"{map_name}.dmap"))
+    start = tuple(meta["start"])
+    goals = [tuple(meta["delivery_points"][key]) for key in "1234"]
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = Environment(grid, start, goals[0], flight_height="high",
+                          weather_conditions={"wind_intensity": 0.3})
+
+    distance_tables.clear_table_cache()
+    roots = []
+
+    class CountingTable(distance_tables.LazyDistanceTable):
+        def __init__(self, graph, root, reverse=True):
+            roots.append((tuple(root), reverse))
+            super().__init__(graph, root, reverse)
+
+    monkeypatch.setattr(distance_tables, "LazyDistanceTable", CountingTable)
+    with contextlib.redirect_stdout(io.StringIO()):
+        plans = BatchPlanner(env).plan_all(goals)
+    # Uma árvore a partir de S para todas as idas, uma até a base para todas as voltas
+    assert sorted(roots) == sorted([(start, False), (start, True)])
+
+    agent = env.agent_dict["agent0"]
+    for goal in goals:
+        agent["goal"], agent["battery"] = goal, 100.0
+        planner = AStar(env)
+        with contextlib.redirect_stdout(io.StringIO()):
+            path = planner.plan_complete_mission("agent0", start, 100.0)
+        plan = plans[goal]
+        assert plan["path"] and path
+        assert plan["total_cost"] == pytest.approx(planner.total_cost)
+        assert path_cost(env, [start] + plan["path"]) == pytest.approx(planner.total_cost)
+        assert plan["path"][-1] == start and goal in plan["path"]
+        assert len(plan["path"]) == len(path)
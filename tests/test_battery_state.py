@@ -0,0 +1,65 @@
+import contextlib
+import io
+import os
+import random
+
+from algorithms.astar import AStar
+from algorithms.battery_state import ParetoLabels, quantize_battery
+from Environment.environment import Environment
+from utils.map_format import load_map
+
+MAP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pal")
+
+def test_quantize_battery_rounds_down():
+    assert quantize_battery(50.0, 0.1) == 500
+    assert quantize_battery(0.25, 0.1) == 2
+    # 0.3 / 0.1 dá 2.9999999999999996 em ponto flutuante: a folga evita perder uma unidade
+    assert quantize_battery(0.3, 0.1) == 3
+    assert quantize_battery(99.99, 1.0) == 99
+    assert quantize_battery(12.345, None) == 12.345
+
+def test_dominance_needs_lower_cost_and_more_battery():
+    labels = ParetoLabels()
+    labels.add((0, 0), 5.0, 50)
+    assert labels.is_dominated((0, 0), 5.0, 50)
+    assert labels.is_dominated((0, 0), 6.0, 40)
+    assert not labels.is_dominated((0, 0), 4.0, 40)
+    assert not labels.is_dominated((0, 0), 6.0, 60)
+    assert not labels.is_dominated((1, 0), 6.0, 40)
+
+def test_add_prunes_dominated_labels():
+    labels = ParetoLabels()
+    assert labels.add((0, 0), 5.0, 50) == []
+    assert labels.add((0, 0), 3.0, 30) == []
+    assert sorted(labels.labels[(0, 0)]) == [(3.0, 30), (5.0, 50)]
+    assert sorted(labels.add((0, 0), 2.0, 60)) == [30, 50]
+    assert labels.labels[(0, 0)] == [(2.0, 60)]
+
+def test_labels_keep_the_pareto_front():
+    rng = random.Random(0)
+    for _ in range(200):
+        labels = ParetoLabels()
+        inserted = []
+        for _ in range(rng.randint(1, 30)):
+            cost, battery = rng.randint(0, 10) * 1.0, rng.randint(0, 10)
+            # Como nas buscas: só entra o rótulo que nenhum outro domina
+            if not labels.is_dominated((0, 0), cost, battery):
+                labels.add((0, 0), cost, battery)
+            inserted.append((cost, battery))
+        front = {(c, b) for c, b in inserted
+                 if not any(oc <= c and ob >= b and (oc, ob) != (c, b) for oc, ob in inserted)}
+        assert set(labels.labels[(0, 0)]) == front
+        assert len(labels.labels[(0, 0)]) == len(front)
+
+def test_discretized_search_keeps_optimal_cost():
+    grid, meta = load_map(os.path.join(MAP_DIR, "maputo-map.dmap"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = Environment(grid, tuple(meta["start"]), meta["delivery_points"]["1"], flight_height="high",
+                          weather_conditions={"wind_intensity": 0.3})
+    start = tuple(meta["start"])
+    for goal in meta["delivery_points"].values():
+        exact = AStar(env, battery_resolution=None).find_path(start, tuple(goal), 60.0, "agent0")
+        coarse = AStar(env).find_path(start, tuple(goal), 60.0, "agent0")
+        assert (exact is None) == (coarse is None)
+        if exact is not None:
+            assert abs(exact[1] - coarse[1]) < 1e-9
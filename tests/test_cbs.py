@@ -0,0 +1,71 @@
+import os
+
+from algorithms.cbs import ConflictBasedSearch, find_conflicts
+from Environment.environment import Environment
+from utils.map_format import load_map
+
+MAP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pal")
+
+# Saída da base S por um único corredor: os drones precisam se revezar
+CORRIDOR = [
+    ["S", "0", "0", "0", "0"],
+    ["X", "X", "0", "X", "X"],
+    ["1", "0", "0", "0", "2"],
+]
+
+def schedule_paths(schedule):
+    paths = {}
+    for agent, steps in schedule.items():
+        assert [step["t"] for step in steps] == list(range(len(steps)))
+        paths[agent] = [(step["x"], step["y"]) for step in steps]
+    return paths
+
+def assert_valid_schedule(env, result):
+    assert result is not None
+    paths = schedule_paths(result["schedule"])
+    for agent, path in paths.items():
+        assert path[0] == env.agent_dict[agent]["start"]
+        assert path[-1] == env.agent_dict[agent]["home_base"]
+        assert env.agent_dict[agent]["goal"] in path
+        for (x0, y0), (x1, y1) in zip(path, path[1:]):
+            assert abs(x0 - x1) + abs(y0 - y1) <= 1
+    safe_cells = {env.agent_dict[agent]["home_base"] for agent in paths}
+    assert find_conflicts(paths, safe_cells) == []
+
+def test_find_conflicts_vertex():
+    paths = {"a": [(0, 0), (1, 0), (2, 0)], "b": [(2, 0), (1, 0), (0, 0)]}
+    assert find_conflicts(paths) == [(1, "a", "b", (1, 0))]
+
+def test_find_conflicts_swap():
+    paths = {"a": [(0, 0), (1, 0)], "b": [(1, 0), (0, 0)]}
+    assert find_conflicts(paths) == [(1, "a", "b", (0, 0), (1, 0))]
+
+def test_find_conflicts_ignores_safe_cells_and_landed_drones():
+    paths = {"a": [(0, 0), (0, 0), (1, 0)], "b": [(0, 0), (1, 0)], "c": [(5, 5), (2, 0), (3, 0)]}
+    assert find_conflicts(paths, safe_cells={(0, 0)}) == []
+    # b pousou em (1, 0) no passo 1: no passo 2 a célula está livre para a
+    assert find_conflicts({"a": paths["a"], "b": paths["b"]}) == [(0, "a", "b", (0, 0))]
+
+def test_corridor_fleet_is_conflict_free():
+    env = Environment([row.copy() for row in CORRIDOR], (0, 0), (0, 2))
+    env.add_agent("agent1", goal=(4, 2))
+    env.add_agent("agent2", goal=(0, 2), start=(4, 0))
+    result = ConflictBasedSearch(env).plan()
+    assert_valid_schedule(env, result)
+    # O planejamento roda numa cópia compilada: a grade de listas do chamador fica intacta
+    assert env.compiled is None and env.grid_with_weather is not None
+
+def test_bundled_map_fleet_is_conflict_free():
+    grid, meta = load_map(os.path.join(MAP_DIR, "mapa-real.dmap"))
+    deliveries = sorted(meta["delivery_points"].values())
+    env = Environment(grid, meta["start"], deliveries[0], flight_height="high")
+    for i in range(1, 8):
+        env.add_agent(f"agent{i}", goal=deliveries[i % len(deliveries)])
+    assert_valid_schedule(env, ConflictBasedSearch(env).plan())
+
+def test_prioritized_fallback_is_conflict_free():
+    env = Environment([row.copy() for row in CORRIDOR], (0, 0), (0, 2))
+    for i in range(1, 4):
+        env.add_agent(f"agent{i}", goal=[(4, 2), (0, 2)][i % 2])
+    cbs = ConflictBasedSearch(env, max_nodes=1)
+    assert_valid_schedule(env, cbs.plan())
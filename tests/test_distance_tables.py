@@ -0,0 +1,108 @@
+import contextlib
+import io
+import os
+
+import numpy as np
+import pytest
+
+from config import settings
+from Environment import distance_tables
+from Environment.distance_tables import clear_table_cache, get_distance_table, shortest_path_tree
+from Environment.environment import Environment
+from utils.map_format import load_map
+
+MAP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pal")
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "HEURISTIC_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "HEURISTIC_CACHE_PERSIST", True)
+    clear_table_cache()
+    yield tmp_path
+    clear_table_cache()
+
+def real_map_environment(**weather_conditions):
+    grid, meta = load_map(os.path.join(MAP_DIR, "mapa-real.dmap"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Environment(grid, tuple(meta["start"]), meta["delivery_points"]["1"], flight_height="high",
+                           weather_conditions={"wind_intensity": 0.6, "seed": 5, **weather_conditions})
+
+def forbid_dijkstra(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("a tabela deveria vir do cache")
+    monkeypatch.setattr(distance_tables, "shortest_path_tree", fail)
+
+def test_tables_are_cached_in_memory_and_on_disk(cache_dir, monkeypatch):
+    env = real_map_environment()
+    goal = env.agent_dict["agent0"]["goal"]
+    table = env.distance_table(goal)
+    assert env.distance_table(goal) is table
+    assert len(os.listdir(cache_dir)) == 1
+
+    # Memória vazia: a tabela volta do .npz, sem novo Dijkstra
+    clear_table_cache()
+    forbid_dijkstra(monkeypatch)
+    loaded = env.distance_table(goal)
+    assert loaded is not table
+    assert np.array_equal(loaded.dist, table.dist) and np.array_equal(loaded.link, table.link)
+    assert loaded.path(env.home_base) == table.path(env.home_base)
+
+def test_memory_cache_is_lru(cache_dir, monkeypatch):
+    monkeypatch.setattr(settings, "HEURISTIC_MEMORY_CACHE_SIZE", 2)
+    monkeypatch.setattr(settings, "HEURISTIC_CACHE_PERSIST", False)
+    env = real_map_environment()
+    first, second, third = [tuple(point) for point in sorted(env.delivery_points)[:3]]
+    table = env.distance_table(first)
+    evicted = env.distance_table(second)
+    assert env.distance_table(first) is table
+    env.distance_table(third) # Descarta second, o menos usado
+    assert env.distance_table(first) is table
+    assert env.distance_table(second) is not evicted
+    assert len(distance_tables._table_cache) == 2
+
+def test_cost_rules_get_their_own_tables(cache_dir):
+    calm_rules = real_map_environment()
+    headwind = real_map_environment(wind_direction=90)
+    assert calm_rules.graph_key != headwind.graph_key
+    goal = calm_rules.agent_dict["agent0"]["goal"]
+
+    table = calm_rules.distance_table(goal)
+    directional = headwind.distance_table(goal)
+    assert directional is not table
+    assert len(os.listdir(cache_dir)) == 2
+    assert np.array_equal(directional.dist, shortest_path_tree(headwind.graph, goal).dist)
+    assert not np.array_equal(directional.dist, table.dist)
+
+def test_weather_ticks_invalidate_tables(cache_dir):
+    env = real_map_environment()
+    goal = env.agent_dict["agent0"]["goal"]
+    before = env.distance_table(goal)
+    old_key = env.graph_key
+
+    path = before.path(env.home_base)
+    with contextlib.redirect_stdout(io.StringIO()):
+        changed = env.update_weather_cells(wind_on=path[1:-1])
+    assert changed and env.graph_key != old_key
+
+    after = env.distance_table(goal)
+    assert after is not before
+    assert np.array_equal(after.dist, shortest_path_tree(env.graph, goal).dist)
+    assert after.cost(env.home_base) > before.cost(env.home_base)
+    assert len(os.listdir(cache_dir)) == 2
+
+def test_disk_cache_is_pruned_and_tolerates_bad_files(cache_dir, monkeypatch):
+    monkeypatch.setattr(settings, "HEURISTIC_CACHE_MAX_FILES", 2)
+    env = real_map_environment()
+    points = [tuple(point) for point in sorted(env.delivery_points)[:3]]
+    for point in points:
+        env.distance_table(point)
+    assert len(os.listdir(cache_dir)) == 2
+
+    # Arquivo corrompido: ignorado e refeito
+    clear_table_cache()
+    path = distance_tables._cache_path(env.graph_key, points[-1], True)
+    with open(path, "wb") as handle:
+        handle.write(b"not a table")
+    with contextlib.redirect_stdout(io.StringIO()):
+        table = get_distance_table(env.graph_key, env.graph, points[-1])
+    assert np.array_equal(table.dist, shortest_path_tree(env.graph, points[-1]).dist)
@@ -0,0 +1,93 @@
+import contextlib
+import io
+import os
+import random
+
+import pytest
+
+from algorithms.astar import AStar
+from algorithms.dstar_lite import DStarLite, DStarLiteSearch
+from Environment.environment import Environment
+from utils.map_format import load_map
+from utils.map_generator import generate_map
+
+MAP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pal")
+
+def fresh_cost(env, start, goal):
+    result = AStar(env, reuse_return_tree=False).find_path(start, goal, float("inf"), "agent0",
+                                                            ignore_battery=True)
+    return result[1] if result is not None else None
+
+def path_cost(env, path):
+    return sum(env.calculate_move_cost(a, b, float("inf")) for a, b in zip(path, path[1:]))
+
+def fly_through_ticks(env, start, goal, ticks, seed):
+    """Voa a rota do D* Lite, aplicando um tique de clima a cada trecho; confere cada reparo"""
+    rng = random.Random(seed)
+    cells = [(x, y) for y in range(env.rows) for x in range(env.cols) if env.is_passable((x, y))]
+    planner = DStarLite(env)
+    path, cost, _ = planner.find_path(start, goal, float("inf"), "agent0", ignore_battery=True)
+    assert cost == pytest.approx(fresh_cost(env, start, goal))
+
+    position = start
+    for _ in range(ticks):
+        position = path[min(len(path) - 1, 5)]
+        # Vento novo em cima da rota restante e em volta dela; parte do vento antigo some
+        wind_on = path[6:12] + rng.sample(cells, len(cells) // 20)
+        wind_off = rng.sample(env.find_wind_cells(), len(env.find_wind_cells()) // 3)
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = planner.weather_tick(position, float("inf"), wind_on=wind_on, wind_off=wind_off)
+        path, cost, _ = result
+        assert path[0] == position and path[-1] == goal
+        assert cost == pytest.approx(fresh_cost(env, position, goal))
+        assert path_cost(env, path) == pytest.approx(cost)
+    return planner
+
+@pytest.mark.parametrize("wind_direction", [None, 90])
+def test_repaired_cost_matches_fresh_astar(wind_direction):
+    grid = generate_map(50, layout="city", seed=8)
+    weather = {"wind_intensity": 0.3, "seed": 1}
+    if wind_direction is not None:
+        weather["wind_direction"] = wind_direction
+    start, goal = grid.find("S")[0], grid.find("3")[0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = Environment(grid, start, goal, flight_height="high", weather_conditions=weather)
+    fly_through_ticks(env, start, goal, ticks=4, seed=3)
+
+def test_repaired_cost_matches_fresh_astar_on_string_grid():
+    grid, meta = load_map(os.path.join(MAP_DIR, "mapa-real.dmap"))
+    start, goal = tuple(meta["start"]), tuple(meta["delivery_points"]["2"])
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = Environment(grid.to_lists(), start, goal, flight_height="high",
+                          weather_conditions={"wind_intensity": 0.3, "seed": 2})
+    fly_through_ticks(env, start, goal, ticks=3, seed=5)
+
+def test_every_kept_search_is_repaired():
+    grid = generate_map(40, layout="city", seed=5)
+    start, delivery = grid.find("S")[0], grid.find("2")[0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = Environment(grid, start, delivery, flight_height="high",
+                          weather_conditions={"wind_intensity": 0.3, "seed": 4})
+    planner = DStarLite(env)
+    outbound_path, outbound_cost, _ = planner.find_path(start, delivery, float("inf"), "agent0",
+                                                        ignore_battery=True)
+    planner.find_path(delivery, start, float("inf"), "agent0", ignore_battery=True)
+
+    rng = random.Random(7)
+    cells = [(x, y) for y in range(env.rows) for x in range(env.cols) if env.is_passable((x, y))]
+    with contextlib.redirect_stdout(io.StringIO()):
+        planner.weather_tick(delivery, float("inf"),
+                             wind_on=outbound_path[1:-1] + rng.sample(cells, len(cells) // 10))
+
+    # A busca da ida não era a atual no tique, mas também foi reparada
+    outbound = planner.searches[delivery]
+    outbound.move_to(start)
+    outbound.compute_shortest_path()
+    assert outbound.cost() > outbound_cost
+    assert outbound.cost() == pytest.approx(fresh_cost(env, start, delivery))
+
+    # E uma busca nova, do zero, chega ao mesmo custo
+    search = DStarLiteSearch(env, delivery)
+    search.move_to(start)
+    search.compute_shortest_path()
+    assert search.cost() == pytest.approx(outbound.cost())
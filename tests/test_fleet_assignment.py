@@ -0,0 +1,195 @@
+import contextlib
+import io
+import itertools
+import os
+import random
+import time
+
+import numpy as np
+import pytest
+
+from algorithms.fleet_assignment import FleetAssignment, hungarian
+from config import settings
+from Environment.adjacency import clear_graph_cache
+from Environment.distance_tables import clear_table_cache, shortest_path_tree, sweep_costs
+from Environment.environment import Environment
+from utils.map_generator import generate_map
+
+def brute_force(cost):
+    """Menor custo total atribuindo min(n, m) pares, cada linha e coluna no máximo uma vez"""
+    n, m = cost.shape
+    if n <= m:
+        return min(sum(cost[row, column] for row, column in enumerate(columns))
+                   for columns in itertools.permutations(range(m), n))
+    return min(sum(cost[row, column] for column, row in enumerate(rows))
+               for rows in itertools.permutations(range(n), m))
+
+def assignment_cost(cost, assignment):
+    assigned = [(row, column) for row, column in enumerate(assignment) if column is not None]
+    assert len(assigned) == min(cost.shape)
+    assert len({column for _, column in assigned}) == len(assigned)
+    return sum(cost[row, column] for row, column in assigned)
+
+def test_hungarian_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        n, m = (int(size) for size in rng.integers(1, 6, size=2))
+        cost = rng.integers(0, 20, size=(n, m)).astype(np.float64)
+        assert assignment_cost(cost, hungarian(cost)) == brute_force(cost)
+
+def test_hungarian_avoids_infinite_entries():
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        n, m = (int(size) for size in rng.integers(1, 6, size=2))
+        cost = rng.random((n, m)) * 10
+        cost[rng.random((n, m)) < 0.4] = np.inf
+        best = brute_force(cost)
+        found = assignment_cost(cost, hungarian(cost))
+        if np.isfinite(best):
+            assert np.isclose(found, best)
+        else:
+            assert not np.isfinite(found)
+
+def test_hungarian_rectangular_shapes():
+    cost = np.array([[4.0, 1.0, 3.0], [2.0, 0.0, 5.0]])
+    assert hungarian(cost) == [1, 0]
+    assert hungarian(cost.T) == [1, 0, None]
+    assert hungarian(np.full((2, 2), np.inf)) in ([0, 1], [1, 0])
+
+def city_environment(size, wind_intensity=0.3, drones=3):
+    grid = generate_map(size, layout="city", seed=3)
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = Environment(grid, grid.find("S")[0], grid.find("1")[0], flight_height="high",
+                          weather_conditions={"wind_intensity": wind_intensity, "wind_direction": 90})
+        for drone in range(1, drones):
+            env.add_agent(f"agent{drone}", grid.find("1")[0], grid.find("S")[0])
+    return env
+
+def random_cells(env, count, seed=1):
+    cells = [(x, y) for y in range(env.rows) for x in range(env.cols) if env.is_passable((x, y))]
+    return random.Random(seed).sample(cells, count)
+
+def test_sweep_costs_match_dijkstra():
+    env = city_environment(40)
+    locations = random_cells(env, 12) + [(0, 0)]
+    outgoing = sweep_costs(env.graph, locations, locations)
+    incoming = sweep_costs(env.graph.reverse(), locations, locations).T
+    for row, source in enumerate(locations):
+        tree = shortest_path_tree(env.graph, source, reverse=False)
+        expected = [tree.cost(target) for target in locations]
+        assert outgoing[row].tolist() == expected
+        assert incoming[row].tolist() == expected
+
+def test_assign_hundred_deliveries_cold_under_a_second(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "HEURISTIC_CACHE_DIR", str(tmp_path))
+    env = city_environment(120)
+    deliveries = random_cells(env, 120)
+    clear_table_cache()
+    clear_graph_cache()
+    fleet = FleetAssignment(env)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        trips = fleet.assign(deliveries)
+    elapsed = time.perf_counter() - start
+
+    assigned = [stop for agent_trips in trips.values() for trip in agent_trips for stop in trip]
+    assert sorted(assigned + fleet.unassigned) == sorted(deliveries)
+    assert elapsed < 1.0
+    # As pernas não passam pelo cache de tabelas de heurística
+    assert os.listdir(tmp_path) == []
+
+# S e a entrega 1 separadas por 10 passos, com a base B no meio; 2 só se alcança pelo
+# corredor de baixo, sem recarga, e 3 está cercada
+STATION_LINE = [
+    list("S0000B00001"),
+    list("0XXXXXXXXXX"),
+    list("000000002X3"),
+]
+OPEN_GRID = [list("S000"), list("0000")]
+
+def small_environment(grid, start, battery=100.0):
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = Environment([row.copy() for row in grid], start, start,
+                          weather_conditions={"wind_intensity": 0.0})
+    env.agent_dict["agent0"].update(battery=battery, max_battery=battery)
+    return env
+
+def assert_battery_never_negative(env, agent, path):
+    battery = agent["battery"]
+    for current, neighbor in zip(path, path[1:]):
+        if current == neighbor:
+            if current == agent["home_base"]:
+                battery = agent["max_battery"] # Repouso na base
+            continue
+        battery -= env.calculate_move_cost(current, neighbor, battery)
+        assert battery >= -1e-9
+        if neighbor in env.charging_stations:
+            battery = 100.0
+
+def test_leg_costs_recharge_through_stations():
+    env = small_environment(STATION_LINE, (0, 0), battery=5.0)
+    fleet = FleetAssignment(env)
+    locations = [(0, 0), (10, 0), (8, 2), (10, 2)]
+
+    legs = fleet.leg_costs(locations)
+    # 10 passos (8.0) não cabem na bateria, mas S → B → 1 sim
+    assert legs[0, 1] == pytest.approx(8.0)
+    assert legs[1, 0] == pytest.approx(8.0)
+    assert legs[0, 2] == np.inf and legs[2, 0] == np.inf
+    assert np.all(legs[3, :3] == np.inf) and np.all(legs[:3, 3] == np.inf)
+    assert np.all(np.diag(legs) == 0.0)
+
+    # Com bateria de sobra a perna direta para 2 volta a valer
+    env.agent_dict["agent0"]["max_battery"] = 100.0
+    assert fleet.leg_costs(locations)[0, 2] == pytest.approx(8.0)
+
+def test_plan_trips_detours_home_when_return_is_out_of_reach():
+    env = small_environment(OPEN_GRID, (0, 0), battery=5.0)
+    fleet = FleetAssignment(env)
+    agent = env.agent_dict["agent0"]
+
+    # De (3, 0) dá para ir a (2, 1), mas não para voltar dali: recarrega na base antes
+    plan = fleet.plan_trips("agent0", [[(3, 0), (2, 1)]])
+    path = plan["path"]
+    first, second = path.index((3, 0)), path.index((2, 1))
+    assert (0, 0) in path[first:second]
+    assert path[-1] == (0, 0)
+    assert plan["total_cost"] == pytest.approx(4 * 2.4)
+    assert fleet.unassigned == []
+    assert_battery_never_negative(fleet.env, agent, path)
+
+def test_plan_trips_leaves_out_of_range_stops_unassigned():
+    env = small_environment(OPEN_GRID, (0, 0), battery=5.0)
+    fleet = FleetAssignment(env)
+
+    # Ida e volta a (3, 1) custam 6.4 > 5.0 mesmo saindo carregado da base
+    plan = fleet.plan_trips("agent0", [[(1, 1), (3, 1)]])
+    assert fleet.unassigned == [(3, 1)]
+    assert (3, 1) not in plan["path"]
+    assert (1, 1) in plan["path"]
+    assert plan["path"][-1] == (0, 0)
+    assert_battery_never_negative(fleet.env, env.agent_dict["agent0"], plan["path"])
+
+def test_assign_tours_cover_every_delivery_once():
+    grid = [list("S00000"), list("000000"), list("00X000"), list("0X2X00"), list("00X000")]
+    env = small_environment(grid, (0, 0))
+    env.add_agent("agent1", (0, 0))
+    fleet = FleetAssignment(env, max_stops=2)
+    deliveries = [(5, 0), (1, 2), (4, 4), (5, 0), (3, 1), (0, 4), (2, 3)]
+
+    trips = fleet.assign(deliveries)
+    assigned = [stop for agent_trips in trips.values() for trip in agent_trips for stop in trip]
+    assert sorted(assigned + fleet.unassigned) == sorted(deliveries)
+    assert fleet.unassigned == [(2, 3)] # Cercada por X
+    assert all(len(trip) <= 2 for agent_trips in trips.values() for trip in agent_trips)
+    assert all(trips[agent] for agent in trips)
+
+    plans = fleet.plan(deliveries)
+    for agent, plan in plans.items():
+        path = plan["path"]
+        assert path[0] == path[-1] == (0, 0)
+        for trip in plan["trips"]:
+            assert all(stop in path for stop in trip)
+        assert_battery_never_negative(fleet.env, env.agent_dict[agent], path)
+    assert fleet.unassigned == [(2, 3)]
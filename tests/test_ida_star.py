@@ -0,0 +1,42 @@
+import contextlib
+import io
+import os
+
+import pytest
+
+from algorithms.astar import AStar
+from algorithms.ida_star import IDAStar
+from algorithms.registry import planners_for
+from Environment.environment import Environment
+from utils.map_format import load_map
+
+MAP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pal")
+
+def bundled_environment(map_name, goal, compiled=True):
+    grid, meta = load_map(os.path.join(MAP_DIR, f"{map_name}.dmap"))
+    if not compiled:
+        grid = [[grid.cell_type(x, y) for x in range(grid.cols)] for y in range(grid.rows)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Environment(grid, tuple(meta["start"]), meta["delivery_points"][goal], flight_height="high",
+                           weather_conditions={"wind_intensity": 0.3})
+
+@pytest.mark.parametrize("map_name", ["mapa-real", "maputo-map"])
+def test_compiled_default_finishes_far_destination(map_name):
+    env = bundled_environment(map_name, "2")
+    planner = IDAStar(env, time_limit=5.0)
+    assert planner.exact_heuristic
+    with contextlib.redirect_stdout(io.StringIO()):
+        path = planner.search("agent0")
+        astar = AStar(bundled_environment(map_name, "2"))
+        astar.search("agent0")
+    assert path
+    assert planner.total_cost == pytest.approx(astar.total_cost)
+
+def test_ida_star_listed_only_where_it_finishes():
+    assert "ida_star" in planners_for(bundled_environment("mapa-real", "2"))
+    # Grade de listas: sem tabelas exatas, Manhattan só é oferecido em mapas pequenos
+    list_env = bundled_environment("mapa-real", "2", compiled=False)
+    assert not IDAStar(list_env).exact_heuristic
+    assert "ida_star" not in planners_for(list_env)
+    assert "astar" in planners_for(list_env)
+    assert "ida_star" in planners_for(bundled_environment("mapa", "1", compiled=False))
@@ -0,0 +1,55 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+from algorithms.astar import AStar
+from algorithms.jps import JPS
+from Environment.environment import Environment
+from Environment.tiled_map import TiledMap, save_tiled_map
+from utils.map_generator import generate_map
+
+def leg_costs(planner, pairs):
+    costs = []
+    for start, goal in pairs:
+        result = planner.find_path(start, goal, float("inf"), "agent0", ignore_battery=True)
+        costs.append(result[1] if result is not None else None)
+    return costs
+
+def test_jps_follows_weather_ticks():
+    grid = generate_map(60, layout="city", seed=2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = Environment(grid, grid.find("S")[0], grid.find("1")[0], flight_height="high",
+                          weather_conditions={"wind_intensity": 0.3})
+    rng = random.Random(4)
+    cells = [(x, y) for y in range(env.rows) for x in range(env.cols) if env.is_passable((x, y))]
+    pairs = [tuple(rng.sample(cells, 2)) for _ in range(20)]
+    jps = JPS(env)
+    assert leg_costs(jps, pairs) == pytest.approx(leg_costs(AStar(env, reuse_return_tree=False), pairs))
+
+    # O mesmo planejador depois de um tique de clima: o vento novo vale para os saltos
+    with contextlib.redirect_stdout(io.StringIO()):
+        env.update_weather_cells(wind_on=rng.sample(cells, len(cells) // 5),
+                                 wind_off=env.find_wind_cells()[::2])
+    assert leg_costs(jps, pairs) == pytest.approx(leg_costs(AStar(env, reuse_return_tree=False), pairs))
+
+def test_jps_reads_only_the_tiles_it_crosses(tmp_path):
+    grid = generate_map(256, layout="city", seed=2)
+    path = str(tmp_path / "city.tmap")
+    save_tiled_map(path, grid.codes, grid.vocabulary, tile_size=32)
+    tiled = TiledMap(path)
+    start = tiled.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = Environment(tiled, start, start, flight_height="high",
+                          weather_conditions={"wind_intensity": 0.3})
+    goal = next((x, y) for x, y in [(start[0] + dx, start[1] + dy) for dx in range(-20, 21) for dy in range(-20, 21)]
+                if 0 <= x < env.cols and 0 <= y < env.rows and env.is_passable((x, y))
+                and abs(x - start[0]) + abs(y - start[1]) >= 20)
+
+    jps = JPS(env)
+    result = jps.find_path(start, goal, float("inf"), "agent0", ignore_battery=True)
+    assert result is not None
+    assert env.tiled.tiles_loaded < tiled.tiles_x * tiled.tiles_y
+    assert result[1] == pytest.approx(AStar(env).find_path(start, goal, float("inf"), "agent0",
+                                                           ignore_battery=True)[1])
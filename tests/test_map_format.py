@@ -0,0 +1,53 @@
+import os
+
+import numpy as np
+import pytest
+
+from utils.map_format import MAP_ALIGNMENT, load_map, read_header, save_map
+from utils.map_generator import generate_map
+
+MAP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pal")
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_generated_map_round_trip(tmp_path, mmap):
+    grid = generate_map(37, layout="city", seed=4)
+    path = str(tmp_path / "gerado.dmap")
+    save_map(path, grid, source="gerado")
+
+    loaded, meta = load_map(path, mmap=mmap)
+    assert np.array_equal(loaded.codes, grid.codes)
+    assert loaded.vocabulary == grid.vocabulary
+    assert loaded.digest() == grid.digest()
+    assert (meta["rows"], meta["cols"]) == (37, 37)
+    assert meta["source"] == "gerado"
+    assert tuple(meta["start"]) == grid.find("S")[0]
+    for label, position in meta["delivery_points"].items():
+        assert tuple(position) == grid.find(label)[0]
+    assert [tuple(p) for p in meta["charging_stations"]] == grid.find("B")
+    assert np.array_equal(loaded.blocked, grid.blocked)
+    assert np.array_equal(loaded.wind, grid.wind)
+
+def test_bundled_map_survives_resave(tmp_path):
+    grid, meta = load_map(os.path.join(MAP_DIR, "mapa-real.dmap"))
+    path = str(tmp_path / "copia.dmap")
+    save_map(path, grid, source=meta["source"])
+
+    loaded, copied_meta = load_map(path)
+    assert copied_meta == meta
+    assert np.array_equal(loaded.codes, grid.codes)
+    assert loaded.to_lists() == grid.to_lists()
+
+def test_codes_start_aligned_after_header(tmp_path):
+    grid = generate_map(20, layout="city", seed=1)
+    path = str(tmp_path / "alinhado.dmap")
+    save_map(path, grid)
+
+    _, offset = read_header(path)
+    assert offset % MAP_ALIGNMENT == 0
+    assert os.path.getsize(path) == offset + grid.rows * grid.cols
+
+def test_rejects_file_without_magic(tmp_path):
+    path = tmp_path / "ruim.dmap"
+    path.write_bytes(b"NOTAMAP!" + b"\0" * 32)
+    with pytest.raises(ValueError):
+        load_map(str(path))
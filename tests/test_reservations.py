@@ -0,0 +1,81 @@
+import random
+
+from Environment.reservations import ReservationTable
+
+def test_interval_across_bucket_boundaries():
+    table = ReservationTable(bucket_size=4)
+    table.reserve((1, 1), 3, 9, owner="a")
+    assert [t for t in range(12) if table.is_reserved((1, 1), t)] == list(range(3, 10))
+    assert table.is_free((1, 1), 0, 2)
+    assert not table.is_free((1, 1), 0, 3)
+    assert not table.is_free((1, 1), 7, 8)
+    assert table.is_free((1, 1), 10, 13)
+    assert table.last_time == 9
+
+def test_owner_is_ignored_only_for_itself():
+    table = ReservationTable(bucket_size=4)
+    table.reserve((0, 0), 5, owner="a")
+    table.reserve((2, 0), 5)
+    assert not table.is_reserved((0, 0), 5, ignore="a")
+    assert table.is_reserved((0, 0), 5, ignore="b")
+    # Reservas sem dono continuam valendo com o ignore padrão
+    assert table.is_reserved((2, 0), 5)
+
+def test_safe_cells_are_never_reserved():
+    table = ReservationTable(safe_cells={(0, 0)}, bucket_size=4)
+    table.reserve((0, 0), 0, 20)
+    assert len(table) == 0
+    assert table.is_free((0, 0), 0, 20)
+
+def test_path_waits_and_swaps():
+    table = ReservationTable(bucket_size=4)
+    table.reserve_path([(0, 0), (1, 0), (1, 0), (1, 0), (2, 0)], owner="a")
+    # Três intervalos (a espera em (1, 0) é um só) e dois movimentos
+    assert len(table) == 5
+    assert table.is_reserved((1, 0), 3) and not table.is_reserved((1, 0), 4)
+    assert table.crosses((1, 0), (0, 0), 1)
+    assert not table.is_move_free((2, 0), (1, 0), 4)
+    assert table.is_move_free((2, 0), (1, 0), 4, ignore="a")
+    assert not table.is_path_free([(3, 0), (2, 0)], start_time=3)
+    assert table.is_path_free([(3, 0), (2, 0)], start_time=5)
+
+def test_advance_drops_old_buckets_only():
+    table = ReservationTable(bucket_size=4)
+    table.reserve((0, 0), 1, owner="a")
+    table.reserve((1, 1), 3, 9, owner="b")
+    table.reserve_move((0, 0), (1, 0), 2, owner="a")
+    table.reserve_move((1, 0), (2, 0), 8, owner="a")
+    table.advance(8)
+    assert not table.is_reserved((0, 0), 1)
+    assert not table.crosses((1, 0), (0, 0), 2)
+    assert table.crosses((2, 0), (1, 0), 8)
+    # O intervalo que atravessa o limite do balde continua valendo no balde atual
+    assert table.is_reserved((1, 1), 8) and table.is_reserved((1, 1), 9)
+    assert not table.is_free((1, 1), 8, 12)
+    # Reservas que começam no passado são guardadas só a partir do balde atual
+    table.reserve((5, 5), 0, 9)
+    assert table.is_reserved((5, 5), 9)
+    assert not any(key[1] < 2 for key in table._slots)
+
+def test_matches_naive_model():
+    rng = random.Random(3)
+    table = ReservationTable(bucket_size=4)
+    occupied = {}
+    for _ in range(300):
+        cell = (rng.randrange(4), rng.randrange(4))
+        start = rng.randrange(40)
+        end = start + rng.randrange(6)
+        owner = rng.choice(["a", "b", None])
+        table.reserve(cell, start, end, owner)
+        for t in range(start, end + 1):
+            occupied.setdefault((cell, t), []).append(owner)
+    for _ in range(500):
+        cell = (rng.randrange(4), rng.randrange(4))
+        t = rng.randrange(50)
+        ignore = rng.choice(["a", "b", None])
+        expected = any(ignore is None or owner != ignore for owner in occupied.get((cell, t), ()))
+        assert table.is_reserved(cell, t, ignore) == expected
+        end = t + rng.randrange(5)
+        expected_free = not any(ignore is None or owner != ignore
+                                for step in range(t, end + 1) for owner in occupied.get((cell, step), ()))
+        assert table.is_free(cell, t, end, ignore) == expected_free
@@ -0,0 +1,51 @@
+import contextlib
+import io
+import os
+
+import numpy as np
+
+from algorithms.astar import AStar
+from Environment.distance_tables import LazyDistanceTable, clear_table_cache, shortest_path_tree
+from Environment.environment import Environment
+from utils.map_format import load_map
+
+MAP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pal")
+
+def real_map_environment(goal="1"):
+    grid, meta = load_map(os.path.join(MAP_DIR, "mapa-real.dmap"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Environment(grid, tuple(meta["start"]), meta["delivery_points"][goal], flight_height="high",
+                           weather_conditions={"wind_intensity": 0.3})
+
+def test_lazy_tree_matches_full_tree():
+    env = real_map_environment()
+    home = env.home_base
+    full = shortest_path_tree(env.graph, home)
+    lazy = LazyDistanceTable(env.graph, home)
+
+    goal = env.agent_dict["agent0"]["goal"]
+    settled = lazy.expand_to(goal)
+    assert 0 < settled < env.rows * env.cols
+    assert lazy.expand_to(goal) == 0
+    assert lazy.cost(goal) == full.cost(goal)
+    assert lazy.path(goal) == full.path(goal)
+
+    lazy.expand_to()
+    table = lazy.full_table()
+    assert np.array_equal(table.dist, full.dist)
+    assert lazy.settled == np.isfinite(full.dist).sum()
+
+def test_return_leg_counts_only_new_settles():
+    clear_table_cache()
+    env = real_map_environment()
+    planner = AStar(env)
+    goal = env.agent_dict["agent0"]["goal"]
+    home = env.home_base
+    path, cost, nodes = planner.find_return_path(goal, home, 100.0, "agent0")
+
+    tree = env.lazy_distance_table(home)
+    assert nodes == tree.settled
+    assert nodes < np.isfinite(shortest_path_tree(env.graph, home).dist).sum()
+    assert cost == shortest_path_tree(env.graph, home).cost(goal)
+    # A mesma volta de novo não assenta nada: a árvore em cache já chegou à entrega
+    assert planner.find_return_path(goal, home, 100.0, "agent0")[2] == 0
@@ -0,0 +1,114 @@
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from Environment.environment import Environment
+from Environment.tiled_map import TiledMap, save_tiled_map
+from utils.map_generator import generate_map
+
+SIZE = 45
+TILE_SIZE = 16
+
+@pytest.fixture
+def maps(tmp_path):
+    # 45 não é múltiplo de 16: os blocos da borda são completados
+    grid = generate_map(SIZE, layout="city", seed=6).copy()
+    free = np.flatnonzero(grid.codes == grid.vocabulary.index("0"))
+    grid.set_cells(np.random.default_rng(6).choice(free, 120, replace=False), "W")
+    path = str(tmp_path / "gerado.tmap")
+    save_tiled_map(path, grid.codes, grid.vocabulary, tile_size=TILE_SIZE)
+    return grid, TiledMap(path)
+
+def cell_masks(view, rows, cols):
+    passable = np.array([[view.passable(x, y) for x in range(cols)] for y in range(rows)])
+    wind = np.array([[view.wind(x, y) for x in range(cols)] for y in range(rows)])
+    return passable, wind
+
+@pytest.mark.parametrize("flight_height", ["high", "low"])
+def test_view_matches_dense_masks(maps, flight_height):
+    grid, tiled_map = maps
+    view = tiled_map.view(flight_height, "normal")
+
+    passable, wind = cell_masks(view, SIZE, SIZE)
+    assert np.array_equal(passable, grid.passable_mask(flight_height, "normal"))
+    assert np.array_equal(wind, grid.wind)
+
+    window_passable, window_wind = view.window(0, 0, SIZE, SIZE)
+    assert np.array_equal(window_passable, passable)
+    assert np.array_equal(window_wind, wind)
+    # Retângulo que cruza fronteiras de bloco
+    window_passable, window_wind = view.window(10, 7, 40, 33)
+    assert np.array_equal(window_passable, passable[7:33, 10:40])
+    assert np.array_equal(window_wind, wind[7:33, 10:40])
+
+def test_header_index_matches_dense_grid(maps):
+    grid, tiled_map = maps
+    assert tiled_map.start() == grid.find("S")[0]
+    for label, position in tiled_map.delivery_points().items():
+        assert position == grid.find(label)[0]
+    assert sorted(tiled_map.charging_stations()) == sorted(grid.find("B"))
+    assert all(tiled_map.cell_type(x, y) == grid.cell_type(x, y)
+               for y in range(SIZE) for x in range(SIZE))
+
+def test_tiled_environment_matches_compiled_environment(maps):
+    grid, tiled_map = maps
+    start, goal = grid.find("S")[0], grid.find("1")[0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        dense = Environment(grid, start, goal, flight_height="high")
+        tiled = Environment(tiled_map, start, goal, flight_height="high")
+
+    for y in range(SIZE):
+        for x in range(SIZE):
+            state = (x, y)
+            assert tiled.is_passable(state) == dense.is_passable(state)
+            if not dense.is_passable(state):
+                continue
+            neighbors = dense.get_neighbors(state)
+            assert tiled.get_neighbors(state) == neighbors
+            assert [tiled.calculate_move_cost(state, n, 100.0) for n in neighbors] == \
+                   [dense.calculate_move_cost(state, n, 100.0) for n in neighbors]
+    assert set(tiled.charging_stations) == set(dense.charging_stations)
+
+def test_tiles_are_loaded_on_demand(maps):
+    _, tiled_map = maps
+    view = tiled_map.view("high", "normal")
+    assert view.tiles_loaded == 0
+    view.passable(0, 0)
+    view.wind(5, 5)
+    assert view.tiles_loaded == 1
+    view.passable(SIZE - 1, SIZE - 1)
+    assert view.tiles_loaded == 2
+
+def test_random_wind_survives_eviction(maps):
+    _, tiled_map = maps
+    layers = [(0.3, None)]
+    cached = tiled_map.view("high", "normal", layers, weather_seed=2)
+    evicting = tiled_map.view("high", "normal", layers, weather_seed=2, cache_size=1)
+
+    _, wind = cached.window(0, 0, SIZE, SIZE)
+    assert wind.any()
+    assert np.array_equal(cell_masks(evicting, SIZE, SIZE)[1], wind)
+    assert evicting.tiles_loaded > tiled_map.tiles_x * tiled_map.tiles_y
+    assert sorted(cached.wind_cells()) == sorted(zip(*np.nonzero(wind.T)))
+
+def test_wind_changes_apply_to_cached_and_unloaded_tiles(maps):
+    grid, tiled_map = maps
+    view = tiled_map.view("high", "normal", cache_size=1)
+    free = [(x, y) for y in range(SIZE) for x in range(SIZE) if not grid.wind[y, x]]
+    near, far = free[0], free[-1]
+    view.wind(*near)  # bloco de near em cache
+
+    view.set_wind([(near, True), (far, True)])
+    assert view.weather_version == 1
+    assert view.wind(*near) and view.wind(*far)
+    # far expulsou o bloco de near: a mudança volta ao recarregar
+    assert view.wind(*near)
+    assert view.cell_type(*near) == "W"
+
+    view.set_wind([(near, False)])
+    _, wind = view.window(0, 0, SIZE, SIZE)
+    expected = grid.wind.copy()
+    expected[far[1], far[0]] = True
+    assert np.array_equal(wind, expected)
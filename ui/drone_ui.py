@@ -1,17 +1,23 @@
 import random
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.patches as patches
+from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle
 
-from algorithms.astar import AStar
-from algorithms.ucs import UCS
-from algorithms.ids import IDS
 from Environment.environment import Environment
-from models.drone import Drone, DroneConfig
-from ui.multi_drone_animation import MultiDroneAnimation
-from utils.statistics import StatisticsCalculator
+
+# Planejadores, animação (matplotlib.animation/pyplot), pool de processos e estatísticas
+# são importados no primeiro uso: a janela abre sem carregá-los
+
+# Algoritmos do botão "Comparar Todos Algoritmos": nome exibido → chave no registro
+COMPARED_ALGORITHMS = {
+    "A*": "astar",
+    "Custo Uniforme": "ucs",
+    "Profundidade Iterativa": "ids",
+}
+ROUTE_POLL_INTERVAL_MS = 100
 
 class DroneControlUI:
     def __init__(self, grid):
@@ -20,6 +26,8 @@ class DroneControlUI:
         self.destinations = {}
         self.current_height = "low"
         self.power_mode = "normal"
+        self.executor = None
+        self.pending_routes = {}
         self.find_positions()
         
     def find_positions(self):
@@ -114,7 +122,9 @@ class DroneControlUI:
     
     def setup_map_display(self, parent):
         """Configura a exibição do mapa"""
-        self.fig, self.ax = plt.subplots(figsize=(10, 8))
+        # Figure embutida direto no Tk: pyplot só é carregado pela animação
+        self.fig = Figure(figsize=(10, 8))
+        self.ax = self.fig.add_subplot()
         self.canvas = FigureCanvasTkAgg(self.fig, parent)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         self.draw_map()
@@ -144,7 +154,7 @@ class DroneControlUI:
                     else:
                         color = 'lightblue'
                 
-                self.ax.add_patch(plt.Rectangle((x-0.5, y-0.5), 1, 1, 
+                self.ax.add_patch(Rectangle((x-0.5, y-0.5), 1, 1, 
                                               facecolor=color, edgecolor='black', linewidth=0.5))
                 
                 if cell not in ["", "0"]:
@@ -213,13 +223,16 @@ ALGORITMOS DISPONÍVEIS:
     
     def calculate_astar_route(self):
         """Calcula rota apenas com A*"""
+        from algorithms.astar import AStar
+        
         try:
             selected_dest = self.dest_var.get()
             goal = self.destinations[selected_dest]
             
             env = Environment(self.grid, self.start, goal, 
                             flight_height=self.current_height,
-                            power_mode=self.power_mode)
+                            power_mode=self.power_mode,
+                            compiled=True)
             
             planner = AStar(env)
             path = planner.search("agent0")
@@ -237,7 +250,14 @@ ALGORITMOS DISPONÍVEIS:
             messagebox.showerror("Erro", f"Erro no A*: {str(e)}")
     
     def calculate_all_routes(self):
-        """Calcula rotas com todos os algoritmos simultaneamente"""
+        """Calcula rotas com todos os algoritmos em paralelo (pool de processos)"""
+        from algorithms.registry import planners_for
+        from utils.parallel import create_executor, submit_planners
+        
+        if self.pending_routes:
+            messagebox.showwarning("Aviso", "Os algoritmos ainda estão calculando as rotas!")
+            return
+        
         try:
             selected_dest = self.dest_var.get()
             goal = self.destinations[selected_dest]
@@ -253,44 +273,73 @@ ALGORITMOS DISPONÍVEIS:
             env = Environment(self.grid, self.start, goal, 
                             flight_height=self.current_height,
                             power_mode=self.power_mode,
-                            weather_conditions=weather_conditions)
-            
-            # Executar TODOS os algoritmos
-            algorithms = {
-                "A*": AStar(env),
-                "Custo Uniforme": UCS(env), 
-                "Profundidade Iterativa": IDS(env)
-            }
+                            weather_conditions=weather_conditions,
+                            compiled=True)
             
             self.all_paths = {}
             self.all_schedules = {}
             
-            print("=== EXECUTANDO TODOS OS ALGORITMOS ===")
-            for algo_name, planner in algorithms.items():
-                print(f"\n🎯 Executando {algo_name}...")
-                path = planner.search("agent0")
-                self.all_paths[algo_name] = path
-                self.all_schedules[algo_name] = self.path_to_schedule(path)
-                
-                if path:
-                    print(f"✅ {algo_name}: {len(path)} passos na missão completa")
-                else:
-                    print(f"❌ {algo_name}: Falhou na missão")
+            # Cada processo recebe uma cópia do ambiente: o tempo total é o do mais lento
+            if self.executor is None:
+                self.executor = create_executor(max_workers=len(COMPARED_ALGORITHMS))
             
-            # 🔥 CORREÇÃO: Mostrar animação diretamente após cálculo
-            self.draw_all_paths()
-            self.show_comparison_stats()
+            print("=== EXECUTANDO TODOS OS ALGORITMOS (EM PARALELO) ===")
+            # Só os algoritmos que terminam neste mapa (ver MissionPlanner.supports)
+            futures = submit_planners(self.executor, env, planners_for(env, COMPARED_ALGORITHMS.values()))
+            names = {key: algo_name for algo_name, key in COMPARED_ALGORITHMS.items()}
+            self.pending_routes = {future: names[key] for future, key in futures.items()}
+            self.routes_start_time = time.time()
             
-            # Mostrar animação automaticamente
-            self.show_advanced_animation()
+            self.info_text.delete(1.0, tk.END)
+            self.info_text.insert(tk.END, "⏳ Calculando rotas em paralelo...\n\n")
+            self.root.after(ROUTE_POLL_INTERVAL_MS, self.poll_route_results)
             
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao calcular rotas: {str(e)}")
             import traceback
             traceback.print_exc()
+    
+    def poll_route_results(self):
+        """Recolhe os planejadores que terminaram sem bloquear a janela"""
+        for future in [future for future in self.pending_routes if future.done()]:
+            algo_name = self.pending_routes.pop(future)
+            try:
+                path = future.result()["path"]
+            except Exception as e:
+                print(f"❌ {algo_name}: Erro no processo de trabalho: {e}")
+                path = []
+            
+            # Ordem de exibição fixa, independente de quem termina primeiro
+            self.all_paths[algo_name] = path
+            self.all_schedules[algo_name] = self.path_to_schedule(path)
+            
+            if path:
+                print(f"✅ {algo_name}: {len(path)} passos na missão completa")
+                self.info_text.insert(tk.END, f"✅ {algo_name}: {len(path)} passos\n")
+            else:
+                print(f"❌ {algo_name}: Falhou na missão")
+                self.info_text.insert(tk.END, f"❌ {algo_name}: sem rota\n")
+            self.draw_all_paths()
+        
+        if self.pending_routes:
+            self.root.after(ROUTE_POLL_INTERVAL_MS, self.poll_route_results)
+            return
+        
+        print(f"⏱️  Todos os algoritmos concluídos em {time.time() - self.routes_start_time:.2f}s")
+        self.all_paths = {name: self.all_paths[name] for name in COMPARED_ALGORITHMS}
+        self.all_schedules = {name: self.all_schedules[name] for name in COMPARED_ALGORITHMS}
+        
+        # 🔥 CORREÇÃO: Mostrar animação diretamente após cálculo
+        self.draw_all_paths()
+        self.show_comparison_stats()
+        
+        # Mostrar animação automaticamente
+        self.show_advanced_animation()
         
     def show_advanced_animation(self):
         """Mostra animação com sistema de bateria - CORRIGIDO"""
+        from ui.multi_drone_animation import MultiDroneAnimation
+        
         if hasattr(self, 'all_schedules'):
             try:
                 # Criar environment para a animação (mesmo usado nos cálculos)
@@ -305,7 +354,8 @@ ALGORITMOS DISPONÍVEIS:
                 env = Environment(self.grid, self.start, goal, 
                                 flight_height=self.current_height,
                                 power_mode=self.power_mode,
-                                weather_conditions=weather_conditions)
+                                weather_conditions=weather_conditions,
+                                compiled=True)
                 
                 # 🔥 CORREÇÃO: Passar apenas os argumentos necessários
                 anim = MultiDroneAnimation(
@@ -371,6 +421,8 @@ ALGORITMOS DISPONÍVEIS:
     
     def show_multi_animation(self):
         """Mostra animação com 3 drones"""
+        from ui.multi_drone_animation import MultiDroneAnimation
+        
         if hasattr(self, 'all_schedules'):
             try:
                 # Verificar se há caminhos válidos
@@ -427,6 +479,8 @@ ALGORITMOS DISPONÍVEIS:
     
     def show_detailed_stats(self):
         """Mostra estatísticas detalhadas"""
+        from utils.statistics import StatisticsCalculator
+        
         if hasattr(self, 'all_paths'):
             comparator = StatisticsCalculator(self.all_paths, self.current_height, self.power_mode)
             detailed_stats = comparator.get_detailed_comparison()
@@ -437,4 +491,11 @@ ALGORITMOS DISPONÍVEIS:
     def run(self):
         """Executa a aplicação"""
         self.create_ui()
-        self.root.mainloop()
\ No newline at end of file
+        try:
+            self.root.mainloop()
+        finally:
+            if self.executor is not None:
+                # shutdown(cancel_futures=True) só existe a partir do Python 3.9
+                for future in self.pending_routes:
+                    future.cancel()
+                self.executor.shutdown(wait=False)
\ No newline at end of file
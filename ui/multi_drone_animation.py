@@ -1,7 +1,6 @@
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import matplotlib.patches as patches
-import numpy as np
 
 class MultiDroneAnimation:
     def __init__(self, grid, all_schedules, environment):
@@ -1,12 +1,14 @@
-import pandas as pd
 from typing import List, Tuple, Dict, Optional
 
 class MapReader:
     @staticmethod
     def read_excel_map(file_path: str) -> List[List[str]]:
         """
-        Lê mapa de arquivo Excel e retorna como matriz
+        Lê mapa de arquivo Excel e retorna como matriz.
+        pandas/openpyxl só são importados aqui (prefira mapas .dmap)
         """
+        import pandas as pd
+        
         try:
             df = pd.read_excel(file_path, header=None, engine="openpyxl")
             return df.astype(str).values.tolist()
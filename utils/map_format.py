@@ -0,0 +1,140 @@
+"""
+Formato binário de mapas (.dmap).
+
+    python -m utils.map_format pal/maputo-map.xlsx            # gera pal/maputo-map.dmap
+    python -m utils.map_format --tiled cidade.dmap            # gera cidade.tmap (em blocos)
+
+Layout do arquivo:
+    8 bytes   assinatura MAP_MAGIC
+    4 bytes   tamanho do cabeçalho JSON (uint32 little-endian)
+    N bytes   cabeçalho JSON: dimensões, vocabulário de células, partida,
+              pontos de entrega, bases de carregamento e origem
+    ...       preenchimento até múltiplo de MAP_ALIGNMENT
+    rows*cols códigos de célula uint8, linha a linha
+
+Os códigos são abertos com np.memmap: carregar um mapa não lê nem converte
+células uma a uma, e dispensa pandas/openpyxl.
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+
+import numpy as np
+
+from Environment.compiled_grid import CompiledGrid
+
+MAP_MAGIC = b"DRNMAP01"
+MAP_EXTENSION = ".dmap"
+MAP_ALIGNMENT = 64
+_LENGTH = struct.Struct("<I")
+
+def build_metadata(compiled, source=None):
+    """Pontos de interesse do mapa, para consulta sem varrer as células"""
+    start = compiled.find("S")
+    return {
+        "rows": compiled.rows,
+        "cols": compiled.cols,
+        "vocabulary": compiled.vocabulary,
+        "start": list(start[0]) if start else None,
+        "delivery_points": {label: list(positions[0])
+                            for label in ["1", "2", "3", "4"]
+                            for positions in [compiled.find(label)] if positions},
+        "charging_stations": [list(position) for position in compiled.find("B")],
+        "source": source,
+    }
+
+def save_map(file_path, compiled, source=None):
+    """Grava o CompiledGrid no formato binário (escrita atômica)"""
+    header = json.dumps(build_metadata(compiled, source), ensure_ascii=False).encode("utf-8")
+    prefix_size = len(MAP_MAGIC) + _LENGTH.size + len(header)
+    padding = -prefix_size % MAP_ALIGNMENT
+
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(MAP_MAGIC)
+        handle.write(_LENGTH.pack(len(header)))
+        handle.write(header)
+        handle.write(b"\0" * padding)
+        handle.write(np.ascontiguousarray(compiled.codes, dtype=np.uint8).tobytes())
+    os.replace(tmp_path, file_path)
+
+def read_header(file_path):
+    """Cabeçalho do mapa e deslocamento dos códigos no arquivo"""
+    with open(file_path, "rb") as handle:
+        magic = handle.read(len(MAP_MAGIC))
+        if magic != MAP_MAGIC:
+            raise ValueError(f"{file_path} não é um mapa {MAP_EXTENSION} (assinatura {magic!r})")
+        (length,) = _LENGTH.unpack(handle.read(_LENGTH.size))
+        metadata = json.loads(handle.read(length).decode("utf-8"))
+
+    prefix_size = len(MAP_MAGIC) + _LENGTH.size + length
+    return metadata, prefix_size + (-prefix_size % MAP_ALIGNMENT)
+
+def load_map(file_path, mmap=True):
+    """
+    Abre um mapa .dmap; retorna (CompiledGrid, metadados).
+    Com mmap=True os códigos ficam mapeados em memória (somente leitura).
+    """
+    metadata, offset = read_header(file_path)
+    shape = (metadata["rows"], metadata["cols"])
+    if mmap:
+        codes = np.memmap(file_path, dtype=np.uint8, mode="r", offset=offset, shape=shape)
+    else:
+        with open(file_path, "rb") as handle:
+            handle.seek(offset)
+            codes = np.fromfile(handle, dtype=np.uint8, count=shape[0] * shape[1]).reshape(shape)
+    return CompiledGrid(codes, metadata["vocabulary"]), metadata
+
+def convert_excel_map(excel_path, output_path=None):
+    """Conversão única de um mapa .xlsx (exige pandas e openpyxl)"""
+    from utils.file_reader import MapReader
+
+    output_path = output_path or os.path.splitext(excel_path)[0] + MAP_EXTENSION
+    compiled = CompiledGrid.from_grid(MapReader.read_excel_map(excel_path))
+    save_map(output_path, compiled, source=os.path.basename(excel_path))
+    return output_path
+
+def convert_to_tiled(map_path, output_path=None, tile_size=None):
+    """Converte um .dmap (ou .xlsx) para o formato em blocos, faixa a faixa"""
+    from Environment.tiled_map import TILED_EXTENSION, save_tiled_map
+
+    if not map_path.lower().endswith(MAP_EXTENSION):
+        map_path = convert_excel_map(map_path)
+    output_path = output_path or os.path.splitext(map_path)[0] + TILED_EXTENSION
+    # Só o mapeamento dos códigos: um CompiledGrid calcularia máscaras do mapa inteiro
+    metadata, offset = read_header(map_path)
+    codes = np.memmap(map_path, dtype=np.uint8, mode="r", offset=offset,
+                      shape=(metadata["rows"], metadata["cols"]))
+    return save_tiled_map(output_path, codes, metadata["vocabulary"], tile_size,
+                          source=os.path.basename(map_path))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=f"Converte mapas .xlsx para o formato {MAP_EXTENSION}")
+    parser.add_argument("maps", nargs="+", help="Arquivos .xlsx (ou .dmap com --tiled)")
+    parser.add_argument("-o", "--output", help="Arquivo de saída (só com um mapa de entrada)")
+    parser.add_argument("--tiled", action="store_true",
+                        help="Gera o formato em blocos (.tmap) para mapas muito grandes")
+    parser.add_argument("--tile-size", type=int, help="Lado dos blocos (padrão: settings.TILE_SIZE)")
+    args = parser.parse_args(argv)
+    if args.output and len(args.maps) > 1:
+        parser.error("--output só pode ser usado com um único mapa")
+
+    for input_path in args.maps:
+        if args.tiled:
+            from Environment.tiled_map import TiledMap
+            output_path = convert_to_tiled(input_path, args.output, args.tile_size)
+            tiled = TiledMap(output_path)
+            print(f"✅ {input_path} → {output_path} ({tiled.cols}x{tiled.rows}, "
+                  f"blocos de {tiled.tile_size}, {tiled.metadata['charging_count']} bases)")
+            continue
+
+        output_path = convert_excel_map(input_path, args.output)
+        metadata, _ = read_header(output_path)
+        print(f"✅ {input_path} → {output_path} ({metadata['cols']}x{metadata['rows']}, "
+              f"{len(metadata['delivery_points'])} entregas, {len(metadata['charging_stations'])} bases)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import numpy as np
+
+from Environment.compiled_grid import CELL_CODES, CompiledGrid
+
+FREE = CELL_CODES["0"]
+BUILDING = CELL_CODES["X"]
+TALL_BUILDING = CELL_CODES["A"]
+CHARGING = CELL_CODES["B"]
+
+def generate_map(rows, cols=None, layout="city", seed=None, charging_spacing=16, **options):
+    """
+    Gera um mapa sintético reproduzível (mesma semente → mesmo mapa) direto como
+    CompiledGrid, no vocabulário de células usual: 0, X, A, B, S e 1–4.
+    Layouts: "city" (quarteirões e ruas), "random" (obstáculos espalhados)
+    e "corridor" (faixas livres separadas por paredes com portas).
+    S e os destinos ficam na malha principal de cada layout, sempre conectados entre si.
+    Todo o mapa é montado com operações vetorizadas: milhões de células em segundos.
+    """
+    cols = cols or rows
+    if layout not in LAYOUTS:
+        raise ValueError(f"Layout desconhecido: {layout} (disponíveis: {', '.join(LAYOUTS)})")
+    if rows < 4 or cols < 4:
+        raise ValueError("O mapa precisa ter pelo menos 4x4 células")
+
+    rng = np.random.default_rng(seed)
+    codes, backbone = LAYOUTS[layout](rng, rows, cols, **options)
+    place_charging_stations(codes, charging_spacing)
+    place_points_of_interest(codes, backbone)
+    return CompiledGrid(codes, list(CELL_CODES))
+
+def city_layout(rng, rows, cols, block_size=6, street_width=2, tall_ratio=0.3, park_ratio=0.1):
+    """Quarteirões de prédios (X, ou A sobrevoável) separados por ruas; alguns viram praças"""
+    period = block_size + street_width
+    ys = np.arange(rows)[:, None]
+    xs = np.arange(cols)[None, :]
+    street = (ys % period < street_width) | (xs % period < street_width)
+
+    blocks_per_row = cols // period + 1
+    block_ids = (ys // period) * blocks_per_row + xs // period
+    num_blocks = (rows // period + 1) * blocks_per_row
+    building_ratio = 1.0 - tall_ratio - park_ratio
+    block_types = rng.choice(np.array([BUILDING, TALL_BUILDING, FREE], dtype=np.uint8),
+                             size=num_blocks, p=[building_ratio, tall_ratio, park_ratio])
+
+    codes = np.where(street, np.uint8(FREE), block_types[block_ids]).astype(np.uint8)
+    return codes, street
+
+def random_layout(rng, rows, cols, obstacle_density=0.2, tall_ratio=0.3):
+    """Obstáculos espalhados ao acaso; a borda fica livre para garantir a conexão"""
+    draw = rng.random((rows, cols))
+    codes = np.full((rows, cols), FREE, dtype=np.uint8)
+    codes[draw < obstacle_density] = BUILDING
+    codes[draw < obstacle_density * tall_ratio] = TALL_BUILDING
+
+    border = np.zeros((rows, cols), dtype=bool)
+    border[[0, -1], :] = True
+    border[:, [0, -1]] = True
+    codes[border] = FREE
+    return codes, border
+
+def corridor_layout(rng, rows, cols, corridor_spacing=8, door_count=None):
+    """Faixas horizontais livres separadas por paredes X, cada parede com algumas portas"""
+    door_count = door_count or max(1, cols // 32)
+    codes = np.full((rows, cols), FREE, dtype=np.uint8)
+
+    wall_rows = np.arange(corridor_spacing - 1, rows - 1, corridor_spacing)
+    codes[wall_rows, :] = BUILDING
+    doors = rng.integers(0, cols, size=(len(wall_rows), door_count))
+    codes[wall_rows[:, None], doors] = FREE
+
+    backbone = np.ones((rows, cols), dtype=bool)
+    backbone[wall_rows, :] = False
+    return codes, backbone
+
+LAYOUTS = {
+    "city": city_layout,
+    "random": random_layout,
+    "corridor": corridor_layout,
+}
+
+def place_charging_stations(codes, spacing):
+    """Bases B em malha regular, nos pontos da malha que caíram em células livres"""
+    lattice = np.zeros(codes.shape, dtype=bool)
+    lattice[spacing // 2::spacing, spacing // 2::spacing] = True
+    codes[lattice & (codes == FREE)] = CHARGING
+
+def place_points_of_interest(codes, backbone):
+    """S no canto superior esquerdo; 1–4 nos outros cantos e no meio da borda inferior"""
+    rows, cols = codes.shape
+    anchors = {
+        "S": (0, 0),
+        "1": (cols - 1, rows - 1),
+        "2": (cols - 1, 0),
+        "3": (0, rows - 1),
+        "4": (cols // 2, rows - 1),
+    }
+    ys, xs = np.nonzero(backbone)
+    for cell, (ax, ay) in anchors.items():
+        nearest = np.argmin(np.abs(xs - ax) + np.abs(ys - ay))
+        codes[ys[nearest], xs[nearest]] = CELL_CODES[cell]
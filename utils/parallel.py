@@ -0,0 +1,42 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithms.registry import create_planner
+
+def create_executor(max_workers=None, initializer=None, initargs=()):
+    """
+    Pool de processos para executar planejadores em paralelo.
+    Usa 'spawn' em todas as plataformas: um fork do processo da interface
+    copiaria o estado do Tk para os filhos.
+    initializer(*initargs) roda uma vez por processo (p.ex. para receber o ambiente uma só vez).
+    """
+    return ProcessPoolExecutor(max_workers=max_workers,
+                               mp_context=multiprocessing.get_context("spawn"),
+                               initializer=initializer, initargs=initargs)
+
+def run_planner(planner_key, env, agent_name="agent0", options=None):
+    """
+    Executa um planejador num processo de trabalho.
+    O ambiente chega como cópia (pickle), então a bateria gravada no agent_dict
+    por uma missão não afeta os outros planejadores.
+    """
+    planner = create_planner(planner_key, env, **(options or {}))
+    start_time = time.time()
+    path = planner.search(agent_name)
+
+    return {
+        "planner": planner_key,
+        "path": [tuple(position) for position in path],
+        "total_cost": getattr(planner, "total_cost", None),
+        "nodes_explored": getattr(planner, "total_nodes_explored", None),
+        "computation_time": time.time() - start_time,
+    }
+
+def submit_planners(executor, env, planner_keys, agent_name="agent0", options=None):
+    """Submete um planejador por chave; retorna {future: chave}"""
+    options = options or {}
+    return {
+        executor.submit(run_planner, key, env, agent_name, options.get(key)): key
+        for key in planner_keys
+    }
@@ -0,0 +1,183 @@
+import contextlib
+import csv
+import io
+import json
+import logging
+import os
+import random
+import time
+from functools import lru_cache
+
+from algorithms.registry import create_planner, supports_map
+
+# Colunas do arquivo de resultados, na ordem de escrita
+RESULT_FIELDS = [
+    "scenario", "map", "destination", "flight_height", "power_mode", "wind_intensity",
+    "planner", "status", "path_length", "cost", "nodes_explored", "planning_time",
+]
+
+SCENARIO_DEFAULTS = {
+    "flight_height": "low",
+    "power_mode": "normal",
+    "wind_intensity": 0.0,
+}
+
+def load_scenarios(file_path):
+    """
+    Lê cenários de um arquivo .csv (uma linha por cenário) ou .json
+    (lista de objetos, ou {"scenarios": [...]}).
+    Campos: map (.tmap, .dmap ou .xlsx), destination ("1"–"4" ou "x,y"), flight_height, power_mode,
+    wind_intensity e, opcionais, temperature, wind_direction (graus), seed e wind_drift
+    ("dx,dy": vento que se desloca por passo).
+    Caminhos de mapa relativos são resolvidos a partir da pasta do arquivo de cenários.
+    """
+    base_dir = os.path.dirname(os.path.abspath(file_path))
+    if file_path.lower().endswith(".json"):
+        with open(file_path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        rows = data["scenarios"] if isinstance(data, dict) else data
+    else:
+        with open(file_path, newline="", encoding="utf-8") as handle:
+            rows = list(csv.DictReader(handle))
+
+    scenarios = []
+    for index, row in enumerate(rows):
+        row = {key.strip(): value for key, value in row.items() if value not in (None, "")}
+        if "map" not in row or "destination" not in row:
+            raise ValueError(f"Cenário {index}: campos 'map' e 'destination' são obrigatórios")
+
+        scenario = dict(SCENARIO_DEFAULTS, **row)
+        scenario.setdefault("scenario", index)
+        scenario["map"] = os.path.join(base_dir, str(scenario["map"]))
+        scenario["destination"] = str(scenario["destination"]).strip()
+        scenario["wind_intensity"] = float(scenario["wind_intensity"])
+        if "temperature" in scenario:
+            scenario["temperature"] = float(scenario["temperature"])
+        if "wind_direction" in scenario:
+            scenario["wind_direction"] = float(scenario["wind_direction"])
+        if "seed" in scenario:
+            scenario["seed"] = int(scenario["seed"])
+        if "wind_drift" in scenario:
+            # Deslocamento da frente de vento por passo, "dx,dy" (previsão do tempo)
+            scenario["wind_drift"] = tuple(float(value) for value in str(scenario["wind_drift"]).split(","))
+        scenarios.append(scenario)
+    return scenarios
+
+@lru_cache(maxsize=16)
+def load_map(map_path):
+    """
+    Mapa em cache por processo de trabalho: TiledMap para .tmap, CompiledGrid
+    para .dmap, lista de listas de strings para .xlsx
+    """
+    from Environment.tiled_map import TILED_EXTENSION
+    from utils.map_format import MAP_EXTENSION
+    if map_path.lower().endswith(TILED_EXTENSION):
+        from Environment.tiled_map import TiledMap
+        return TiledMap(map_path)
+    if map_path.lower().endswith(MAP_EXTENSION):
+        from utils.map_format import load_map as load_binary_map
+        return load_binary_map(map_path)[0]
+
+    from utils.file_reader import MapReader
+    return MapReader.read_excel_map(map_path)
+
+def find_cell(grid, cell):
+    if hasattr(grid, "tile_size"):
+        # Mapas em blocos: partida e entregas vêm do índice do cabeçalho
+        return grid.start() if cell == "S" else grid.delivery_points().get(cell)
+    if hasattr(grid, "find"):
+        positions = grid.find(cell)
+        return positions[0] if positions else None
+    for y, row in enumerate(grid):
+        for x, value in enumerate(row):
+            if value == cell:
+                return (x, y)
+    return None
+
+def resolve_destination(grid, destination):
+    """Posição (x, y) de um rótulo de entrega ("1"–"4") ou de coordenadas "x,y" """
+    if "," in destination:
+        x, y = (int(value) for value in destination.split(","))
+        return (x, y)
+    position = find_cell(grid, destination)
+    if position is None:
+        raise ValueError(f"Destino {destination} não encontrado no mapa")
+    return position
+
+def find_start(grid):
+    position = find_cell(grid, "S")
+    if position is None:
+        raise ValueError("Mapa sem ponto de partida 'S'")
+    return position
+
+def build_environment(scenario):
+    """Ambiente compilado do cenário; a semente (se houver) fixa o sorteio das áreas de vento"""
+    from Environment.environment import Environment
+
+    grid = load_map(scenario["map"])
+    weather_conditions = {"wind_intensity": scenario["wind_intensity"]}
+    if "temperature" in scenario:
+        weather_conditions["temperature"] = scenario["temperature"]
+    if "wind_direction" in scenario:
+        weather_conditions["wind_direction"] = scenario["wind_direction"]
+    if "wind_drift" in scenario:
+        weather_conditions["forecast"] = {"drift": tuple(scenario["wind_drift"])}
+    if "seed" in scenario:
+        random.seed(scenario["seed"])
+
+    return Environment(grid, find_start(grid), resolve_destination(grid, scenario["destination"]),
+                       flight_height=scenario["flight_height"],
+                       power_mode=scenario["power_mode"],
+                       weather_conditions=weather_conditions,
+                       compiled=True)
+
+def run_scenario(task):
+    """
+    Executa um planejador sobre um cenário (tarefa do pool de processos).
+    task = (cenário, chave do planejador, verbose). Retorna uma linha de resultado.
+    """
+    scenario, planner_key, verbose = task
+    result = {field: scenario.get(field) for field in RESULT_FIELDS[:6]}
+    result["planner"] = planner_key
+
+    if verbose:
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        with output:
+            # Ambiente novo por planejador: a missão grava a bateria no agent_dict
+            env = build_environment(scenario)
+            if not supports_map(planner_key, env):
+                # P.ex. IDA* sem tabelas exatas num mapa grande: só esgotaria o time_limit
+                result.update(status="unsupported", path_length=0, cost=None,
+                              nodes_explored=None, planning_time=None)
+                return result
+            planner = create_planner(planner_key, env)
+            start_time = time.time()
+            path = planner.search("agent0")
+            planning_time = time.time() - start_time
+    except Exception as e:
+        result.update(status=f"error: {e}", path_length=0, cost=None,
+                      nodes_explored=None, planning_time=None)
+        return result
+
+    result.update(
+        status="ok" if path else "no_path",
+        path_length=len(path),
+        cost=getattr(planner, "total_cost", None) if path else None,
+        nodes_explored=getattr(planner, "total_nodes_explored", None),
+        planning_time=planning_time,
+    )
+    return result
+
+def write_results(results, file_path):
+    """Grava os resultados em .csv ou .parquet (este exige pandas e pyarrow)"""
+    if file_path.lower().endswith(".parquet"):
+        import pandas as pd
+        pd.DataFrame(results, columns=RESULT_FIELDS).to_parquet(file_path, index=False)
+        return
+
+    with open(file_path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)